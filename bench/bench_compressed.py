@@ -0,0 +1,88 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Memory and speed of the top-n multiplication with compressed column indices of B.
+
+The column indices of B are delta and varint encoded, the size of the encoding depends on the gaps
+between the columns of a row of B. The benchmark compares B in vocabulary order with B where the
+columns are reordered by `ColumnReordering`, which groups the columns of a row and shrinks the gaps.
+
+Run with:
+
+    python bench/bench_compressed.py
+
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+from sparse_dot_topn import ColumnReordering, CompressedCSR, sp_matmul_topn, sp_matmul_topn_compressed
+
+N_ROWS = 50_000
+N_COLS = 500_000
+N_FEATURES = 200_000
+N_TOPICS = 2_000
+NNZ_PER_ROW = 20
+TOP_N = 10
+N_THREADS = 4
+REPEAT = 3
+
+
+def topic_matrix(
+    n_rows: int, topics: np.ndarray, vocabulary: np.ndarray, rng: np.random.Generator
+) -> sparse.csr_matrix:
+    """Rows with `NNZ_PER_ROW` features drawn from the vocabulary of their topic."""
+    words_per_topic = vocabulary.shape[1]
+    row_topics = rng.choice(topics, size=n_rows)
+    words = rng.integers(0, words_per_topic, size=(n_rows, NNZ_PER_ROW))
+    cols = vocabulary[row_topics[:, None], words].ravel()
+    rows = np.repeat(np.arange(n_rows), NNZ_PER_ROW)
+    X = sparse.csr_matrix((rng.random(rows.size), (rows, cols)), shape=(n_rows, N_FEATURES))
+    X.sum_duplicates()
+    return X
+
+
+def best_of(func, repeat: int = REPEAT) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rng = np.random.default_rng(42)
+    topics = np.arange(N_TOPICS)
+    vocabulary = rng.permutation(N_FEATURES).reshape(N_TOPICS, -1)
+    A = topic_matrix(N_ROWS, topics, vocabulary, rng)
+    B = topic_matrix(N_COLS, topics, vocabulary, rng).T.tocsr()
+
+    print(f"A: {A.shape}, B: {B.shape}, nnz(B): {B.nnz}, top_n: {TOP_N}, n_threads: {N_THREADS}")
+    print(
+        f"| {'B':<10} | {'indices (MB)':>12} | {'bytes/nnz':>9} | {'encode (s)':>10} | "
+        f"{'csr (s)':>8} | {'compressed (s)':>14} | {'ratio':>6} |"
+    )
+    print(f"| {'-' * 10} | {'-' * 12}:| {'-' * 9}:| {'-' * 10}:| {'-' * 8}:| {'-' * 14}:| {'-' * 6}:|")
+    for name, X in (("original", B), ("rcm", ColumnReordering(B, "rcm").B)):
+        start = time.perf_counter()
+        X_compressed = CompressedCSR.from_csr(X)
+        t_encode = time.perf_counter() - start
+        index_bytes = X_compressed.codes.nbytes + X_compressed.offsets.nbytes
+        t_csr = best_of(lambda X=X: sp_matmul_topn(A, X, top_n=TOP_N, n_threads=N_THREADS))
+        t_compressed = best_of(
+            lambda X_compressed=X_compressed: sp_matmul_topn_compressed(
+                A, X_compressed, top_n=TOP_N, n_threads=N_THREADS
+            )
+        )
+        print(
+            f"| {name:<10} | {index_bytes / 1e6:>5.1f} / {X.indices.nbytes / 1e6:>4.1f} | "
+            f"{X_compressed.codes.nbytes / X.nnz:>9.2f} | {t_encode:>10.3f} | {t_csr:>8.3f} | "
+            f"{t_compressed:>14.3f} | {t_compressed / t_csr:>5.2f}x |"
+        )
+
+
+if __name__ == "__main__":
+    main()
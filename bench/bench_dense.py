@@ -0,0 +1,65 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Tiled top-n of a dense product against computing the full product and selecting with NumPy.
+
+Run with:
+
+    python bench/bench_dense.py
+
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from sparse_dot_topn import dense_matmul_topn
+
+N_ROWS = 2_000
+N_ITEMS = 50_000
+DIM = 128
+TOP_N = 10
+N_THREADS = 4
+TILE_SHAPES = [(256, 4096), (1024, 4096), (1024, 16384), (4096, 16384)]
+
+
+def full_topn(A: np.ndarray, B: np.ndarray, top_n: int) -> np.ndarray:
+    """Compute the full product and select the column indices of the `top_n` largest values per row."""
+    C = A @ B.T
+    return np.argpartition(-C, top_n, axis=1)[:, :top_n]
+
+
+def measure(func) -> tuple[float, float]:
+    """Return the run time in seconds and the peak traced memory in MiB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    rng = np.random.default_rng(42)
+    A = rng.standard_normal((N_ROWS, DIM), dtype=np.float32)
+    B = rng.standard_normal((N_ITEMS, DIM), dtype=np.float32)
+
+    print(f"A: {A.shape}, B: {B.shape}, top_n: {TOP_N}, n_threads: {N_THREADS}, dtype: {A.dtype}")
+    print(f"| {'method':<24} | {'time (s)':>8} | {'peak MiB':>8} |")
+    print(f"| {'-' * 24} | {'-' * 8}:| {'-' * 8}:|")
+    t, peak = measure(lambda: full_topn(A, B, TOP_N))
+    print(f"| {'A @ B.T + argpartition':<24} | {t:>8.3f} | {peak:>8.1f} |")
+    for tile_shape in TILE_SHAPES:
+        t, peak = measure(
+            lambda tile_shape=tile_shape: dense_matmul_topn(
+                A, B, top_n=TOP_N, threshold=-np.inf, n_threads=N_THREADS, tile_shape=tile_shape
+            )
+        )
+        name = f"tiles {tile_shape}"
+        print(f"| {name:<24} | {t:>8.3f} | {peak:>8.1f} |")
+
+
+if __name__ == "__main__":
+    main()
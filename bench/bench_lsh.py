@@ -0,0 +1,96 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Recall versus speed of the LSH candidate generation against the exact top-n.
+
+The features follow a Zipf-like distribution, as n-grams do, which makes the exact product expensive.
+A contains perturbed copies of rows of B, the exact top-n above `THRESHOLD` is used as the reference.
+
+Run with:
+
+    python bench/bench_lsh.py
+
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+from sparse_dot_topn import lsh_candidates, sp_matmul_topn, sp_matmul_topn_candidates
+
+N_ROWS = 20_000
+N_COLS = 50_000
+NNZ_PER_ROW = 30
+N_NOISE = 5
+TOP_N = 10
+THRESHOLD = 0.5
+N_THREADS = 4
+GRID = [(8, 2), (16, 2), (16, 4), (32, 4), (32, 8)]
+
+
+def normalise(X: sparse.csr_matrix) -> sparse.csr_matrix:
+    """L2 normalise the rows of X."""
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0.0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms).dot(X))
+
+
+def zipf_like(n_rows: int, n_cols: int, nnz_per_row: int, rng: np.random.Generator) -> sparse.csr_matrix:
+    """Random matrix where the probability of a column is inversely proportional to its rank."""
+    p = 1.0 / (np.arange(n_cols) + 50.0)
+    cols = rng.choice(n_cols, size=n_rows * nnz_per_row, p=p / p.sum())
+    rows = np.repeat(np.arange(n_rows), nnz_per_row)
+    X = sparse.csr_matrix((rng.random(rows.size), (rows, cols)), shape=(n_rows, n_cols))
+    X.sum_duplicates()
+    return normalise(X)
+
+
+def near_duplicates(B: sparse.csr_matrix, n_noise: int, rng: np.random.Generator) -> sparse.csr_matrix:
+    """Copy the rows of B and add `n_noise` random non-zero elements to each row."""
+    noise = sparse.random(B.shape[0], B.shape[1], density=n_noise / B.shape[1], format="csr", random_state=rng)
+    return normalise(B + noise)
+
+
+def recall(C: sparse.csr_matrix, C_ref: sparse.csr_matrix) -> float:
+    """Fraction of the reference (row, column) pairs that are present in C."""
+    hits = 0
+    for i in range(C_ref.shape[0]):
+        ref = C_ref.indices[C_ref.indptr[i] : C_ref.indptr[i + 1]]
+        res = C.indices[C.indptr[i] : C.indptr[i + 1]]
+        hits += np.intersect1d(ref, res, assume_unique=True).size
+    return hits / max(C_ref.nnz, 1)
+
+
+def main():
+    rng = np.random.default_rng(42)
+    B = zipf_like(N_ROWS, N_COLS, NNZ_PER_ROW, rng)
+    A = near_duplicates(B, N_NOISE, rng)
+
+    start = time.perf_counter()
+    C_ref = sp_matmul_topn(A, B.T, top_n=TOP_N, threshold=THRESHOLD, n_threads=N_THREADS)
+    t_ref = time.perf_counter() - start
+
+    print(f"A: {A.shape}, B: {B.shape}, top_n: {TOP_N}, threshold: {THRESHOLD}, n_threads: {N_THREADS}")
+    print(f"exact: {t_ref:.3f}s, {C_ref.nnz} pairs")
+    print(
+        f"| {'bands':>5} | {'rows':>4} | {'cand/row':>8} | {'hash (s)':>8} | {'score (s)':>9} | {'speedup':>7} | {'recall':>6} |"
+    )
+    print(f"| {'-' * 5}:| {'-' * 4}:| {'-' * 8}:| {'-' * 8}:| {'-' * 9}:| {'-' * 7}:| {'-' * 6}:|")
+    for n_bands, n_rows in GRID:
+        start = time.perf_counter()
+        candidates = lsh_candidates(A, B, n_bands=n_bands, n_rows=n_rows, seed=42)
+        t_hash = time.perf_counter() - start
+        start = time.perf_counter()
+        C = sp_matmul_topn_candidates(A, B, candidates, top_n=TOP_N, threshold=THRESHOLD, n_threads=N_THREADS)
+        t_score = time.perf_counter() - start
+        cand_per_row = candidates.nnz / A.shape[0]
+        speedup = t_ref / (t_hash + t_score)
+        print(
+            f"| {n_bands:>5} | {n_rows:>4} | {cand_per_row:>8.1f} | {t_hash:>8.3f} | {t_score:>9.3f} | "
+            f"{speedup:>6.2f}x | {recall(C, C_ref):>6.3f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Recall versus speed of the reduced-precision kernels against the exact float64 path.
+
+Run with:
+
+    python bench/bench_mixed_precision.py
+
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+from sparse_dot_topn import quantise, sp_matmul_topn
+
+N_ROWS = 20_000
+N_COLS = 100_000
+DENSITY = 2e-4
+TOP_N = 10
+N_THREADS = 4
+REPEAT = 5
+
+
+def tfidf_like(n_rows: int, n_cols: int, density: float, rng: np.random.Generator) -> sparse.csr_matrix:
+    """Random non-negative matrix with L2 normalised rows."""
+    X = sparse.random(n_rows, n_cols, density=density, format="csr", random_state=rng)
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0.0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms).dot(X))
+
+
+def recall(C: sparse.csr_matrix, C_ref: sparse.csr_matrix) -> float:
+    """Fraction of the reference (row, column) pairs that are present in C."""
+    hits = 0
+    for i in range(C_ref.shape[0]):
+        ref = C_ref.indices[C_ref.indptr[i] : C_ref.indptr[i + 1]]
+        res = C.indices[C.indptr[i] : C.indptr[i + 1]]
+        hits += np.intersect1d(ref, res, assume_unique=True).size
+    return hits / max(C_ref.nnz, 1)
+
+
+def timeit(func) -> tuple[float, sparse.csr_matrix]:
+    best = np.inf
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        C = func()
+        best = min(best, time.perf_counter() - start)
+    return best, C
+
+
+def main():
+    rng = np.random.default_rng(42)
+    A = tfidf_like(N_ROWS, N_COLS, DENSITY, rng)
+    B = tfidf_like(N_ROWS, N_COLS, DENSITY, rng).T.tocsr()
+
+    A_f32, _ = quantise(A, np.float32)
+    B_f32, _ = quantise(B, np.float32)
+    A_i8, _ = quantise(A)
+    B_i8, _ = quantise(B)
+
+    variants = {
+        "float64 x float64": (A, B),
+        "float64 x float32": (A, B_f32),
+        "float32 x int8": (A_f32, B_i8),
+        "float64 x int8": (A, B_i8),
+        "int8 x int8": (A_i8, B_i8),
+    }
+
+    print(f"A: {A.shape}, B: {B.shape}, top_n: {TOP_N}, n_threads: {N_THREADS}, repeat: {REPEAT}")
+    print(f"| {'A x B':<18} | {'B MiB':>7} | {'time (s)':>8} | {'speedup':>7} | {'recall':>6} |")
+    print(f"| {'-' * 18} | {'-' * 7}:| {'-' * 8}:| {'-' * 7}:| {'-' * 6}:|")
+    t_ref = None
+    C_ref = None
+    for name, (lhs, rhs) in variants.items():
+        t, C = timeit(lambda lhs=lhs, rhs=rhs: sp_matmul_topn(lhs, rhs, top_n=TOP_N, n_threads=N_THREADS))
+        if C_ref is None:
+            t_ref, C_ref = t, C
+        b_mib = (rhs.data.nbytes + rhs.indices.nbytes + rhs.indptr.nbytes) / 2**20
+        print(f"| {name:<18} | {b_mib:>7.1f} | {t:>8.3f} | {t_ref / t:>6.2f}x | {recall(C, C_ref):>6.3f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Speed of the top-n multiplication on reordered matrices, net of the reordering cost.
+
+The rows of A and B are drawn from topics that each have their own vocabulary, as the n-grams of
+names of the same kind do. The features, rows and columns are shuffled, i.e. in vocabulary order
+the columns of B that share features are spread over the result.
+
+Run with:
+
+    python bench/bench_reorder.py
+
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from scipy import sparse
+
+from sparse_dot_topn import ColumnReordering, row_permutation, sp_matmul_topn, sp_matmul_topn_reordered
+
+N_ROWS = 50_000
+N_COLS = 500_000
+N_FEATURES = 200_000
+N_TOPICS = 2_000
+NNZ_PER_ROW = 20
+TOP_N = 10
+N_THREADS = 4
+REPEAT = 3
+
+
+def topic_matrix(
+    n_rows: int, topics: np.ndarray, vocabulary: np.ndarray, rng: np.random.Generator
+) -> sparse.csr_matrix:
+    """Rows with `NNZ_PER_ROW` features drawn from the vocabulary of their topic."""
+    words_per_topic = vocabulary.shape[1]
+    row_topics = rng.choice(topics, size=n_rows)
+    words = rng.integers(0, words_per_topic, size=(n_rows, NNZ_PER_ROW))
+    cols = vocabulary[row_topics[:, None], words].ravel()
+    rows = np.repeat(np.arange(n_rows), NNZ_PER_ROW)
+    X = sparse.csr_matrix((rng.random(rows.size), (rows, cols)), shape=(n_rows, N_FEATURES))
+    X.sum_duplicates()
+    return X
+
+
+def best_of(func, repeat: int = REPEAT) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rng = np.random.default_rng(42)
+    topics = np.arange(N_TOPICS)
+    vocabulary = rng.permutation(N_FEATURES).reshape(N_TOPICS, -1)
+    A = topic_matrix(N_ROWS, topics, vocabulary, rng)
+    B = topic_matrix(N_COLS, topics, vocabulary, rng).T.tocsr()
+
+    print(f"A: {A.shape}, B: {B.shape}, topics: {N_TOPICS}, top_n: {TOP_N}, n_threads: {N_THREADS}")
+    t_base = best_of(lambda: sp_matmul_topn(A, B, top_n=TOP_N, n_threads=N_THREADS))
+    print(
+        f"| {'method':<18} | {'B prep (s)':>10} | {'A prep (s)':>10} | {'matmul (s)':>10} | {'speedup':>7} | {'break-even':>10} |"
+    )
+    print(f"| {'-' * 18} | {'-' * 10}:| {'-' * 10}:| {'-' * 10}:| {'-' * 7}:| {'-' * 10}:|")
+    print(f"| {'none':<18} | {0.0:>10.3f} | {0.0:>10.3f} | {t_base:>10.3f} | {1.0:>6.2f}x | {'-':>10} |")
+    for method in ("degree", "rcm"):
+        for reorder_rows in (False, True):
+            start = time.perf_counter()
+            B_reordered = ColumnReordering(B, method)
+            t_b = time.perf_counter() - start
+            start = time.perf_counter()
+            if reorder_rows:
+                row_permutation(A)
+            t_a = time.perf_counter() - start
+            t_mul = best_of(
+                lambda B_reordered=B_reordered, reorder_rows=reorder_rows: sp_matmul_topn_reordered(
+                    A, B_reordered, top_n=TOP_N, n_threads=N_THREADS, reorder_rows=reorder_rows
+                )
+            )
+            # B is reordered once, the row permutation and the mapping back are part of every call
+            gain = t_base - t_mul
+            break_even = f"{int(np.ceil(t_b / gain))} calls" if gain > 0 else "never"
+            name = f"{method}{' + rows' if reorder_rows else ''}"
+            print(
+                f"| {name:<18} | {t_b:>10.3f} | {t_a:>10.3f} | {t_mul:>10.3f} | {t_base / t_mul:>6.2f}x | "
+                f"{break_even:>10} |"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Offline benchmark suite for the kernels on synthetic data with regression tracking.
+
+Every case runs in a fresh process such that the peak resident set size (RSS) can be attributed to it.
+The memory of a kernel is its peak RSS above the RSS after generating the operands, on Linux the high-water
+mark is reset before the timed calls such that the generation of the operands does not mask it.
+The results are written to a JSON file that can be used as the baseline of a later run:
+
+    python bench/suite.py --output baseline.json
+    python bench/suite.py --output current.json --baseline baseline.json
+
+A case is flagged as a regression when its throughput dropped, or the peak RSS of the kernel grew, by more than
+the tolerance. The exit code is 1 when any regression is found.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import psutil
+from scipy import sparse
+
+import sparse_dot_topn
+from sparse_dot_topn import sp_matmul, sp_matmul_topn, zip_sp_matmul_topn
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+# growth of the kernel peak RSS below this is not flagged, allocator and page granularity noise
+_RSS_NOISE_MIB = 1.0
+
+
+@dataclass(frozen=True)
+class Workload:
+    """Synthetic CSR operands, the degrees of the rows and columns follow a power law with exponent `alpha`."""
+
+    name: str
+    nrows: int
+    nfeatures: int
+    ncols: int
+    density: float
+    alpha_rows: float = 0.0
+    alpha_cols: float = 0.0
+    dtype: str = "float64"
+
+
+@dataclass
+class Case:
+    workload: Workload
+    kernel: str
+    n_threads: int = 1
+    top_n: int | None = None
+    threshold: float | None = None
+    sort: bool = False
+    n_splits: int = 1
+
+    @property
+    def id(self) -> str:
+        parts = [self.workload.name, self.kernel, f"threads={self.n_threads}"]
+        if self.top_n is not None:
+            parts.append(f"top_n={self.top_n}")
+        if self.threshold is not None:
+            parts.append(f"threshold={self.threshold}")
+        if self.sort:
+            parts.append("sorted")
+        if self.n_splits > 1:
+            parts.append(f"splits={self.n_splits}")
+        return "|".join(parts)
+
+
+@dataclass
+class Result:
+    id: str
+    kernel: str
+    workload: str
+    n_threads: int
+    time_min: float
+    time_median: float
+    rows_per_sec: float
+    mflops_per_sec: float | None
+    peak_rss_mib: float
+    # the peak RSS of the timed calls above the RSS before them, `None` when the high-water mark cannot be reset
+    peak_rss_delta_mib: float | None
+    nnz_out: int
+    efficiency: float | None = None
+    extra: dict = field(default_factory=dict)
+
+
+WORKLOADS = {
+    "quick": [
+        Workload("uniform", 20_000, 50_000, 20_000, 5e-4),
+        Workload("power_law", 20_000, 50_000, 20_000, 5e-4, alpha_rows=0.5, alpha_cols=1.0),
+    ],
+    "full": [
+        Workload("uniform", 50_000, 100_000, 50_000, 2e-4),
+        Workload("power_law", 50_000, 100_000, 50_000, 2e-4, alpha_rows=0.5, alpha_cols=1.0),
+        Workload("power_law_f32", 50_000, 100_000, 50_000, 2e-4, alpha_rows=0.5, alpha_cols=1.0, dtype="float32"),
+        Workload("dense_rows", 10_000, 20_000, 10_000, 5e-3, alpha_rows=1.0, alpha_cols=0.5),
+    ],
+}
+
+
+def power_law_csr(
+    nrows: int, ncols: int, density: float, alpha_rows: float, alpha_cols: float, dtype: str, seed: int
+) -> sparse.csr_matrix:
+    """Random CSR matrix where the row degrees and column popularity decay as `rank ** -alpha`."""
+    rng = np.random.default_rng(seed)
+    nnz = round(density * nrows * ncols)
+    row_w = rng.permutation((np.arange(nrows) + 1.0) ** -alpha_rows)
+    row_deg = np.minimum(rng.multinomial(nnz, row_w / row_w.sum()), ncols)
+    col_p = rng.permutation((np.arange(ncols) + 1.0) ** -alpha_cols)
+    cols = rng.choice(ncols, size=row_deg.sum(), p=col_p / col_p.sum())
+    rows = np.repeat(np.arange(nrows), row_deg)
+    X = sparse.csr_matrix((rng.random(rows.size).astype(dtype), (rows, cols)), shape=(nrows, ncols))
+    X.sum_duplicates()
+    return X
+
+
+def make_operands(workload: Workload) -> tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    w = workload
+    A = power_law_csr(w.nrows, w.nfeatures, w.density, w.alpha_rows, w.alpha_cols, w.dtype, seed=1)
+    B = power_law_csr(w.ncols, w.nfeatures, w.density, w.alpha_rows, w.alpha_cols, w.dtype, seed=2)
+    return A, B.T.tocsr()
+
+
+def flops(A: sparse.csr_matrix, B: sparse.csr_matrix) -> int:
+    """The number of multiply-adds of A * B."""
+    return int(np.diff(B.indptr)[A.indices].sum())
+
+
+def _rss_mib(maxrss: int) -> float:
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 2**10
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the RSS high-water mark of the process, only supported on Linux."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_mib() -> float:
+    if sys.platform.startswith("linux"):
+        # unlike ru_maxrss VmHWM honours `_reset_peak_rss`
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2**10
+    if resource is not None:
+        return _rss_mib(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    return psutil.Process().memory_info().peak_wset / 2**20
+
+
+def _make_call(case: Case, A: sparse.csr_matrix, B: sparse.csr_matrix):
+    if case.kernel == "sp_matmul":
+        return lambda: sp_matmul(A, B, n_threads=case.n_threads)
+    if case.kernel == "sp_matmul_topn":
+        return lambda: sp_matmul_topn(
+            A, B, top_n=case.top_n, threshold=case.threshold, sort=case.sort, n_threads=case.n_threads
+        )
+    if case.kernel == "zip_sp_matmul_topn":
+        bounds = np.linspace(0, B.shape[1], case.n_splits + 1).astype(int)
+        C_mats = [
+            sp_matmul_topn(A, B[:, lb:ub], top_n=case.top_n, threshold=case.threshold, n_threads=case.n_threads)
+            for lb, ub in zip(bounds[:-1], bounds[1:])
+        ]
+        return lambda: zip_sp_matmul_topn(case.top_n, C_mats)
+    msg = f"unknown kernel `{case.kernel}`"
+    raise ValueError(msg)
+
+
+def run_case(case: Case, repeat: int) -> Result:
+    """Run a single case, should be called in a fresh process."""
+    A, B = make_operands(case.workload)
+    n_flops = flops(A, B)
+    call = _make_call(case, A, B)
+    gc.collect()
+    rss_before = psutil.Process().memory_info().rss / 2**20
+    # without a reset the high-water mark includes the generation of the operands
+    is_reset = _reset_peak_rss()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        C = call()
+        times.append(time.perf_counter() - start)
+        nnz_out = C.nnz
+        del C
+
+    peak = _peak_rss_mib()
+    t_min = min(times)
+    return Result(
+        id=case.id,
+        kernel=case.kernel,
+        workload=case.workload.name,
+        n_threads=case.n_threads,
+        time_min=t_min,
+        time_median=float(np.median(times)),
+        rows_per_sec=A.shape[0] / t_min,
+        # zipping does not multiply
+        mflops_per_sec=n_flops / t_min / 1e6 if case.kernel != "zip_sp_matmul_topn" else None,
+        peak_rss_mib=peak,
+        peak_rss_delta_mib=max(peak - rss_before, 0.0) if is_reset else None,
+        nnz_out=nnz_out,
+        extra={"A_nnz": int(A.nnz), "B_nnz": int(B.nnz), "flops": n_flops},
+    )
+
+
+def _format_mib(value: float | None) -> str:
+    return f"{value:.1f} MiB" if value is not None else "n/a"
+
+
+def make_cases(workloads: list[Workload], threads: list[int], top_n: int, threshold: float) -> list[Case]:
+    cases = []
+    for w in workloads:
+        for n in threads:
+            cases.append(Case(w, "sp_matmul", n_threads=n))
+            cases.extend(Case(w, "sp_matmul_topn", n_threads=n, top_n=top_n, sort=sort) for sort in (False, True))
+            cases.append(Case(w, "sp_matmul_topn", n_threads=n, top_n=top_n, threshold=threshold))
+        cases.append(Case(w, "zip_sp_matmul_topn", top_n=top_n, n_splits=4))
+    return cases
+
+
+def add_efficiency(results: list[Result]):
+    """Thread-scaling efficiency `t_1 / (n * t_n)` relative to the single threaded run of the same case."""
+    single = {r.id.replace(f"threads={r.n_threads}", "threads=1"): r.time_min for r in results if r.n_threads == 1}
+    for r in results:
+        t_1 = single.get(r.id.replace(f"threads={r.n_threads}", "threads=1"))
+        if t_1 is not None:
+            r.efficiency = t_1 / (r.n_threads * r.time_min)
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float, rss_tolerance: float) -> list[str]:
+    """Return a description of every case that regressed against the baseline."""
+    base = {r["id"]: r for r in baseline}
+    regressions = []
+    for r in results:
+        b = base.get(r["id"])
+        if b is None:
+            continue
+        ratio = r["rows_per_sec"] / b["rows_per_sec"]
+        if ratio < 1.0 - tolerance:
+            regressions.append(f"{r['id']}: throughput {ratio:.2f}x of baseline")
+        # the peak of the process includes the operands, only the memory of the kernel is compared
+        rss, b_rss = r.get("peak_rss_delta_mib"), b.get("peak_rss_delta_mib")
+        if rss is None or b_rss is None:
+            continue
+        if rss > b_rss * (1.0 + rss_tolerance) + _RSS_NOISE_MIB:
+            regressions.append(f"{r['id']}: kernel peak RSS {rss:.1f} MiB versus {b_rss:.1f} MiB in the baseline")
+    return regressions
+
+
+def metadata() -> dict:
+    return {
+        "sparse_dot_topn": sparse_dot_topn.__version__,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "available_cpus": sparse_dot_topn.available_cpus(),
+        "openmp": bool(sparse_dot_topn._has_openmp_support),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(WORKLOADS), default="quick", help="the set of workloads to run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4], help="thread counts to run")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed calls per case")
+    parser.add_argument("--filter", default=None, help="only run cases whose id contains this string")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write the results to")
+    parser.add_argument("--baseline", default=None, help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative drop in throughput")
+    parser.add_argument(
+        "--rss-tolerance", type=float, default=0.2, help="allowed relative growth of the kernel peak RSS"
+    )
+    args = parser.parse_args(argv)
+
+    max_threads = sparse_dot_topn.available_cpus()
+    threads = sorted({min(n, max_threads) for n in args.threads} | {1})
+    if not sparse_dot_topn._has_openmp_support:
+        threads = [1]
+    cases = make_cases(WORKLOADS[args.size], threads, args.top_n, args.threshold)
+    if args.filter:
+        cases = [c for c in cases if args.filter in c.id]
+
+    results = []
+    ctx = mp.get_context("spawn")
+    for case in cases:
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_case, (case, args.repeat))
+        results.append(result)
+        print(
+            f"{result.id:<70} {result.time_min:>8.4f}s {result.rows_per_sec:>12.0f} rows/s "
+            f"{result.peak_rss_mib:>8.1f} MiB (kernel {_format_mib(result.peak_rss_delta_mib)})"
+        )
+    add_efficiency(results)
+
+    report = {
+        "metadata": metadata(),
+        "config": vars(args),
+        "cases": [{**asdict(c.workload), "id": c.id} for c in cases],
+        "results": [asdict(r) for r in results],
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    regressions = compare(report["results"], baseline["results"], args.tolerance, args.rss_tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"no regressions against {args.baseline}")
+    return int(len(regressions) > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 # Copyright (c) 2023 ING Analytics Wholesale Banking
-import importlib.metadata
 import os
 
 # Setting the following environment variable allows multiple OpenMP
@@ -20,17 +19,66 @@ os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "True")
 # https://github.com/ContinuumIO/anaconda-issues/issues/11294
 os.environ.setdefault("KMP_INIT_AT_FORK", "FALSE")
 
-__version__ = importlib.metadata.version("sparse_dot_topn")
-from sparse_dot_topn.api import awesome_cossim_topn, sp_matmul, sp_matmul_topn, zip_sp_matmul_topn
-from sparse_dot_topn.lib import _sparse_dot_topn_core as _core
-from sparse_dot_topn.lib._sparse_dot_topn_core import _has_openmp_support
+from sparse_dot_topn._extension import _core
+from sparse_dot_topn.api import (
+    awesome_cossim_topn,
+    dense_matmul_topn,
+    sp_matmul,
+    sp_matmul_topn,
+    sp_matmul_topn_binary,
+    sp_matmul_topn_candidates,
+    zip_sp_matmul_topn,
+)
+from sparse_dot_topn.chunked import CancelledError, Progress, sp_matmul_topn_chunked
+from sparse_dot_topn.compressed import CompressedCSR, sp_matmul_topn_compressed
+from sparse_dot_topn.incremental import remove_columns_topn, update_topn
+from sparse_dot_topn.lsh import lsh_candidates, sp_matmul_topn_lsh
+from sparse_dot_topn.output import to_pairs, to_record_batch
+from sparse_dot_topn.quantise import quantise
+from sparse_dot_topn.reorder import ColumnReordering, column_permutation, row_permutation, sp_matmul_topn_reordered
+from sparse_dot_topn.threads import available_cpus, get_num_threads, set_num_threads, threadpool_limits
 
 __all__ = [
     "awesome_cossim_topn",
+    "dense_matmul_topn",
     "sp_matmul",
     "sp_matmul_topn",
+    "sp_matmul_topn_binary",
+    "sp_matmul_topn_candidates",
+    "sp_matmul_topn_chunked",
+    "sp_matmul_topn_compressed",
+    "sp_matmul_topn_lsh",
+    "sp_matmul_topn_reordered",
+    "lsh_candidates",
     "zip_sp_matmul_topn",
+    "update_topn",
+    "remove_columns_topn",
+    "quantise",
+    "to_pairs",
+    "to_record_batch",
+    "ColumnReordering",
+    "CompressedCSR",
+    "column_permutation",
+    "row_permutation",
+    "available_cpus",
+    "get_num_threads",
+    "set_num_threads",
+    "threadpool_limits",
+    "CancelledError",
+    "Progress",
     "_core",
     "__version__",
     "_has_openmp_support",
 ]
+
+
+def __getattr__(name: str):
+    # the package metadata and the extension are only loaded when needed
+    if name == "__version__":
+        import importlib.metadata  # noqa: PLC0415
+
+        return importlib.metadata.version("sparse_dot_topn")
+    if name == "_has_openmp_support":
+        return _core._has_openmp_support
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
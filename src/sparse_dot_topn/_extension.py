@@ -0,0 +1,26 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Deferred loading of the compiled extension."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+__all__ = ["_core"]
+
+
+class _LazyExtension:
+    """Stand-in for `sparse_dot_topn.lib._sparse_dot_topn_core` that loads the extension on first use."""
+
+    def __getattr__(self, name: str) -> Any:
+        module = importlib.import_module("sparse_dot_topn.lib._sparse_dot_topn_core")
+        value = getattr(module, name)
+        # later look-ups are regular attribute look-ups that do not reach `__getattr__`
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self) -> str:
+        return "<lazy module 'sparse_dot_topn.lib._sparse_dot_topn_core'>"
+
+
+_core = _LazyExtension()
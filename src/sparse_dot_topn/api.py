@@ -1,26 +1,49 @@
 # Copyright (c) 2023 ING Analytics Wholesale Banking
 from __future__ import annotations
 
+import time
 import warnings
 from typing import TYPE_CHECKING
 
 import numpy as np
-import psutil
-from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
-
-from sparse_dot_topn.lib import _sparse_dot_topn_core as _core
-from sparse_dot_topn.types import assert_idx_dtype, assert_supported_dtype, ensure_compatible_dtype
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, issparse
+
+from sparse_dot_topn._extension import _core
+from sparse_dot_topn.output import _OUTPUTS, _as_output
+from sparse_dot_topn.threads import _resolve_n_threads
+from sparse_dot_topn.types import (
+    assert_idx_dtype,
+    assert_supported_dtype,
+    ensure_compatible_dtype,
+    is_supported_dtype,
+    mixed_precision_dtype,
+)
 
 if TYPE_CHECKING:
-    from numpy.types import DTypeLike
-
-__all__ = ["sp_matmul", "sp_matmul_topn", "awesome_cossim_topn"]
+    from numpy.types import DTypeLike, NDArray
 
+__all__ = [
+    "dense_matmul_topn",
+    "sp_matmul",
+    "sp_matmul_topn",
+    "sp_matmul_topn_binary",
+    "sp_matmul_topn_candidates",
+    "awesome_cossim_topn",
+]
 
-_N_CORES = psutil.cpu_count(logical=False) - 1
 
 _SUPPORTED_DTYPES = {np.dtype("int32"), np.dtype("int64"), np.dtype("float32"), np.dtype("float64")}
 
+_BINARY_SIMILARITIES = {"count", "jaccard", "dice", "overlap"}
+
+_INCOMPATIBLE_SHAPES = (
+    "Matrices `A` and `B` have incompatible shapes. `A.shape[1]` must be equal to `B.shape[0]` or `B.shape[1]`."
+)
+
+# counters and timings (in seconds) returned by `sp_matmul_topn` with `return_stats`
+_COUNTER_STATS = ("flops", "candidates", "heap_insertions", "rows_full", "bytes_allocated")
+_TIMING_STATS = ("convert", "size_pass", "accumulate", "select", "compact", "kernel", "construct", "total")
+
 
 def awesome_cossim_topn(
     A, B, ntop, lower_bound=0, use_threads=False, n_jobs=1, return_best_ntop=None, test_nnz_max=None
@@ -73,6 +96,40 @@ def awesome_cossim_topn(
     return C
 
 
+def _as_csr(A: csr_matrix | csc_matrix | coo_matrix, B: csr_matrix | csc_matrix | coo_matrix) -> csr_matrix:
+    """Convert A to a CSR matrix, raises when A or B is not a supported sparse matrix."""
+    if isinstance(A, (coo_matrix, csc_matrix)):
+        A = A.tocsr(False)
+    elif not isinstance(A, csr_matrix):
+        msg = f"type of `A` must be one of `csr_matrix`, `csc_matrix` or `csr_matrix`, got `{type(A)}`"
+        raise TypeError(msg)
+
+    if not isinstance(B, (csr_matrix, coo_matrix, csc_matrix)):
+        msg = f"type of `B` must be one of `csr_matrix`, `csc_matrix` or `csr_matrix`, got `{type(B)}`"
+        raise TypeError(msg)
+    return A
+
+
+def _as_csr_operands(
+    A: csr_matrix | csc_matrix | coo_matrix, B: csr_matrix | csc_matrix | coo_matrix
+) -> tuple[csr_matrix, csr_matrix]:
+    """Convert A and B to CSR matrices where `A.shape[1] == B.shape[0]`, transposing B if needed."""
+    if isinstance(A, csc_matrix) and isinstance(B, csc_matrix) and A.shape[0] == B.shape[1]:
+        A = A.transpose()
+        B = B.transpose()
+    else:
+        A = _as_csr(A, B)
+
+    if A.shape[1] == B.shape[0]:
+        if isinstance(B, (coo_matrix, csc_matrix)):
+            B = B.tocsr(False)
+    elif A.shape[1] == B.shape[1]:
+        B = B.transpose() if isinstance(B, csc_matrix) else B.transpose().tocsr(False)
+    else:
+        raise ValueError(_INCOMPATIBLE_SHAPES)
+    return A, B
+
+
 def sp_matmul(
     A: csr_matrix | csc_matrix | coo_matrix,
     B: csr_matrix | csc_matrix | coo_matrix,
@@ -90,7 +147,7 @@ def sp_matmul(
         B: RHS of the multiplication, the number of rows of B must match the number of columns of A or the shape of B.T should be match A.
             `B` must be have an {32, 64}bit {int, float} dtype that is of the same kind as `A`.
             Note the matrix is converted (copied) to CSR format if a CSC or COO matrix.
-        n_threads: number of threads to use, `None` implies sequential processing, -1 will use all but one of the available cores.
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
         idx_dtype: dtype to use for the indices, defaults to 32bit integers
 
     Throws:
@@ -101,37 +158,11 @@ def sp_matmul(
 
     """
     idx_dtype = assert_idx_dtype(idx_dtype)
-    n_threads: int = n_threads or 1
-    if n_threads < 0:
-        n_threads = _N_CORES
+    n_threads = _resolve_n_threads(n_threads)
 
-    if isinstance(A, csc_matrix) and isinstance(B, csc_matrix) and A.shape[0] == B.shape[1]:
-        A = A.transpose()
-        B = B.transpose()
-    elif isinstance(A, (coo_matrix, csc_matrix)):
-        A = A.tocsr(False)
-    elif not isinstance(A, csr_matrix):
-        msg = f"type of `A` must be one of `csr_matrix`, `csc_matrix` or `csr_matrix`, got `{type(A)}`"
-        raise TypeError(msg)
-
-    if not isinstance(B, (csr_matrix, coo_matrix, csc_matrix)):
-        msg = f"type of `B` must be one of `csr_matrix`, `csc_matrix` or `csr_matrix`, got `{type(B)}`"
-        raise TypeError(msg)
-
-    A_nrows, A_ncols = A.shape
-    B_nrows, B_ncols = B.shape
-
-    if A_ncols == B_nrows:
-        if isinstance(B, (coo_matrix, csc_matrix)):
-            B = B.tocsr(False)
-    elif A_ncols == B_ncols:
-        B = B.transpose() if isinstance(B, csc_matrix) else B.transpose().tocsr(False)
-        B_nrows, B_ncols = B.shape
-    else:
-        msg = (
-            "Matrices `A` and `B` have incompatible shapes. `A.shape[1]` must be equal to `B.shape[0]` or `B.shape[1]`."
-        )
-        raise ValueError(msg)
+    A, B = _as_csr_operands(A, B)
+    A_nrows = A.shape[0]
+    B_ncols = B.shape[1]
 
     assert_supported_dtype(A)
     assert_supported_dtype(B)
@@ -175,11 +206,18 @@ def sp_matmul_topn(
     density: float | None = None,
     n_threads: int | None = None,
     idx_dtype: DTypeLike | None = None,
-) -> csr_matrix:
+    return_stats: bool = False,
+    output: str = "csr",
+) -> csr_matrix | dict | tuple[csr_matrix | dict, dict]:
     """Compute A * B whilst only storing the `top_n` elements.
 
     This functions allows large matrices to multiplied with a limited memory footprint.
 
+    Reduced-precision storage is supported for the following (`A`, `B`) dtype pairs, the result is
+    accumulated and returned in the dtype on the right-hand side:
+    (float64, float32) -> float64, (float32, int8) -> float32, (float64, int8) -> float64 and (int8, int8) -> int32.
+    See `quantise` for creating int8 matrices.
+
     Args:
         A: LHS of the multiplication, the number of columns of A determines the orientation of B.
             `A` must be have an {32, 64}bit {int, float} dtype that is of the same kind as `B`.
@@ -193,70 +231,71 @@ def sp_matmul_topn(
         density: the expected density of the result considering `top_n`. The expected number of non-zero elements
             in C should <= (`density` * `top_n` * `A.shape[0]`) otherwise the memory has to reallocated.
             This value should only be set if you have a strong expectation as being wrong incurs a realloaction penalty.
-        n_threads: number of threads to use, `None` implies sequential processing, -1 will use all but one of the available cores.
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
         idx_dtype: dtype to use for the indices, defaults to 32bit integers
+        return_stats: also return the statistics of the call, these are collected by a separately compiled kernel
+            such that the default kernel is not instrumented. The counters are `flops` (multiply-adds),
+            `candidates` (distinct columns accumulated), `heap_insertions`, `rows_full` (rows with `top_n` values)
+            and `bytes_allocated`. The timings in seconds are `convert`, `size_pass`, `accumulate`, `select`,
+            `compact`, `kernel`, `construct` and `total`, where `accumulate` and `select` are summed over the threads.
+            `thread_busy` holds the time each thread spent on its rows.
+        output: 'csr' returns a CSR matrix, 'pairs' an edge list as dictionary with the arrays `row`, `col` and `score`
+            and 'arrow' the edge list as `pyarrow.RecordBatch`, see `to_pairs`. The edge lists share the memory
+            of the arrays returned by the kernel, only the `row` array is allocated.
 
     Throws:
         TypeError: when A, B are not trivially convertable to a `CSR matrix`
+        ValueError: when `output` is not supported
 
     Returns:
-        C: result matrix
+        C: result matrix or edge list
+        stats: dictionary with the counters and timings in seconds, only returned when `return_stats` is True
 
     """
-    n_threads: int = n_threads or 1
-    if n_threads < 0:
-        n_threads = _N_CORES
+    if return_stats:
+        t_start = time.perf_counter()
+    if output not in _OUTPUTS:
+        msg = f"`output` must be one of 'csr', 'pairs' or 'arrow', got `{output}`"
+        raise ValueError(msg)
+    n_threads = _resolve_n_threads(n_threads)
     density: float = density or 1.0
     idx_dtype = assert_idx_dtype(idx_dtype)
 
-    if isinstance(A, csc_matrix) and isinstance(B, csc_matrix) and A.shape[0] == B.shape[1]:
-        A = A.transpose()
-        B = B.transpose()
-    elif isinstance(A, (coo_matrix, csc_matrix)):
-        A = A.tocsr(False)
-    elif not isinstance(A, csr_matrix):
-        msg = f"type of `A` must be one of `csr_matrix`, `csc_matrix` or `csr_matrix`, got `{type(A)}`"
-        raise TypeError(msg)
+    A, B = _as_csr_operands(A, B)
+    A_nrows = A.shape[0]
+    B_ncols = B.shape[1]
 
-    if not isinstance(B, (csr_matrix, coo_matrix, csc_matrix)):
-        msg = f"type of `B` must be one of `csr_matrix`, `csc_matrix` or `csr_matrix`, got `{type(B)}`"
-        raise TypeError(msg)
+    # reduced-precision inputs are accumulated in a wider dtype without casting A or B
+    C_dtype = mixed_precision_dtype(A.dtype, B.dtype)
+    if C_dtype is None:
+        if B_ncols == top_n and (sort is False) and (threshold is None) and not return_stats:
+            C = sp_matmul(A, B, n_threads)
+            return C if output == "csr" else _as_output(C.data, C.indices, C.indptr, C.shape, output)
 
-    A_nrows, A_ncols = A.shape
-    B_nrows, B_ncols = B.shape
-
-    if A_ncols == B_nrows:
-        if isinstance(B, (coo_matrix, csc_matrix)):
-            B = B.tocsr(False)
-    elif A_ncols == B_ncols:
-        B = B.transpose() if isinstance(B, csc_matrix) else B.transpose().tocsr(False)
-        B_nrows, B_ncols = B.shape
-    else:
-        msg = (
-            "Matrices `A` and `B` have incompatible shapes. `A.shape[1]` must be equal to `B.shape[0]` or `B.shape[1]`."
-        )
-        raise ValueError(msg)
-
-    if B_ncols == top_n and (sort is False) and (threshold is None):
-        return sp_matmul(A, B, n_threads)
-
-    assert_supported_dtype(A)
-    assert_supported_dtype(B)
-    ensure_compatible_dtype(A, B)
+        assert_supported_dtype(A)
+        assert_supported_dtype(B)
+        ensure_compatible_dtype(A, B)
+        C_dtype = A.dtype
 
     # guard against top_n larger than number of cols
     top_n = min(top_n, B_ncols)
 
     # handle threshold
     if threshold is not None:
-        threshold = int(np.rint(threshold)) if np.issubdtype(A.data.dtype, np.integer) else float(threshold)
+        threshold = int(np.rint(threshold)) if np.issubdtype(C_dtype, np.integer) else float(threshold)
 
     # basic check. if A or B are all zeros matrix, return all zero matrix directly
     if A.indices.size == 0 or B.indices.size == 0:
         C_indptr = np.zeros(A_nrows + 1, dtype=idx_dtype)
         C_indices = np.zeros(1, dtype=idx_dtype)
-        C_data = np.zeros(1, dtype=A.dtype)
-        return csr_matrix((C_data, C_indices, C_indptr), shape=(A_nrows, B_ncols))
+        C_data = np.zeros(1, dtype=C_dtype)
+        C = _as_output(C_data, C_indices, C_indptr, (A_nrows, B_ncols), output)
+        if return_stats:
+            stats = dict.fromkeys(_COUNTER_STATS, 0)
+            stats.update(dict.fromkeys(_TIMING_STATS, 0.0), thread_busy=[], n_threads=n_threads)
+            stats["total"] = time.perf_counter() - t_start
+            return C, stats
+        return C
 
     kwargs = {
         "top_n": top_n,
@@ -281,9 +320,386 @@ def sp_matmul_topn(
         else:
             msg = "sparse_dot_topn: extension was compiled without parallelisation (OpenMP) support, ignoring ``n_threads``"
             warnings.warn(msg, stacklevel=1)
+    if not return_stats:
+        return _as_output(*func(**kwargs), (A_nrows, B_ncols), output)
+    return _sp_matmul_topn_stats(kwargs, sort, (A_nrows, B_ncols), output, t_start)
+
+
+def _sp_matmul_topn_stats(
+    kwargs: dict, sort: bool, shape: tuple[int, int], output: str, t_start: float
+) -> tuple[csr_matrix | dict, dict]:
+    """Call the instrumented kernel and time the phases of `sp_matmul_topn`."""
+    if "n_threads" in kwargs:
+        func = _core.sp_matmul_topn_stats_mt if not sort else _core.sp_matmul_topn_sorted_stats_mt
+    else:
+        func = _core.sp_matmul_topn_stats if not sort else _core.sp_matmul_topn_sorted_stats
+    t_kernel = time.perf_counter()
+    C_data, C_indices, C_indptr, stats = func(**kwargs)
+    t_construct = time.perf_counter()
+    C = _as_output(C_data, C_indices, C_indptr, shape, output)
+    t_end = time.perf_counter()
+
+    stats["convert"] = t_kernel - t_start
+    stats["kernel"] = t_construct - t_kernel
+    stats["construct"] = t_end - t_construct
+    stats["total"] = t_end - t_start
+    stats["n_threads"] = kwargs.get("n_threads", 1)
+    return C, stats
+
+
+def sp_matmul_topn_binary(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    similarity: str = "count",
+    threshold: int | float | None = None,
+    sort: bool = False,
+    density: float | None = None,
+    n_threads: int | None = None,
+    idx_dtype: DTypeLike | None = None,
+    B_card: NDArray | None = None,
+) -> csr_matrix:
+    """Compute the set-overlap of the rows of A and the columns of B whilst only storing the `top_n` elements.
+
+    Every stored element of A and B is treated as a one, i.e. the matrices are considered to be binary.
+    The data arrays are never read, the number of shared non-zero elements is counted in integers and
+    optionally converted to a similarity score before the top-n selection.
+    Note that explicitly stored zeros are counted as present, see `eliminate_zeros`.
+
+    With `c` the number of shared non-zeros and `|a|`, `|b|` the number of non-zeros of the row of A and column of B:
+        count: c
+        jaccard: c / (|a| + |b| - c)
+        dice: 2c / (|a| + |b|)
+        overlap: c / min(|a|, |b|)
+
+    Args:
+        A: LHS of the multiplication, the number of columns of A determines the orientation of B.
+            Note the matrix is converted (copied) to CSR format if a CSC or COO matrix.
+        B: RHS of the multiplication, the number of rows of B must match the number of columns of A or the shape of B.T should be match A.
+            Note the matrix is converted (copied) to CSR format if a CSC or COO matrix.
+        top_n: the number of results to retain
+        similarity: one of 'count', 'jaccard', 'dice' or 'overlap'
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        density: the expected density of the result considering `top_n`, see `sp_matmul_topn`
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+        B_card: the number of distinct non-zero elements of every column of B, computed when `None`.
+            Pass it to avoid a pass over B for repeated queries against the same B,
+            e.g. `np.bincount(B.indices, minlength=B.shape[1])` for a B of shape `(A.shape[1], n)` without duplicates.
+
+    Throws:
+        TypeError: when A, B are not trivially convertable to a `CSR matrix`
+        ValueError: when `similarity` is not supported or `B_card` does not have an element per column of B
+
+    Returns:
+        C: result matrix, with `idx_dtype` data for the 'count' similarity and float64 otherwise
+
+    """
+    if similarity not in _BINARY_SIMILARITIES:
+        msg = f"`similarity` must be one of 'count', 'jaccard', 'dice' or 'overlap', got `{similarity}`"
+        raise ValueError(msg)
+    n_threads = _resolve_n_threads(n_threads)
+    density: float = density or 1.0
+    idx_dtype = assert_idx_dtype(idx_dtype)
+
+    A, B = _as_csr_operands(A, B)
+    A_nrows = A.shape[0]
+    B_ncols = B.shape[1]
+    top_n = min(top_n, B_ncols)
+    C_dtype = np.dtype(idx_dtype) if similarity == "count" else np.dtype("float64")
+
+    if threshold is not None:
+        threshold = float(np.rint(threshold)) if similarity == "count" else float(threshold)
+    if B_card is not None:
+        B_card = np.asarray(B_card)
+        if B_card.shape != (B_ncols,):
+            msg = f"`B_card` must have shape {(B_ncols,)}, got {B_card.shape}"
+            raise ValueError(msg)
+
+    if A.indices.size == 0 or B.indices.size == 0:
+        C_indptr = np.zeros(A_nrows + 1, dtype=idx_dtype)
+        C_indices = np.zeros(1, dtype=idx_dtype)
+        C_data = np.zeros(1, dtype=C_dtype)
+        return csr_matrix((C_data, C_indices, C_indptr), shape=(A_nrows, B_ncols))
+
+    # duplicate entries would be counted more than once
+    if not A.has_canonical_format:
+        A = A.copy()
+        A.sum_duplicates()
+    if not B.has_canonical_format:
+        B = B.copy()
+        B.sum_duplicates()
+    if B_card is None:
+        B_card = np.bincount(B.indices, minlength=B_ncols)
+
+    kwargs = {
+        "top_n": top_n,
+        "nrows": A_nrows,
+        "ncols": B_ncols,
+        "threshold": threshold,
+        "density": density,
+        "similarity": similarity,
+        "A_indptr": A.indptr.astype(idx_dtype, copy=False),
+        "A_indices": A.indices.astype(idx_dtype, copy=False),
+        "B_indptr": B.indptr.astype(idx_dtype, copy=False),
+        "B_indices": B.indices.astype(idx_dtype, copy=False),
+        "B_card": B_card.astype(idx_dtype, copy=False),
+    }
+
+    func = _core.sp_matmul_topn_binary if not sort else _core.sp_matmul_topn_binary_sorted
+    if n_threads > 1:
+        if _core._has_openmp_support:
+            kwargs["n_threads"] = n_threads
+            kwargs.pop("density")
+            func = _core.sp_matmul_topn_binary_mt if not sort else _core.sp_matmul_topn_binary_sorted_mt
+        else:
+            msg = "sparse_dot_topn: extension was compiled without parallelisation (OpenMP) support, ignoring ``n_threads``"
+            warnings.warn(msg, stacklevel=1)
     return csr_matrix(func(**kwargs), shape=(A_nrows, B_ncols))
 
 
+def _as_csr_row_operands(
+    A: csr_matrix | csc_matrix | coo_matrix, B: csr_matrix | csc_matrix | coo_matrix
+) -> tuple[csr_matrix, csr_matrix]:
+    """Convert A and B to CSR matrices where the rows of B are compared with the rows of A, i.e. `A.shape[1] == B.shape[1]`.
+
+    The orientation of B follows `sp_matmul_topn`, B is transposed when `A.shape[1] == B.shape[0]`.
+    """
+    A = _as_csr(A, B)
+    if A.shape[1] == B.shape[0]:
+        B = B.transpose() if isinstance(B, csc_matrix) else B.transpose().tocsr(False)
+    elif A.shape[1] == B.shape[1]:
+        if isinstance(B, (coo_matrix, csc_matrix)):
+            B = B.tocsr(False)
+    else:
+        raise ValueError(_INCOMPATIBLE_SHAPES)
+    return A, B
+
+
+def sp_matmul_topn_candidates(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: csr_matrix | csc_matrix | coo_matrix,
+    candidates: csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    threshold: int | float | None = None,
+    sort: bool = False,
+    n_threads: int | None = None,
+    idx_dtype: DTypeLike | None = None,
+) -> csr_matrix:
+    """Compute A * B for the candidate pairs only whilst only storing the `top_n` elements.
+
+    Only the elements `(i, k)` that are stored in `candidates` are computed, every other element of C is zero.
+    The values are exact dot products, the candidates are typically generated by an approximate method,
+    see `sparse_dot_topn.lsh`.
+
+    Args:
+        A: LHS of the multiplication, the number of columns of A determines the orientation of B.
+            `A` must be have an {32, 64}bit {int, float} dtype that is of the same kind as `B`.
+            Note the matrix is converted (copied) to CSR format if a CSC or COO matrix.
+        B: RHS of the multiplication, the number of rows of B must match the number of columns of A or the shape of B.T should be match A.
+            `B` must be have an {32, 64}bit {int, float} dtype that is of the same kind as `A`.
+            Note that the candidates are looked up by row of `B.T`, passing `B` with shape `(n, A.shape[1])` as a CSR matrix avoids a copy.
+        candidates: matrix with shape `(A.shape[0], n)` where the stored elements, regardless of their value, indicate the pairs to compute
+        top_n: the number of results to retain
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+
+    Throws:
+        TypeError: when A, B are not trivially convertable to a `CSR matrix`
+        ValueError: when the shape of `candidates` does not match A and B
+
+    Returns:
+        C: result matrix
+
+    """
+    A, B = _as_csr_row_operands(A, B)
+    return _candidates_rows(A, B, candidates, top_n, threshold, sort, n_threads, idx_dtype)
+
+
+def _candidates_rows(
+    A: csr_matrix,
+    B: csr_matrix,
+    candidates: csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    threshold: int | float | None,
+    sort: bool,
+    n_threads: int | None,
+    idx_dtype: DTypeLike | None,
+) -> csr_matrix:
+    """`sp_matmul_topn_candidates` for CSR operands that are already oriented by `_as_csr_row_operands`."""
+    n_threads = _resolve_n_threads(n_threads)
+    idx_dtype = assert_idx_dtype(idx_dtype)
+
+    A_nrows, n_features = A.shape
+    B_nrows = B.shape[0]
+    if candidates.shape != (A_nrows, B_nrows):
+        msg = f"`candidates` must have shape {(A_nrows, B_nrows)}, got {candidates.shape}"
+        raise ValueError(msg)
+    candidates = candidates.tocsr(False)
+    # duplicate candidates would be stored more than once
+    if not candidates.has_canonical_format:
+        candidates = candidates.copy()
+        candidates.sum_duplicates()
+
+    assert_supported_dtype(A)
+    assert_supported_dtype(B)
+    ensure_compatible_dtype(A, B)
+
+    top_n = min(top_n, B_nrows)
+    if threshold is not None:
+        threshold = int(np.rint(threshold)) if np.issubdtype(A.data.dtype, np.integer) else float(threshold)
+
+    if A.indices.size == 0 or B.indices.size == 0 or candidates.indices.size == 0:
+        C_indptr = np.zeros(A_nrows + 1, dtype=idx_dtype)
+        C_indices = np.zeros(1, dtype=idx_dtype)
+        C_data = np.zeros(1, dtype=A.dtype)
+        return csr_matrix((C_data, C_indices, C_indptr), shape=(A_nrows, B_nrows))
+
+    kwargs = {
+        "top_n": top_n,
+        "nrows": A_nrows,
+        "nfeatures": n_features,
+        "threshold": threshold,
+        "A_data": A.data,
+        "A_indptr": A.indptr.astype(idx_dtype),
+        "A_indices": A.indices.astype(idx_dtype),
+        "B_data": B.data,
+        "B_indptr": B.indptr.astype(idx_dtype),
+        "B_indices": B.indices.astype(idx_dtype),
+        "cand_indptr": candidates.indptr.astype(idx_dtype),
+        "cand_indices": candidates.indices.astype(idx_dtype),
+    }
+
+    func = _core.sp_matmul_topn_candidates if not sort else _core.sp_matmul_topn_candidates_sorted
+    if n_threads > 1:
+        if _core._has_openmp_support:
+            kwargs["n_threads"] = n_threads
+            func = _core.sp_matmul_topn_candidates_mt if not sort else _core.sp_matmul_topn_candidates_sorted_mt
+        else:
+            msg = "sparse_dot_topn: extension was compiled without parallelisation (OpenMP) support, ignoring ``n_threads``"
+            warnings.warn(msg, stacklevel=1)
+    return csr_matrix(func(**kwargs), shape=(A_nrows, B_nrows))
+
+
+def dense_matmul_topn(
+    A: NDArray | csr_matrix | csc_matrix | coo_matrix,
+    B: NDArray,
+    top_n: int,
+    threshold: int | float | None = None,
+    sort: bool = False,
+    n_threads: int | None = None,
+    tile_shape: tuple[int, int] = (1024, 4096),
+    idx_dtype: DTypeLike | None = None,
+) -> csr_matrix:
+    """Compute C = A * B for a dense B whilst only storing the `top_n` elements.
+
+    C is computed tile by tile, each tile is a dense matrix product (BLAS for floating point dtypes)
+    that is merged into the running top-n of its rows. The memory footprint is bounded by the tile and
+    the output, the dense product `A * B` is never created.
+
+    Args:
+        A: LHS of the multiplication, a dense array or a sparse matrix. The number of columns of A determines the orientation of B.
+            Note that sparse matrices are converted (copied) to CSR format if a CSC or COO matrix.
+        B: dense RHS of the multiplication, the number of rows of B must match the number of columns of A or the shape of B.T should be match A,
+            e.g. an embedding matrix with shape `(n_items, dim)`.
+            `A` and `B` must have an {32, 64}bit {int, float} dtype of the same kind.
+        top_n: the number of results to retain
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        n_threads: number of threads to use for the top-n selection, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+            The tile products use the threads of the BLAS library that NumPy is linked against.
+        tile_shape: the number of rows of A and columns of B that make up a tile
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+
+    Throws:
+        TypeError: when B is sparse or A and B do not have a supported dtype of the same kind
+        ValueError: when the shapes of A and B are incompatible
+
+    Returns:
+        C: result matrix, without `sort` the elements of a row are in column order
+
+    """
+    n_threads = _resolve_n_threads(n_threads)
+    idx_dtype = assert_idx_dtype(idx_dtype)
+
+    if isinstance(A, (coo_matrix, csc_matrix)):
+        A = A.tocsr(False)
+    elif not isinstance(A, csr_matrix):
+        A = np.asarray(A)
+    if issparse(B):
+        msg = "`B` must be a dense array, use `sp_matmul_topn` for sparse matrices"
+        raise TypeError(msg)
+    B = np.asarray(B)
+    if A.ndim != 2 or B.ndim != 2:
+        msg = "`A` and `B` must be two dimensional"
+        raise ValueError(msg)
+
+    if A.shape[1] != B.shape[0]:
+        if A.shape[1] != B.shape[1]:
+            raise ValueError(_INCOMPATIBLE_SHAPES)
+        B = B.T
+
+    C_dtype = np.result_type(A.dtype, B.dtype)
+    if A.dtype.kind != B.dtype.kind or not is_supported_dtype(C_dtype):
+        msg = (
+            f"`A` and `B` must have a {{32, 64}}bit {{int, float}} dtype of the same kind, got {A.dtype} and {B.dtype}"
+        )
+        raise TypeError(msg)
+
+    A_nrows = A.shape[0]
+    B_ncols = B.shape[1]
+    top_n = min(top_n, B_ncols)
+    if threshold is not None:
+        threshold = int(np.rint(threshold)) if np.issubdtype(C_dtype, np.integer) else float(threshold)
+
+    func = _core.dense_topn_update if not sort else _core.dense_topn_update_sorted
+    kwargs = {"top_n": top_n, "threshold": threshold}
+    if n_threads > 1:
+        if _core._has_openmp_support:
+            kwargs["n_threads"] = n_threads
+            func = _core.dense_topn_update_mt if not sort else _core.dense_topn_update_sorted_mt
+        else:
+            msg = "sparse_dot_topn: extension was compiled without parallelisation (OpenMP) support, ignoring ``n_threads``"
+            warnings.warn(msg, stacklevel=1)
+
+    tile_rows, tile_cols = tile_shape
+    C_data = []
+    C_indices = []
+    C_nset = []
+    for r_start in range(0, A_nrows, tile_rows):
+        A_tile = A[r_start : r_start + tile_rows]
+        nrows = A_tile.shape[0]
+        values = np.zeros(nrows * top_n, dtype=C_dtype)
+        indices = np.zeros(nrows * top_n, dtype=idx_dtype)
+        n_set = np.zeros(nrows, dtype=idx_dtype)
+        for c_start in range(0, B_ncols, tile_cols):
+            X = np.ascontiguousarray(A_tile @ B[:, c_start : c_start + tile_cols], dtype=C_dtype)
+            func(
+                nrows=nrows,
+                ncols=X.shape[1],
+                col_offset=c_start,
+                X=X.ravel(),
+                values=values,
+                indices=indices,
+                n_set=n_set,
+                **kwargs,
+            )
+        mask = (np.arange(top_n) < n_set[:, None]).ravel()
+        C_data.append(values[mask])
+        C_indices.append(indices[mask])
+        C_nset.append(n_set)
+
+    C_indptr = np.zeros(A_nrows + 1, dtype=idx_dtype)
+    if A_nrows > 0:
+        np.cumsum(np.concatenate(C_nset), out=C_indptr[1:])
+    C_data = np.concatenate(C_data) if C_data else np.zeros(0, dtype=C_dtype)
+    C_indices = np.concatenate(C_indices) if C_indices else np.zeros(0, dtype=idx_dtype)
+    return csr_matrix((C_data, C_indices, C_indptr), shape=(A_nrows, B_ncols))
+
+
 def zip_sp_matmul_topn(top_n: int, C_mats: list[csr_matrix]) -> csr_matrix:
     """Compute zip-matrix C = zip_i C_i = zip_i A * B_i = A * B whilst only storing the `top_n` elements.
 
@@ -0,0 +1,240 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Top-n multiplication in chunks of rows with progress reporting and cooperative cancellation.
+
+The rows of A are multiplied in chunks of `chunk_size` rows, between the chunks the progress is
+updated, the callback is called and the cancellation is checked. A chunk is never interrupted,
+a cancellation takes effect when the running chunk completes.
+
+    progress = Progress()
+    # e.g. `progress.cancel()` from another thread or from the callback
+    C = sp_matmul_topn_chunked(A, B, top_n=10, n_threads=8, progress=progress, timeout=600, on_cancel="partial")
+    rows_done = progress.rows_done
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+from sparse_dot_topn._extension import _core
+from sparse_dot_topn.api import _as_csr_operands
+from sparse_dot_topn.threads import _resolve_n_threads
+from sparse_dot_topn.types import (
+    assert_idx_dtype,
+    assert_supported_dtype,
+    ensure_compatible_dtype,
+    mixed_precision_dtype,
+)
+
+if TYPE_CHECKING:
+    from numpy.types import DTypeLike
+
+__all__ = ["CancelledError", "Progress", "sp_matmul_topn_chunked"]
+
+_ON_CANCEL = {"raise", "partial"}
+
+
+class CancelledError(RuntimeError):
+    """Raised when a chunked multiplication is cancelled, `result` holds the rows completed so far."""
+
+    def __init__(self, msg: str, result: csr_matrix, rows_done: int) -> None:
+        super().__init__(msg)
+        self.result = result
+        self.rows_done = rows_done
+
+
+class Progress:
+    """Progress of a chunked multiplication, can be polled and cancelled from any thread.
+
+    Attributes:
+        rows_done: the number of rows of A that have been completed
+        n_rows: the number of rows of A
+        chunks_done: the number of completed chunks
+
+    """
+
+    def __init__(self) -> None:
+        self.rows_done = 0
+        self.n_rows = 0
+        self.chunks_done = 0
+        self._start = time.perf_counter()
+        self._cancelled = threading.Event()
+
+    @property
+    def fraction(self) -> float:
+        """The fraction of the rows that have been completed."""
+        return self.rows_done / self.n_rows if self.n_rows > 0 else 1.0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the multiplication started."""
+        return time.perf_counter() - self._start
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Request the multiplication to stop after the running chunk."""
+        self._cancelled.set()
+
+    def _reset(self, n_rows: int):
+        self.rows_done = 0
+        self.n_rows = n_rows
+        self.chunks_done = 0
+        self._start = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return f"Progress(rows_done={self.rows_done}, n_rows={self.n_rows}, cancelled={self.cancelled})"
+
+
+def _stack_rows(chunks: list[csr_matrix], shape: tuple[int, int], dtype: DTypeLike, idx_dtype: DTypeLike) -> csr_matrix:
+    """Stack the chunks of rows, rows beyond the chunks are empty."""
+    nnz = [C.indptr[-1] for C in chunks]
+    data = np.concatenate([np.zeros(0, dtype=dtype)] + [C.data[:n] for C, n in zip(chunks, nnz)])
+    indices = np.concatenate([np.zeros(0, dtype=idx_dtype)] + [C.indices[:n] for C, n in zip(chunks, nnz)])
+    indptr = np.empty(shape[0] + 1, dtype=idx_dtype)
+    indptr[0] = 0
+    lb = 0
+    offset = 0
+    for C, n in zip(chunks, nnz):
+        ub = lb + C.shape[0]
+        indptr[lb + 1 : ub + 1] = C.indptr[1:] + offset
+        offset += n
+        lb = ub
+    indptr[lb + 1 :] = offset
+    return csr_matrix((data, indices, indptr), shape=shape)
+
+
+def sp_matmul_topn_chunked(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    threshold: int | float | None = None,
+    sort: bool = False,
+    density: float | None = None,
+    n_threads: int | None = None,
+    idx_dtype: DTypeLike | None = None,
+    chunk_size: int = 10_000,
+    callback: Callable[[Progress], None] | None = None,
+    progress: Progress | None = None,
+    timeout: float | None = None,
+    on_cancel: str = "raise",
+) -> csr_matrix:
+    """Compute A * B whilst only storing the `top_n` elements, in chunks of rows of A.
+
+    The result equals `sp_matmul_topn`. The multiplication is cancelled when `progress.cancel()` is called,
+    when `timeout` is exceeded or on a `KeyboardInterrupt`, e.g. SIGINT, and stops after the running chunk.
+
+    Args:
+        A: LHS of the multiplication, see `sp_matmul_topn`
+        B: RHS of the multiplication, see `sp_matmul_topn`
+        top_n: the number of results to retain
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        density: the expected density of the result considering `top_n`, see `sp_matmul_topn`
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+        chunk_size: the number of rows of A per chunk, smaller chunks react faster but have more overhead
+        callback: called with the `Progress` after every chunk, e.g. to update a progress bar
+        progress: the progress to update, create it beforehand to poll or cancel it from another thread
+        timeout: cancel the multiplication after this number of seconds
+        on_cancel: 'raise' raises `CancelledError` (or re-raises the `KeyboardInterrupt`),
+            'partial' returns the result where only the completed rows are filled
+
+    Throws:
+        ValueError: when `chunk_size` is not positive or `on_cancel` is not supported
+        CancelledError: when cancelled and `on_cancel` is 'raise', the partial result is stored in `result`
+
+    Returns:
+        C: result matrix, when cancelled with `on_cancel='partial'` the rows from `progress.rows_done` onwards are empty
+
+    """
+    if chunk_size < 1:
+        msg = f"`chunk_size` must be a positive integer, got `{chunk_size}`"
+        raise ValueError(msg)
+    if on_cancel not in _ON_CANCEL:
+        msg = f"`on_cancel` must be one of 'raise' or 'partial', got `{on_cancel}`"
+        raise ValueError(msg)
+    idx_dtype = assert_idx_dtype(idx_dtype)
+    n_threads = _resolve_n_threads(n_threads)
+    density: float = density or 1.0
+    A, B = _as_csr_operands(A, B)
+    shape = (A.shape[0], B.shape[1])
+    C_dtype = mixed_precision_dtype(A.dtype, B.dtype)
+    if C_dtype is None:
+        assert_supported_dtype(A)
+        assert_supported_dtype(B)
+        ensure_compatible_dtype(A, B)
+        C_dtype = A.dtype
+    top_n = min(top_n, B.shape[1])
+    if threshold is not None:
+        threshold = int(np.rint(threshold)) if np.issubdtype(C_dtype, np.integer) else float(threshold)
+
+    # the operands are validated and converted once, every chunk calls the kernel on a slice of the rows of A
+    kwargs = {
+        "top_n": top_n,
+        "ncols": B.shape[1],
+        "threshold": threshold,
+        "density": density,
+        "B_data": B.data,
+        "B_indptr": B.indptr.astype(idx_dtype),
+        "B_indices": B.indices.astype(idx_dtype),
+    }
+    A_indptr = A.indptr.astype(idx_dtype)
+    A_indices = A.indices.astype(idx_dtype)
+    func = _core.sp_matmul_topn if not sort else _core.sp_matmul_topn_sorted
+    if n_threads > 1:
+        if _core._has_openmp_support:
+            kwargs["n_threads"] = n_threads
+            kwargs.pop("density")
+            func = _core.sp_matmul_topn_mt if not sort else _core.sp_matmul_topn_sorted_mt
+        else:
+            msg = "sparse_dot_topn: extension was compiled without parallelisation (OpenMP) support, ignoring ``n_threads``"
+            warnings.warn(msg, stacklevel=1)
+    is_empty = A.indices.size == 0 or B.indices.size == 0
+
+    progress = progress if progress is not None else Progress()
+    progress._reset(A.shape[0])
+    chunks = []
+    interrupt = None
+    try:
+        for lb in range(0, A.shape[0], chunk_size):
+            if progress.cancelled:
+                break
+            ub = min(lb + chunk_size, A.shape[0])
+            if not is_empty:
+                start, end = A_indptr[lb], A_indptr[ub]
+                C_data, C_indices, C_indptr = func(
+                    nrows=ub - lb,
+                    A_data=A.data[start:end],
+                    A_indptr=A_indptr[lb : ub + 1] - start,
+                    A_indices=A_indices[start:end],
+                    **kwargs,
+                )
+                chunks.append(csr_matrix((C_data, C_indices, C_indptr), shape=(ub - lb, shape[1])))
+            else:
+                chunks.append(csr_matrix((ub - lb, shape[1]), dtype=C_dtype))
+            progress.rows_done = ub
+            progress.chunks_done += 1
+            if callback is not None:
+                callback(progress)
+            if timeout is not None and progress.elapsed > timeout:
+                progress.cancel()
+    except KeyboardInterrupt as exc:
+        # the interrupt is raised after the running chunk returned, the completed chunks are kept
+        progress.cancel()
+        interrupt = exc
+
+    C = _stack_rows(chunks, shape, C_dtype, idx_dtype)
+    if interrupt is not None and on_cancel == "raise":
+        raise interrupt
+    if not progress.cancelled or progress.rows_done == A.shape[0] or on_cancel == "partial":
+        return C
+    msg = f"multiplication cancelled after {progress.rows_done} of {A.shape[0]} rows"
+    raise CancelledError(msg, C, progress.rows_done)
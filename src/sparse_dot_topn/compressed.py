@@ -0,0 +1,316 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Compressed column indices of B for a smaller memory footprint of the multiplication.
+
+The column indices of every row of B are sorted and delta encoded, the first index of a row is
+stored as is, and every delta is stored as an unsigned LEB128 varint: seven bits per byte and
+the high bit set when more bytes follow. Deltas below 128 take a single byte instead of the four
+or eight bytes of an index, the kernel decodes the indices while accumulating.
+
+The compressed B can be built once, persisted and reused for a fixed B:
+
+    B_compressed = CompressedCSR.from_csr(B)
+    B_compressed.save("B.npz")
+    C = sp_matmul_topn_compressed(A, CompressedCSR.load("B.npz"), top_n=10)
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+from sparse_dot_topn._extension import _core
+from sparse_dot_topn.threads import _resolve_n_threads
+from sparse_dot_topn.types import (
+    assert_idx_dtype,
+    assert_supported_dtype,
+    ensure_compatible_dtype,
+    mixed_precision_dtype,
+)
+
+if TYPE_CHECKING:
+    import os
+
+    from numpy.types import DTypeLike, NDArray
+
+__all__ = ["CompressedCSR", "sp_matmul_topn_compressed"]
+
+# an index of at most 63 bits takes at most nine bytes
+_MAX_VARINT_BYTES = 9
+# the rows are validated in blocks of about this many bytes of `codes` to bound the memory of the decoding
+_VALIDATE_BLOCK_BYTES = 1 << 22
+
+
+def _encode(indices: NDArray, indptr: NDArray) -> tuple[NDArray[np.int64], NDArray[np.uint8]]:
+    """Delta and varint encode the sorted column indices of every row."""
+    values = indices.astype(np.uint64)
+    values[1:] -= values[:-1]
+    starts = indptr[:-1][np.diff(indptr) > 0]
+    values[starts] = indices[starts]
+
+    nbytes = np.ones(values.size, dtype=np.int64)
+    for b in range(1, _MAX_VARINT_BYTES):
+        nbytes += values >= np.uint64(1 << (7 * b))
+    positions = np.zeros(values.size + 1, dtype=np.int64)
+    np.cumsum(nbytes, out=positions[1:])
+
+    codes = np.empty(positions[-1], dtype=np.uint8)
+    for b in range(int(nbytes.max(initial=1))):
+        mask = nbytes > b
+        group = (values[mask] >> np.uint64(7 * b)) & np.uint64(0x7F)
+        more = np.where(nbytes[mask] > b + 1, np.uint64(0x80), np.uint64(0))
+        codes[positions[:-1][mask] + b] = group | more
+    return positions[indptr], codes
+
+
+def _decode(indptr: NDArray, codes: NDArray[np.uint8]) -> NDArray[np.int64]:
+    """Decode the column indices of every row, the inverse of `_encode`."""
+    ends = np.flatnonzero(codes < 0x80)
+    if ends.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.zeros(ends.size, dtype=np.int64)
+    starts[1:] = ends[:-1] + 1
+    shift = 7 * (np.arange(codes.size) - np.repeat(starts, ends - starts + 1))
+    groups = (codes & 0x7F).astype(np.int64) << shift
+    values = np.add.reduceat(groups, starts)
+
+    cumulative = np.cumsum(values)
+    before_row = np.zeros(cumulative.size + 1, dtype=np.int64)
+    before_row[1:] = cumulative
+    return cumulative - np.repeat(before_row[indptr[:-1]], np.diff(indptr))
+
+
+def _validate(data: NDArray, indptr: NDArray, offsets: NDArray, codes: NDArray[np.uint8], shape: tuple[int, int]):
+    """Check the consistency of the arrays, the kernel does not bounds check the decoded indices."""
+    nrows, ncols = shape
+    if indptr.ndim != 1 or indptr.size != nrows + 1 or offsets.ndim != 1 or offsets.size != nrows + 1:
+        msg = f"`indptr` and `offsets` must have {nrows + 1} elements, got {indptr.size} and {offsets.size}"
+        raise ValueError(msg)
+    if indptr[0] != 0 or indptr[-1] != data.size or np.any(np.diff(indptr) < 0):
+        msg = "`indptr` must be non-decreasing from zero to the number of elements of `data`"
+        raise ValueError(msg)
+    if offsets[0] != 0 or offsets[-1] != codes.size or np.any(np.diff(offsets) < 0):
+        msg = "`offsets` must be non-decreasing from zero to the number of elements of `codes`"
+        raise ValueError(msg)
+    row = 0
+    while row < nrows:
+        # a block holds at least one row, a row is never split
+        end = int(np.searchsorted(offsets, offsets[row] + _VALIDATE_BLOCK_BYTES, side="right")) - 1
+        end = max(end, row + 1)
+        _validate_rows(
+            indptr[row : end + 1] - indptr[row],
+            codes[offsets[row] : offsets[end]],
+            offsets[row : end + 1] - offsets[row],
+            ncols,
+        )
+        row = end
+
+
+def _validate_rows(indptr: NDArray, codes: NDArray[np.uint8], offsets: NDArray, ncols: int):
+    """Check the encoded column indices of a range of rows, `indptr` and `offsets` start at zero."""
+    # every varint ends with a byte below 0x80, a row must hold one varint per element
+    ends = np.zeros(codes.size + 1, dtype=np.int64)
+    np.cumsum(codes < 0x80, out=ends[1:])
+    nonempty = np.diff(offsets) > 0
+    if np.any(ends[offsets[1:]] - ends[offsets[:-1]] != np.diff(indptr)) or np.any(
+        codes[offsets[1:][nonempty] - 1] >= 0x80
+    ):
+        msg = "`codes` do not hold one varint per element of every row"
+        raise ValueError(msg)
+    ends = np.flatnonzero(codes < 0x80)
+    if ends.size > 0 and np.diff(ends, prepend=-1).max() > _MAX_VARINT_BYTES:
+        msg = f"`codes` hold varints longer than {_MAX_VARINT_BYTES} bytes"
+        raise ValueError(msg)
+    indices = _decode(indptr, codes)
+    if indices.size > 0 and (indices.min() < 0 or indices.max() >= ncols):
+        msg = f"the column indices encoded in `codes` must be in [0, {ncols})"
+        raise ValueError(msg)
+
+
+class CompressedCSR:
+    """B in CSR format with delta and varint encoded column indices.
+
+    Attributes:
+        data: the non-zero elements
+        indptr: the row indices for `data`
+        offsets: the offset of the encoded column indices of every row in `codes`
+        codes: the encoded column indices
+        shape: the shape of the matrix
+
+    """
+
+    def __init__(
+        self, data: NDArray, indptr: NDArray, offsets: NDArray, codes: NDArray, shape: tuple[int, int]
+    ) -> None:
+        """Wrap encoded arrays, see `from_csr` to compress a matrix.
+
+        Throws:
+            ValueError: when the arrays are not consistent with each other or with the shape
+
+        """
+        self._set(data, indptr, offsets, codes, shape)
+        _validate(self.data, self.indptr, self.offsets, self.codes, self.shape)
+
+    def _set(self, data: NDArray, indptr: NDArray, offsets: NDArray, codes: NDArray, shape: tuple[int, int]):
+        self.data = np.asarray(data)
+        self.indptr = np.asarray(indptr)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @classmethod
+    def from_csr(cls, B: csr_matrix | csc_matrix | coo_matrix) -> CompressedCSR:
+        """Compress the column indices of B.
+
+        Args:
+            B: RHS of the multiplication in the orientation `A.shape[1] == B.shape[0]`
+
+        Throws:
+            TypeError: when the dtype of B is not supported
+
+        Returns:
+            B_compressed: the compressed matrix
+
+        """
+        B = csr_matrix(B)
+        assert_supported_dtype(B)
+        if not B.has_sorted_indices:
+            # `sort_indices` works in place, B must not be modified
+            B = B.copy()
+            B.sort_indices()
+        indptr = B.indptr.astype(np.int32 if B.nnz < np.iinfo(np.int32).max else np.int64, copy=False)
+        offsets, codes = _encode(B.indices, B.indptr)
+        # the encoding is consistent by construction, validating would decode it again
+        B_compressed = cls.__new__(cls)
+        B_compressed._set(B.data, indptr, offsets, codes, B.shape)
+        return B_compressed
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indptr[-1])
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of the arrays."""
+        return self.data.nbytes + self.indptr.nbytes + self.offsets.nbytes + self.codes.nbytes
+
+    def to_csr(self) -> csr_matrix:
+        """Decompress the column indices."""
+        indices = _decode(self.indptr, self.codes)
+        idx_dtype = np.int32 if self.shape[1] <= np.iinfo(np.int32).max else np.int64
+        return csr_matrix((self.data, indices.astype(idx_dtype), self.indptr), shape=self.shape)
+
+    def save(self, file: str | os.PathLike | BinaryIO):
+        """Store the compressed matrix in `.npz` format, see `numpy.savez`."""
+        np.savez(
+            file,
+            data=self.data,
+            indptr=self.indptr,
+            offsets=self.offsets,
+            codes=self.codes,
+            shape=np.asarray(self.shape),
+        )
+
+    @classmethod
+    def load(cls, file: str | os.PathLike | BinaryIO) -> CompressedCSR:
+        """Load a compressed matrix stored with `save`, the arrays are validated."""
+        with np.load(file) as arrays:
+            return cls(arrays["data"], arrays["indptr"], arrays["offsets"], arrays["codes"], tuple(arrays["shape"]))
+
+    def __repr__(self) -> str:
+        return f"CompressedCSR(shape={self.shape}, nnz={self.nnz}, dtype={self.data.dtype}, nbytes={self.nbytes})"
+
+
+def sp_matmul_topn_compressed(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: CompressedCSR | csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    threshold: int | float | None = None,
+    sort: bool = False,
+    density: float | None = None,
+    n_threads: int | None = None,
+    idx_dtype: DTypeLike | None = None,
+) -> csr_matrix:
+    """Compute A * B whilst only storing the `top_n` elements, where the column indices of B are compressed.
+
+    The result equals `sp_matmul_topn`, elements with equal values can be selected differently.
+
+    Args:
+        A: LHS of the multiplication, the dtypes of A and B follow the rules of `sp_matmul_topn` without mixed precision
+        B: RHS of the multiplication in the orientation `A.shape[1] == B.shape[0]`, a `CompressedCSR` is reused
+        top_n: the number of results to retain
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        density: the expected density of the result considering `top_n`, see `sp_matmul_topn`
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+
+    Throws:
+        TypeError: when the dtypes of A and B are not supported or cannot be safely cast
+        ValueError: when the shapes of A and B are incompatible
+
+    Returns:
+        C: result matrix
+
+    """
+    n_threads = _resolve_n_threads(n_threads)
+    density: float = density or 1.0
+    idx_dtype = assert_idx_dtype(idx_dtype)
+    if not isinstance(B, CompressedCSR):
+        B = CompressedCSR.from_csr(B)
+    A = A.tocsr(False) if isinstance(A, (coo_matrix, csc_matrix)) else csr_matrix(A)
+    if A.shape[1] != B.shape[0]:
+        msg = f"`A.shape[1]` must be equal to `B.shape[0]`, got {A.shape[1]} and {B.shape[0]}"
+        raise ValueError(msg)
+    # the kernel has no mixed-precision variant, casting B would copy its data on every call
+    B_data = B.data
+    if mixed_precision_dtype(A.dtype, B_data.dtype) is not None:
+        msg = (
+            f"`A` and `B` must have the same dtype, got {A.dtype} and {B_data.dtype}, mixed precision is not supported"
+        )
+        raise TypeError(msg)
+    assert_supported_dtype(A)
+    if A.dtype != B_data.dtype:
+        lhs, rhs = ensure_compatible_dtype(A, B_data)
+        A, B_data = (lhs, rhs) if A.dtype.itemsize <= B_data.dtype.itemsize else (rhs, lhs)
+
+    A_nrows = A.shape[0]
+    B_ncols = B.shape[1]
+    top_n = min(top_n, B_ncols)
+    if threshold is not None:
+        threshold = int(np.rint(threshold)) if np.issubdtype(B_data.dtype, np.integer) else float(threshold)
+
+    if A.indices.size == 0 or B.nnz == 0:
+        C_indptr = np.zeros(A_nrows + 1, dtype=idx_dtype)
+        C_indices = np.zeros(1, dtype=idx_dtype)
+        C_data = np.zeros(1, dtype=B_data.dtype)
+        return csr_matrix((C_data, C_indices, C_indptr), shape=(A_nrows, B_ncols))
+
+    kwargs = {
+        "top_n": top_n,
+        "nrows": A_nrows,
+        "ncols": B_ncols,
+        "threshold": threshold,
+        "density": density,
+        "A_data": A.data,
+        "A_indptr": A.indptr.astype(idx_dtype),
+        "A_indices": A.indices.astype(idx_dtype),
+        "B_data": B_data,
+        # B is not copied when it is stored with the index dtype
+        "B_indptr": B.indptr.astype(idx_dtype, copy=False),
+        "B_offsets": B.offsets,
+        "B_bytes": B.codes,
+    }
+
+    func = _core.sp_matmul_topn_compressed if not sort else _core.sp_matmul_topn_compressed_sorted
+    if n_threads > 1:
+        if _core._has_openmp_support:
+            kwargs["n_threads"] = n_threads
+            kwargs.pop("density")
+            func = _core.sp_matmul_topn_compressed_mt if not sort else _core.sp_matmul_topn_compressed_sorted_mt
+        else:
+            msg = "sparse_dot_topn: extension was compiled without parallelisation (OpenMP) support, ignoring ``n_threads``"
+            warnings.warn(msg, stacklevel=1)
+    return csr_matrix(func(**kwargs), shape=(A_nrows, B_ncols))
@@ -0,0 +1,113 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Incremental maintenance of a top-n result when columns are added to or removed from B.
+
+A typical workflow stores the result with a margin, i.e. `top_n + margin` elements per row,
+such that removed columns can be backfilled without recomputing the product:
+
+    C = sp_matmul_topn(A, B, top_n=top_n + margin)
+    C = update_topn(C, A, B_new, top_n=top_n + margin)
+    C = remove_columns_topn(C, retired)
+    C_topn = zip_sp_matmul_topn(top_n, [C])
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+from sparse_dot_topn.api import sp_matmul_topn, zip_sp_matmul_topn
+
+if TYPE_CHECKING:
+    from numpy.types import ArrayLike
+
+__all__ = ["remove_columns_topn", "update_topn"]
+
+
+def update_topn(
+    C: csr_matrix | csc_matrix | coo_matrix,
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B_new: csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    threshold: int | float | None = None,
+    density: float | None = None,
+    n_threads: int | None = None,
+) -> csr_matrix:
+    """Merge the top-n of A * B_new into the existing top-n result C = A * B.
+
+    Only A * B_new is computed, the columns of B_new are appended to the columns of B,
+    i.e. column `j` of B_new is column `C.shape[1] + j` of the result.
+
+    Args:
+        C: the top-n result of A * B
+        A: LHS of the multiplication, the same matrix that was used to compute C
+        B_new: the new columns of B, the orientation follows `sp_matmul_topn`
+        top_n: the number of results to retain; should be smaller or equal to top_n used to obtain C
+        threshold: only return values greater than the threshold, should be equal to the threshold used to obtain C
+        density: the expected density of the result considering `top_n`, see `sp_matmul_topn`
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+
+    Raises:
+        ValueError: when the number of rows of C and A do not match
+
+    Returns:
+        C: result matrix with shape `(C.shape[0], C.shape[1] + n_new)`, the elements of each row are sorted by value
+
+    """
+    if isinstance(C, (coo_matrix, csc_matrix)):
+        C = C.tocsr(False)
+    if C.shape[0] != A.shape[0]:
+        msg = f"`C` and `A` must have the same number of rows, got {C.shape[0]} and {A.shape[0]}"
+        raise ValueError(msg)
+    C_new = sp_matmul_topn(
+        A, B_new, top_n=top_n, threshold=threshold, density=density, n_threads=n_threads, idx_dtype=C.indices.dtype
+    )
+    return zip_sp_matmul_topn(top_n, [C, C_new.astype(C.dtype, copy=False)])
+
+
+def remove_columns_topn(
+    C: csr_matrix | csc_matrix | coo_matrix, columns: ArrayLike, top_n: int | None = None, compact: bool = False
+) -> csr_matrix:
+    """Remove the elements of retired columns from a top-n result.
+
+    The elements of the removed columns are replaced by the next best elements of the row that
+    are stored in C, e.g. the margin of a result computed with `top_n + margin`.
+    A row of which more than `margin` stored elements are removed can miss elements that would be
+    part of the top-n of the full product, such rows have fewer than `top_n` elements afterwards.
+
+    Args:
+        C: the top-n result with a margin
+        columns: the indices of the columns to remove
+        top_n: the number of results to retain, by default all remaining elements are retained
+        compact: remove the columns from the shape of C and renumber the remaining columns
+
+    Raises:
+        ValueError: when `columns` holds indices outside `[0, C.shape[1])`
+
+    Returns:
+        C: result matrix, the elements of each row are sorted by value when `top_n` is set
+
+    """
+    if isinstance(C, (coo_matrix, csc_matrix)):
+        C = C.tocsr(False)
+    columns = np.unique(np.asarray(columns))
+    if columns.size and (columns[0] < 0 or columns[-1] >= C.shape[1]):
+        msg = f"`columns` must be in [0, {C.shape[1]}), got {columns[0]} to {columns[-1]}"
+        raise ValueError(msg)
+    columns = columns.astype(C.indices.dtype, copy=False)
+
+    keep = ~np.isin(C.indices, columns)
+    rows = np.repeat(np.arange(C.shape[0]), np.diff(C.indptr))
+    indptr = np.zeros(C.shape[0] + 1, dtype=C.indptr.dtype)
+    np.cumsum(np.bincount(rows[keep], minlength=C.shape[0]), out=indptr[1:])
+    indices = C.indices[keep]
+    ncols = C.shape[1]
+    if compact:
+        indices = indices - np.searchsorted(columns, indices).astype(indices.dtype)
+        ncols -= columns.size
+
+    C = csr_matrix((C.data[keep], indices, indptr), shape=(C.shape[0], ncols))
+    if top_n is not None:
+        C = zip_sp_matmul_topn(top_n, [C])
+    return C
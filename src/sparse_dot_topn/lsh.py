@@ -0,0 +1,242 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Approximate top-n multiplication using locality sensitive hashing.
+
+The rows of A and B are hashed into `n_bands` signatures of `n_rows` values each.
+Pairs that share at least one band signature are candidates, only the candidates are
+scored with the exact dot product, see `sp_matmul_topn_candidates`.
+
+For MinHash the probability that a pair with Jaccard similarity `s` is a candidate is
+`1 - (1 - s ** n_rows) ** n_bands`, for SimHash `s` is `1 - angle / pi`.
+Increasing `n_bands` increases the recall, increasing `n_rows` reduces the number of candidates.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+from sparse_dot_topn.api import _as_csr_row_operands, _candidates_rows
+
+if TYPE_CHECKING:
+    from numpy.types import DTypeLike, NDArray
+
+__all__ = ["lsh_candidates", "minhash_signatures", "simhash_signatures", "sp_matmul_topn_lsh"]
+
+_LSH_METHODS = {"minhash", "simhash"}
+
+# multiply-shift hashing, `(a * x + b) >> 32` with 64 bit wrap around
+_SHIFT = np.uint64(32)
+_EMPTY = np.iinfo(np.uint32).max
+# odd multiplier used to combine the values of a band into a single key
+_BAND_MULT = np.uint64(0x9E3779B97F4A7C15)
+# maximum number of elements of the temporary hash matrix
+_MAX_HASH_BLOCK = 1 << 23
+
+
+def minhash_signatures(X: csr_matrix, n_hashes: int, seed: int | None = None) -> NDArray[np.uint32]:
+    """Compute the MinHash signatures of the rows of X.
+
+    Every stored element is treated as a member of the set of the row, the values are ignored.
+    Rows without stored elements have a signature equal to `2 ** 32 - 1`.
+
+    Args:
+        X: matrix in CSR format
+        n_hashes: the number of hash functions
+        seed: seed for the hash functions, rows hashed with the same seed can be compared
+
+    Returns:
+        signatures: array with shape `(X.shape[0], n_hashes)`
+
+    """
+    rng = np.random.default_rng(seed)
+    # `a` must be odd for the multiply-shift scheme to be universal
+    a = rng.integers(0, np.iinfo(np.uint64).max, size=n_hashes, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, size=n_hashes, dtype=np.uint64, endpoint=True)
+
+    signatures = np.full((X.shape[0], n_hashes), _EMPTY, dtype=np.uint32)
+    non_empty = np.diff(X.indptr) > 0
+    if not non_empty.any():
+        return signatures
+    starts = X.indptr[:-1][non_empty]
+    x = X.indices.astype(np.uint64)
+
+    step = max(1, _MAX_HASH_BLOCK // max(x.size, 1))
+    for lb in range(0, n_hashes, step):
+        ub = min(lb + step, n_hashes)
+        hashes = ((np.multiply.outer(a[lb:ub], x) + b[lb:ub, None]) >> _SHIFT).astype(np.uint32)
+        signatures[non_empty, lb:ub] = np.minimum.reduceat(hashes, starts, axis=1).T
+    return signatures
+
+
+def simhash_signatures(X: csr_matrix, n_bits: int, seed: int | None = None) -> NDArray[np.bool_]:
+    """Compute the SimHash (random hyperplane) signatures of the rows of X.
+
+    Args:
+        X: matrix in CSR format
+        n_bits: the number of random hyperplanes
+        seed: seed for the hyperplanes, rows hashed with the same seed can be compared
+
+    Returns:
+        signatures: boolean array with shape `(X.shape[0], n_bits)`
+
+    """
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((X.shape[1], n_bits), dtype=np.float32)
+    return np.asarray(X.dot(planes)) > 0
+
+
+def _band_keys(signatures: NDArray, n_bands: int, n_rows: int) -> NDArray[np.uint64]:
+    """Combine the `n_rows` values of each band into a single key, returns shape `(n_bands, n)`."""
+    keys = np.zeros((n_bands, signatures.shape[0]), dtype=np.uint64)
+    for band in range(n_bands):
+        for j in range(band * n_rows, (band + 1) * n_rows):
+            keys[band] = keys[band] * _BAND_MULT + signatures[:, j].astype(np.uint64)
+    return keys
+
+
+def _band_pairs(
+    keys_A: NDArray[np.uint64],
+    keys_B: NDArray[np.uint64],
+    rows_A: NDArray[np.int64],
+    rows_B: NDArray[np.int64],
+    max_bucket_size: int | None,
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Return all pairs of `rows_A` and `rows_B` with an equal key."""
+    order = rows_B[np.argsort(keys_B[rows_B], kind="stable")]
+    sorted_keys = keys_B[order]
+    lookup = keys_A[rows_A]
+    left = np.searchsorted(sorted_keys, lookup, side="left")
+    counts = np.searchsorted(sorted_keys, lookup, side="right") - left
+    if max_bucket_size is not None:
+        counts[counts > max_bucket_size] = 0
+    total = counts.sum()
+    rows = np.repeat(rows_A, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    cols = order[np.repeat(left, counts) + offsets]
+    return rows, cols
+
+
+def lsh_candidates(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: csr_matrix | csc_matrix | coo_matrix,
+    n_bands: int = 16,
+    n_rows: int = 4,
+    method: str = "minhash",
+    seed: int | None = None,
+    max_bucket_size: int | None = None,
+) -> csr_matrix:
+    """Generate candidate pairs of rows of A and columns of B using banded locality sensitive hashing.
+
+    Args:
+        A: LHS of the multiplication, the number of columns of A determines the orientation of B.
+        B: RHS of the multiplication, the number of rows of B must match the number of columns of A or the shape of B.T should be match A.
+        n_bands: the number of bands, a pair is a candidate when any band matches
+        n_rows: the number of hash values per band, all values must be equal for a band to match
+        method: 'minhash' approximates the Jaccard similarity of the non-zero patterns,
+            'simhash' approximates the cosine similarity of the values
+        seed: seed for the hash functions, `None` draws a random seed that is used for both A and B
+        max_bucket_size: ignore buckets with more than this number of rows of B, e.g. very common n-grams
+
+    Throws:
+        ValueError: when `method` is not supported
+
+    Returns:
+        candidates: boolean matrix with shape `(A.shape[0], n)` where `n` is the number of columns of `B` after orientation
+
+    """
+    if method not in _LSH_METHODS:
+        msg = f"`method` must be one of 'minhash' or 'simhash', got `{method}`"
+        raise ValueError(msg)
+    A, B = _as_csr_row_operands(A, B)
+    return _lsh_candidates_rows(A, B, n_bands, n_rows, method, seed, max_bucket_size)
+
+
+def _lsh_candidates_rows(
+    A: csr_matrix, B: csr_matrix, n_bands: int, n_rows: int, method: str, seed: int | None, max_bucket_size: int | None
+) -> csr_matrix:
+    """`lsh_candidates` for CSR operands that are already oriented by `_as_csr_row_operands`."""
+    # A and B must be hashed with the same functions
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    n_signature = n_bands * n_rows
+    if method == "minhash":
+        sig_A = minhash_signatures(A, n_signature, seed)
+        sig_B = minhash_signatures(B, n_signature, seed)
+    else:
+        sig_A = simhash_signatures(A, n_signature, seed)
+        sig_B = simhash_signatures(B, n_signature, seed)
+
+    # empty rows have equal signatures but no similarity
+    rows_A = np.flatnonzero(np.diff(A.indptr) > 0)
+    rows_B = np.flatnonzero(np.diff(B.indptr) > 0)
+    keys_A = _band_keys(sig_A, n_bands, n_rows)
+    keys_B = _band_keys(sig_B, n_bands, n_rows)
+
+    pair_rows = []
+    pair_cols = []
+    for band in range(n_bands):
+        rows, cols = _band_pairs(keys_A[band], keys_B[band], rows_A, rows_B, max_bucket_size)
+        pair_rows.append(rows)
+        pair_cols.append(cols)
+    rows = np.concatenate(pair_rows)
+    cols = np.concatenate(pair_cols)
+
+    shape = (A.shape[0], B.shape[0])
+    candidates = coo_matrix((np.ones(rows.size, dtype=np.bool_), (rows, cols)), shape=shape).tocsr()
+    candidates.sum_duplicates()
+    return candidates
+
+
+def sp_matmul_topn_lsh(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    n_bands: int = 16,
+    n_rows: int = 4,
+    method: str = "minhash",
+    threshold: int | float | None = None,
+    sort: bool = False,
+    n_threads: int | None = None,
+    seed: int | None = None,
+    max_bucket_size: int | None = None,
+    idx_dtype: DTypeLike | None = None,
+) -> csr_matrix:
+    """Compute an approximation of A * B whilst only storing the `top_n` elements.
+
+    Candidate pairs are generated with `lsh_candidates` and re-scored with the exact dot product.
+    The values in C are exact but elements that are not a candidate are missing, see the module
+    documentation for the trade-off between `n_bands` and `n_rows`.
+
+    Args:
+        A: LHS of the multiplication, the number of columns of A determines the orientation of B.
+            `A` must be have an {32, 64}bit {int, float} dtype that is of the same kind as `B`.
+        B: RHS of the multiplication, the number of rows of B must match the number of columns of A or the shape of B.T should be match A.
+            `B` must be have an {32, 64}bit {int, float} dtype that is of the same kind as `A`.
+        top_n: the number of results to retain
+        n_bands: the number of bands, a pair is a candidate when any band matches
+        n_rows: the number of hash values per band, all values must be equal for a band to match
+        method: 'minhash' or 'simhash', see `lsh_candidates`
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        n_threads: number of threads to use for the re-scoring, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+        seed: seed for the hash functions, `None` draws a random seed that is used for both A and B
+        max_bucket_size: ignore buckets with more than this number of rows of B
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+
+    Throws:
+        ValueError: when `method` is not supported
+
+    Returns:
+        C: result matrix
+
+    """
+    if method not in _LSH_METHODS:
+        msg = f"`method` must be one of 'minhash' or 'simhash', got `{method}`"
+        raise ValueError(msg)
+    # B is oriented once, the helpers do not orient it again, which would transpose a square B back
+    A, B = _as_csr_row_operands(A, B)
+    candidates = _lsh_candidates_rows(A, B, n_bands, n_rows, method, seed, max_bucket_size)
+    return _candidates_rows(A, B, candidates, top_n, threshold, sort, n_threads, idx_dtype)
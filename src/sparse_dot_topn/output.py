@@ -0,0 +1,75 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Conversion of top-n results to edge lists of `(row, col, score)` triples.
+
+The `col` and `score` arrays are views of the indices and data of the result, only the `row`
+array is allocated. Converting to Arrow does not copy the arrays either.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+if TYPE_CHECKING:
+    from numpy.types import NDArray
+
+__all__ = ["to_pairs", "to_record_batch"]
+
+_OUTPUTS = {"csr", "pairs", "arrow"}
+
+
+def _pairs(data: NDArray, indices: NDArray, indptr: NDArray, nrows: int) -> dict[str, NDArray]:
+    nnz = indptr[nrows]
+    row = np.repeat(np.arange(nrows, dtype=indices.dtype), np.diff(indptr))
+    return {"row": row, "col": indices[:nnz], "score": data[:nnz]}
+
+
+def to_pairs(C: csr_matrix | csc_matrix | coo_matrix) -> dict[str, NDArray]:
+    """Convert a result matrix to an edge list.
+
+    Args:
+        C: the result matrix, e.g. of `sp_matmul_topn` or `zip_sp_matmul_topn`
+
+    Returns:
+        pairs: dictionary with the arrays `row`, `col` and `score` ordered by row, within a row
+            the order of the elements in C is retained
+
+    """
+    if isinstance(C, (coo_matrix, csc_matrix)):
+        C = C.tocsr(False)
+    return _pairs(C.data, C.indices, C.indptr, C.shape[0])
+
+
+def _record_batch(pairs: dict[str, NDArray]):
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+    except ImportError as exc:
+        msg = "sparse_dot_topn: `pyarrow` is required for Arrow output"
+        raise ImportError(msg) from exc
+    return pa.RecordBatch.from_arrays([pa.array(arr) for arr in pairs.values()], names=list(pairs))
+
+
+def to_record_batch(C: csr_matrix | csc_matrix | coo_matrix):
+    """Convert a result matrix to an Arrow RecordBatch with the columns `row`, `col` and `score`.
+
+    Args:
+        C: the result matrix, e.g. of `sp_matmul_topn` or `zip_sp_matmul_topn`
+
+    Raises:
+        ImportError: when `pyarrow` is not installed
+
+    Returns:
+        batch: `pyarrow.RecordBatch` that shares the memory of the `to_pairs` arrays
+
+    """
+    return _record_batch(to_pairs(C))
+
+
+def _as_output(data: NDArray, indices: NDArray, indptr: NDArray, shape: tuple[int, int], output: str):
+    """Wrap the arrays returned by a kernel in the requested output type."""
+    if output == "csr":
+        return csr_matrix((data, indices, indptr), shape=shape)
+    pairs = _pairs(data, indices, indptr, shape[0])
+    return pairs if output == "pairs" else _record_batch(pairs)
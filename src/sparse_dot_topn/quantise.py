@@ -0,0 +1,58 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+if TYPE_CHECKING:
+    from numpy.types import DTypeLike
+
+__all__ = ["quantise"]
+
+_QUANTISE_DTYPES = {np.dtype("int8"), np.dtype("float32")}
+
+
+def quantise(
+    X: csr_matrix | csc_matrix | coo_matrix, dtype: DTypeLike = np.int8
+) -> tuple[csr_matrix | csc_matrix, float]:
+    """Store the non-zero elements of `X` with a lower precision.
+
+    For `int8` the elements are scaled symmetrically such that the largest absolute value maps to 127,
+    i.e. `X ~= scale * X_q`. A product of two quantised matrices should thus be multiplied by
+    `scale_A * scale_B` to obtain values on the original scale, thresholds should be divided by it.
+    The ordering of the values within a row, and hence the top-n selection, is not affected by the rescaling.
+    For `float32` the elements are cast and the scale is 1.0.
+
+    Args:
+        X: matrix to quantise, a COO matrix is converted to CSR format.
+        dtype: the dtype to store the elements with, one of `int8` or `float32`.
+
+    Raises:
+        TypeError: when `dtype` is not supported or `X` is not a sparse matrix
+
+    Returns:
+        X_q: the quantised matrix
+        scale: the factor to multiply `X_q` with to obtain `X`
+
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _QUANTISE_DTYPES:
+        msg = f"`dtype` must be one of `int8` or `float32`, got {dtype}"
+        raise TypeError(msg)
+    if isinstance(X, coo_matrix):
+        X = X.tocsr(False)
+    elif not isinstance(X, (csr_matrix, csc_matrix)):
+        msg = f"type of `X` must be one of `csr_matrix`, `csc_matrix` or `coo_matrix`, got `{type(X)}`"
+        raise TypeError(msg)
+
+    scale = 1.0
+    if dtype == np.dtype("int8"):
+        max_abs = float(np.abs(X.data).max()) if X.data.size > 0 else 0.0
+        if max_abs > 0.0:
+            scale = max_abs / np.iinfo(np.int8).max
+        data = np.rint(X.data / scale).astype(np.int8)
+    else:
+        data = X.data.astype(dtype)
+    return type(X)((data, X.indices, X.indptr), shape=X.shape), scale
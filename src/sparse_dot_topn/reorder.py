@@ -0,0 +1,221 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Locality-improving reordering of the columns of B and the rows of A.
+
+The kernels scatter the products of a row of A into an array with an element per column of B.
+When the columns of B follow e.g. the order of a vocabulary, the columns reached from a row of A are
+spread over that array. Reordering the columns such that columns that share features are close
+together, and the rows of A such that consecutive rows (and hence the rows of a thread) share features,
+improves the cache locality. The result is mapped back to the original indices.
+
+The permuted B can be reused for a fixed B:
+
+    B_reordered = ColumnReordering(B)
+    C = sp_matmul_topn_reordered(A, B_reordered, top_n=10)
+
+Elements with equal values can be selected differently than without reordering.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+
+from sparse_dot_topn.api import _as_csr_operands, sp_matmul_topn
+
+if TYPE_CHECKING:
+    from numpy.types import DTypeLike, NDArray
+
+__all__ = ["ColumnReordering", "column_permutation", "row_permutation", "sp_matmul_topn_reordered"]
+
+_COLUMN_METHODS = {"rcm", "degree"}
+
+
+def _bipartite_rcm(X: csr_matrix) -> NDArray[np.int32]:
+    """Reverse Cuthill-McKee order of the bipartite graph, rows of X are `[0, n)` and columns `[n, n + m)`."""
+    # csgraph is slow to import, it is only loaded when needed
+    from scipy.sparse import bmat  # noqa: PLC0415
+    from scipy.sparse.csgraph import reverse_cuthill_mckee  # noqa: PLC0415
+
+    graph = bmat([[None, X], [X.T, None]], format="csr")
+    graph.data = np.ones(graph.data.size, dtype=np.int8)
+    return reverse_cuthill_mckee(graph, symmetric_mode=True)
+
+
+def column_permutation(B: csr_matrix | csc_matrix | coo_matrix, method: str = "rcm") -> NDArray[np.int32]:
+    """Compute a permutation of the columns of B that groups columns with shared rows.
+
+    Args:
+        B: RHS of the multiplication in the orientation `A.shape[1] == B.shape[0]`
+        method: 'rcm' orders the columns by the reverse Cuthill-McKee order of the bipartite graph of the
+            rows and columns of B, 'degree' orders the columns by decreasing number of non-zero elements
+
+    Throws:
+        ValueError: when `method` is not supported
+
+    Returns:
+        permutation: the original index of every column, i.e. `B[:, permutation]` is the reordered matrix
+
+    """
+    if method not in _COLUMN_METHODS:
+        msg = f"`method` must be one of 'rcm' or 'degree', got `{method}`"
+        raise ValueError(msg)
+    B = csr_matrix(B)
+    if method == "degree":
+        degree = np.bincount(B.indices, minlength=B.shape[1])
+        return np.argsort(-degree, kind="stable").astype(np.int32)
+    order = _bipartite_rcm(B)
+    return (order[order >= B.shape[0]] - B.shape[0]).astype(np.int32)
+
+
+def row_permutation(A: csr_matrix | csc_matrix | coo_matrix) -> NDArray[np.int32]:
+    """Compute a permutation of the rows of A that groups rows with shared columns.
+
+    The rows are ordered by the reverse Cuthill-McKee order of the bipartite graph of the rows and columns of A,
+    rows that are consecutive share features and are processed by the same thread.
+
+    Args:
+        A: LHS of the multiplication
+
+    Returns:
+        permutation: the original index of every row, i.e. `A[permutation]` is the reordered matrix
+
+    """
+    A = csr_matrix(A)
+    order = _bipartite_rcm(A)
+    return order[order < A.shape[0]].astype(np.int32)
+
+
+def _check_permutation(permutation: NDArray, n: int, name: str) -> NDArray:
+    permutation = np.asarray(permutation)
+    if (
+        permutation.shape != (n,)
+        or not np.issubdtype(permutation.dtype, np.integer)
+        or not np.array_equal(np.sort(permutation), np.arange(n))
+    ):
+        msg = f"`{name}` must be a permutation of `range({n})`"
+        raise ValueError(msg)
+    return permutation
+
+
+def _permute_columns(X: csr_matrix, permutation: NDArray) -> csr_matrix:
+    inverse = np.empty_like(permutation)
+    inverse[permutation] = np.arange(permutation.size, dtype=permutation.dtype)
+    # `sort_indices` works in place, the data must not be shared with X
+    X = csr_matrix((X.data.copy(), inverse[X.indices].astype(X.indices.dtype, copy=False), X.indptr), shape=X.shape)
+    X.sort_indices()
+    return X
+
+
+class ColumnReordering:
+    """B with its columns reordered, build once for a fixed B and reuse for every A.
+
+    Attributes:
+        B: the reordered matrix in CSR format
+        permutation: the original index of every column of `B`
+        method: the method used to compute the permutation
+
+    """
+
+    def __init__(
+        self, B: csr_matrix | csc_matrix | coo_matrix, method: str = "rcm", permutation: NDArray | None = None
+    ) -> None:
+        """Reorder the columns of B.
+
+        Args:
+            B: RHS of the multiplication in the orientation `A.shape[1] == B.shape[0]`
+            method: the method of `column_permutation`
+            permutation: a precomputed permutation of the columns, `method` is ignored
+
+        Throws:
+            ValueError: when `permutation` is not a permutation of the columns of B
+
+        """
+        B = csr_matrix(B)
+        if permutation is None:
+            permutation = column_permutation(B, method)
+        self.permutation = _check_permutation(permutation, B.shape[1], "permutation")
+        self.method = method
+        self.B = _permute_columns(B, self.permutation)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.B.shape
+
+    def restore(self, C: csr_matrix) -> csr_matrix:
+        """Map the columns of a result computed with the reordered B back to the original columns."""
+        indices = self.permutation[C.indices].astype(C.indices.dtype, copy=False)
+        return csr_matrix((C.data, indices, C.indptr), shape=C.shape)
+
+    def __repr__(self) -> str:
+        return f"ColumnReordering(shape={self.shape}, method={self.method!r})"
+
+
+def sp_matmul_topn_reordered(
+    A: csr_matrix | csc_matrix | coo_matrix,
+    B: ColumnReordering | csr_matrix | csc_matrix | coo_matrix,
+    top_n: int,
+    threshold: int | float | None = None,
+    sort: bool = False,
+    density: float | None = None,
+    n_threads: int | None = None,
+    idx_dtype: DTypeLike | None = None,
+    method: str = "rcm",
+    reorder_rows: bool = True,
+    rows: NDArray | None = None,
+) -> csr_matrix:
+    """Compute A * B whilst only storing the `top_n` elements, on reordered matrices for a better cache locality.
+
+    The result is indexed by the original rows of A and columns of B.
+
+    Args:
+        A: LHS of the multiplication
+        B: RHS of the multiplication, a `ColumnReordering` is reused and must have the orientation
+            `A.shape[1] == B.shape[0]`, other matrices are transposed when needed like in `sp_matmul_topn`
+        top_n: the number of results to retain
+        threshold: only return values greater than the threshold
+        sort: return C in a format where the first non-zero element of each row is the largest value
+        density: the expected density of the result considering `top_n`, see `sp_matmul_topn`
+        n_threads: number of threads to use, `None` uses the default of `set_num_threads`, -1 will use all but one of the available cores.
+        idx_dtype: dtype to use for the indices, defaults to 32bit integers
+        method: the method of `column_permutation`, only used when B is not a `ColumnReordering`
+        reorder_rows: also reorder the rows of A, see `row_permutation`
+        rows: a precomputed `row_permutation` of A, `reorder_rows` is ignored
+
+    Throws:
+        ValueError: when the shapes of A and B are incompatible or `rows` is not a permutation of the rows of A
+
+    Returns:
+        C: result matrix
+
+    """
+    if isinstance(B, ColumnReordering):
+        A = csr_matrix(A)
+        if A.shape[1] != B.shape[0]:
+            msg = f"`A.shape[1]` must be equal to `B.shape[0]`, got {A.shape[1]} and {B.shape[0]}"
+            raise ValueError(msg)
+    else:
+        A, B = _as_csr_operands(A, B)
+        B = ColumnReordering(B, method)
+
+    if rows is not None:
+        rows = _check_permutation(rows, A.shape[0], "rows")
+    elif reorder_rows:
+        rows = row_permutation(A)
+    C = sp_matmul_topn(
+        A[rows] if rows is not None else A,
+        B.B,
+        top_n=top_n,
+        threshold=threshold,
+        sort=sort,
+        density=density,
+        n_threads=n_threads,
+        idx_dtype=idx_dtype,
+    )
+    C = B.restore(C)
+    if rows is not None:
+        inverse = np.empty_like(rows)
+        inverse[rows] = np.arange(rows.size, dtype=rows.dtype)
+        C = C[inverse]
+    return C
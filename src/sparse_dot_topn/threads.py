@@ -0,0 +1,190 @@
+# Copyright (c) 2023 ING Analytics Wholesale Banking
+"""Runtime configuration of the number of threads used by the kernels.
+
+The number of threads is resolved when a function is called rather than when the package is imported:
+
+- `n_threads=None` uses the global default, sequential unless changed with `set_num_threads` or the
+  `SDTN_NUM_THREADS` environment variable;
+- a negative `n_threads` uses all but one of the available cores, see `available_cpus`;
+- within a `threadpool_limits` block the number of threads is capped.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ["available_cpus", "get_num_threads", "set_num_threads", "threadpool_limits"]
+
+_ENV_NUM_THREADS = "SDTN_NUM_THREADS"
+
+# cgroup v2 and v1 CPU bandwidth limits
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+_CGROUP_V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+_default_n_threads: int | None = None
+_limit: ContextVar[int | None] = ContextVar("sdtn_threadpool_limit", default=None)
+
+
+def _read_cgroup_file(path: str) -> list[str] | None:
+    try:
+        with open(path) as fh:
+            return fh.read().split()
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _cgroup_cpu_limit() -> float | None:
+    """The CPU quota of the container in number of cores, `None` when there is no quota."""
+    cpu_max = _read_cgroup_file(_CGROUP_V2_CPU_MAX)
+    if cpu_max is not None and len(cpu_max) == 2:
+        quota, period = cpu_max
+        return None if quota == "max" else _cpu_limit(quota, period)
+    quota = _read_cgroup_file(_CGROUP_V1_QUOTA)
+    period = _read_cgroup_file(_CGROUP_V1_PERIOD)
+    if not quota or not period:
+        return None
+    return _cpu_limit(quota[0], period[0])
+
+
+def _cpu_limit(quota: str, period: str) -> float | None:
+    # a malformed or unlimited quota (-1 in cgroup v1) is treated as no quota
+    try:
+        quota, period = int(quota), int(period)
+    except ValueError:
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+@lru_cache(maxsize=None)
+def _physical_cores() -> int | None:
+    import psutil  # noqa: PLC0415
+
+    return psutil.cpu_count(logical=False)
+
+
+def available_cpus() -> int:
+    """The number of cores this process can use.
+
+    The minimum of the physical cores, the cores in the CPU affinity mask of the process and
+    the CPU quota of the container (cgroup v1 or v2), rounded up. Always at least one.
+
+    Returns:
+        n_cpus: the number of available cores
+
+    """
+    # the affinity mask is not available on macOS and Windows
+    n_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    physical = _physical_cores()
+    if physical:
+        n_cpus = min(n_cpus, physical)
+    quota = _cgroup_cpu_limit()
+    if quota is not None:
+        n_cpus = min(n_cpus, math.ceil(quota))
+    return max(n_cpus, 1)
+
+
+def _check_n_threads(n_threads: int | None):
+    if n_threads is not None and (not isinstance(n_threads, int) or n_threads == 0):
+        msg = f"`n_threads` must be a non-zero integer or None, got `{n_threads}`"
+        raise ValueError(msg)
+
+
+def set_num_threads(n_threads: int | None):
+    """Set the number of threads used when a function is called with `n_threads=None`.
+
+    Args:
+        n_threads: number of threads to use, `None` restores sequential processing,
+            a negative value will use all but one of the available cores.
+
+    Raises:
+        ValueError: when `n_threads` is zero or not an integer
+
+    """
+    global _default_n_threads  # noqa: PLW0603
+    _check_n_threads(n_threads)
+    _default_n_threads = n_threads
+
+
+def _env_num_threads() -> int | None:
+    value = os.environ.get(_ENV_NUM_THREADS)
+    if not value:
+        return None
+    n_threads = int(value)
+    _check_n_threads(n_threads)
+    return n_threads
+
+
+def _resolve_n_threads(n_threads: int | None) -> int:
+    """The number of threads to run with for the `n_threads` argument of a function."""
+    if not n_threads:
+        n_threads = _default_n_threads if _default_n_threads is not None else _env_num_threads()
+    if n_threads is None:
+        n_threads = 1
+    elif n_threads < 0:
+        n_threads = max(available_cpus() - 1, 1)
+    limit = _limit.get()
+    return n_threads if limit is None else min(n_threads, limit)
+
+
+def get_num_threads() -> int:
+    """The number of threads used when a function is called with `n_threads=None`.
+
+    Returns:
+        n_threads: the number of threads after applying the global default and `threadpool_limits`
+
+    """
+    return _resolve_n_threads(None)
+
+
+@contextmanager
+def threadpool_limits(n_threads: int | None, blas: bool = True) -> Iterator[int]:
+    """Limit the number of threads used by the kernels within a block.
+
+    Within the block the number of threads of every call, including the default, is capped at `n_threads`.
+    The limit of the kernels is local to the thread or asyncio task that enters the block, the limit of
+    the BLAS and OpenMP thread pools set with `blas=True` is global to the process while the block is active.
+
+    Args:
+        n_threads: the maximum number of threads, `None` removes an enclosing limit,
+            a negative value will use all but one of the available cores.
+        blas: also limit the BLAS and OpenMP thread pools of other libraries, e.g. NumPy as used by
+            `dense_matmul_topn`, to the same number of threads. Requires `threadpoolctl`, ignored otherwise.
+            Note that this limit also applies to other threads of the process.
+
+    Raises:
+        ValueError: when `n_threads` is zero or not an integer
+
+    Returns:
+        n_threads: the limit
+
+    """
+    _check_n_threads(n_threads)
+    limit = None
+    if n_threads is not None:
+        limit = n_threads if n_threads > 0 else max(available_cpus() - 1, 1)
+    token = _limit.set(limit)
+    try:
+        if blas and limit is not None:
+            try:
+                import threadpoolctl  # noqa: PLC0415
+            except ImportError:
+                yield limit
+            else:
+                with threadpoolctl.threadpool_limits(limits=limit):
+                    yield limit
+        else:
+            yield limit
+    finally:
+        _limit.reset(token)
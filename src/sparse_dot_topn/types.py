@@ -9,10 +9,24 @@ if TYPE_CHECKING:
     from numpy.types import DTypeLike, NDArray
     from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
 
-__all__ = ["assert_idx_dtype", "assert_supported_dtype", "ensure_compatible_dtype", "is_supported_dtype"]
+__all__ = [
+    "assert_idx_dtype",
+    "assert_supported_dtype",
+    "ensure_compatible_dtype",
+    "is_supported_dtype",
+    "mixed_precision_dtype",
+]
 
 _SUPPORTED_DTYPES = {np.dtype("int32"), np.dtype("int64"), np.dtype("float32"), np.dtype("float64")}
 
+# (A.dtype, B.dtype) -> dtype of the accumulator and C for the reduced-precision kernels
+_MIXED_PRECISION_DTYPES = {
+    (np.dtype("float64"), np.dtype("float32")): np.dtype("float64"),
+    (np.dtype("float32"), np.dtype("int8")): np.dtype("float32"),
+    (np.dtype("float64"), np.dtype("int8")): np.dtype("float64"),
+    (np.dtype("int8"), np.dtype("int8")): np.dtype("int32"),
+}
+
 
 def assert_idx_dtype(dtype: DTypeLike | None) -> DTypeLike:
     if dtype is None:
@@ -56,3 +70,12 @@ def ensure_compatible_dtype(
 
 def is_supported_dtype(dtype: DTypeLike) -> bool:
     return dtype in _SUPPORTED_DTYPES
+
+
+def mixed_precision_dtype(a_dtype: DTypeLike, b_dtype: DTypeLike) -> np.dtype | None:
+    """Return the accumulator dtype when `a_dtype` and `b_dtype` are a supported reduced-precision pair.
+
+    Returns:
+        dtype: the dtype of the accumulator and the result, None if the pair is not a supported mixed-precision pair
+    """
+    return _MIXED_PRECISION_DTYPES.get((np.dtype(a_dtype), np.dtype(b_dtype)))
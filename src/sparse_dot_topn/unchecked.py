@@ -1,15 +1,13 @@
 # Copyright (c) 2023 ING Analytics Wholesale Banking
 from __future__ import annotations
 
-import psutil
 from scipy.sparse import csr_matrix
 
-from sparse_dot_topn.lib import _sparse_dot_topn_core as _core
+from sparse_dot_topn._extension import _core
+from sparse_dot_topn.threads import _resolve_n_threads
 
 __all__ = ["sp_matmul_topn"]
 
-_N_CORES = psutil.cpu_count(logical=False) - 1
-
 
 def sp_matmul_topn(
     A: csr_matrix, B: csr_matrix, top_n: int, sort: bool, threshold: int | float, density: float
@@ -74,7 +72,7 @@ def sp_matmul_topn_mt(
     """
     nrows = A.shape[0]
     ncols = B.shape[1]
-    n_threads = n_threads if n_threads > 0 else _N_CORES
+    n_threads = _resolve_n_threads(n_threads if n_threads > 0 else -1)
     func = _core.sp_matmul_topn_mt if not sort else _core.sp_matmul_topn_sorted_mt
     return csr_matrix(
         func(top_n, nrows, ncols, threshold, n_threads, A.data, A.indptr, A.indices, B.data, B.indptr, B.indices),
@@ -0,0 +1,168 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#pragma once
+
+#include <algorithm>
+#include <vector>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/maxheap.hpp>
+
+namespace sdtn::core {
+
+/**
+ * \brief Merge a dense tile of C into the running top n of each row.
+ *
+ * \details The running top n of row i is stored in `values` and `indices`
+ * at offset `i * top_n` and contains `n_set[i]` elements. The stored
+ * elements are pushed into the heap before the elements of the tile such
+ * that the tiles of a row can be processed one after another. The arrays
+ * are updated in place and are sorted on column (insertion order) or value
+ * after every call.
+ *
+ * \tparam eT   element type of the matrices
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the column order, otherwise sort by value
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in the tile
+ * \param[in] ncols the number of columns in the tile
+ * \param[in] col_offset the column index of the first column of the tile
+ * \param[in] threshold minimum values required to store
+ * \param[in] X the tile in row-major order
+ * \param[in, out] values the running top n values
+ * \param[in, out] indices the column indices of the running top n values
+ * \param[in, out] n_set the number of values stored per row
+ */
+template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+inline void dense_topn_update(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const idxT col_offset,
+    const eT threshold,
+    const eT* __restrict X,
+    eT* __restrict values,
+    idxT* __restrict indices,
+    idxT* __restrict n_set
+) {
+    auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+
+    for (idxT i = 0; i < nrows; ++i) {
+        eT* local_vals = values + i * top_n;
+        idxT* local_idxs = indices + i * top_n;
+
+        eT min = max_heap.reset();
+        for (idxT ii = 0; ii < n_set[i]; ++ii) {
+            min = max_heap.push_pop(local_idxs[ii], local_vals[ii]);
+        }
+
+        const eT* row = X + static_cast<size_t>(i) * ncols;
+        for (idxT j = 0; j < ncols; ++j) {
+            // zeros are not stored, as in A * B
+            if (row[j] > min && row[j] != 0) {
+                min = max_heap.push_pop(col_offset + j, row[j]);
+            }
+        }
+
+        if constexpr (insertion_sort) {
+            max_heap.insertion_sort();
+        } else {
+            max_heap.value_sort();
+        }
+        int row_nset = max_heap.get_n_set();
+        for (int ii = 0; ii < row_nset; ++ii) {
+            local_idxs[ii] = max_heap.heap[ii].idx;
+            local_vals[ii] = max_heap.heap[ii].val;
+        }
+        n_set[i] = row_nset;
+    }
+}
+
+#if defined(SDTN_OMP_ENABLED)
+/**
+ * \brief Merge a dense tile of C into the running top n of each row.
+ *
+ * \details Parallelised version of `dense_topn_update`.
+ *
+ * \tparam eT   element type of the matrices
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the column order, otherwise sort by value
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in the tile
+ * \param[in] ncols the number of columns in the tile
+ * \param[in] col_offset the column index of the first column of the tile
+ * \param[in] threshold minimum values required to store
+ * \param[in] n_threads number of threads to use
+ * \param[in] X the tile in row-major order
+ * \param[in, out] values the running top n values
+ * \param[in, out] indices the column indices of the running top n values
+ * \param[in, out] n_set the number of values stored per row
+ */
+template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+inline void dense_topn_update_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const idxT col_offset,
+    const eT threshold,
+    const int n_threads,
+    const eT* __restrict X,
+    eT* __restrict values,
+    idxT* __restrict indices,
+    idxT* __restrict n_set
+) {
+#pragma omp parallel num_threads(n_threads) \
+    shared(top_n, nrows, ncols, col_offset, threshold, X, values, indices, n_set)
+    {
+        auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+
+#pragma omp for schedule(static)
+        for (idxT i = 0; i < nrows; ++i) {
+            eT* local_vals = values + i * top_n;
+            idxT* local_idxs = indices + i * top_n;
+
+            eT min = max_heap.reset();
+            for (idxT ii = 0; ii < n_set[i]; ++ii) {
+                min = max_heap.push_pop(local_idxs[ii], local_vals[ii]);
+            }
+
+            const eT* row = X + static_cast<size_t>(i) * ncols;
+            for (idxT j = 0; j < ncols; ++j) {
+                // zeros are not stored, as in A * B
+                if (row[j] > min && row[j] != 0) {
+                    min = max_heap.push_pop(col_offset + j, row[j]);
+                }
+            }
+
+            if constexpr (insertion_sort) {
+                max_heap.insertion_sort();
+            } else {
+                max_heap.value_sort();
+            }
+            int row_nset = max_heap.get_n_set();
+            for (int ii = 0; ii < row_nset; ++ii) {
+                local_idxs[ii] = max_heap.heap[ii].idx;
+                local_vals[ii] = max_heap.heap[ii].val;
+            }
+            n_set[i] = row_nset;
+        }
+    }  // #pragma omp parallel
+}  // dense_topn_update_mt
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::core
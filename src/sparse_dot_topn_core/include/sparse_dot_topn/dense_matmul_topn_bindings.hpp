@@ -0,0 +1,107 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#pragma once
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/optional.h>
+
+#include <limits>
+#include <optional>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/dense_matmul_topn.hpp>
+
+namespace sdtn {
+
+namespace nb = nanobind;
+
+namespace api {
+
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    core::iffInt<idxT> = true>
+inline void dense_topn_update(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const idxT col_offset,
+    std::optional<eT> threshold,
+    const nb_vec<eT>& X,
+    nb_vec<eT>& values,
+    nb_vec<idxT>& indices,
+    nb_vec<idxT>& n_set
+) {
+    eT local_threshold = threshold.value_or(std::numeric_limits<eT>::min());
+    core::dense_topn_update<eT, idxT, insertion_sort>(
+        top_n,
+        nrows,
+        ncols,
+        col_offset,
+        local_threshold,
+        X.data(),
+        values.data(),
+        indices.data(),
+        n_set.data()
+    );
+}
+
+#ifdef SDTN_OMP_ENABLED
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    core::iffInt<idxT> = true>
+inline void dense_topn_update_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const idxT col_offset,
+    std::optional<eT> threshold,
+    const int n_threads,
+    const nb_vec<eT>& X,
+    nb_vec<eT>& values,
+    nb_vec<idxT>& indices,
+    nb_vec<idxT>& n_set
+) {
+    eT local_threshold = threshold.value_or(std::numeric_limits<eT>::min());
+    core::dense_topn_update_mt<eT, idxT, insertion_sort>(
+        top_n,
+        nrows,
+        ncols,
+        col_offset,
+        local_threshold,
+        n_threads,
+        X.data(),
+        values.data(),
+        indices.data(),
+        n_set.data()
+    );
+}
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace api
+
+namespace bindings {
+
+void bind_dense_topn_update(nb::module_& m);
+#ifdef SDTN_OMP_ENABLED
+void bind_dense_topn_update_mt(nb::module_& m);
+#endif  // SDTN_OMP_ENABLED
+}  // namespace bindings
+}  // namespace sdtn
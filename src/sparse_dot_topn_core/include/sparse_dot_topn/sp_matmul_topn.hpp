@@ -27,6 +27,7 @@
 
 #include <sparse_dot_topn/common.hpp>
 #include <sparse_dot_topn/maxheap.hpp>
+#include <sparse_dot_topn/stats.hpp>
 
 namespace sdtn::core {
 
@@ -77,8 +78,11 @@ inline idxT sp_matmul_topn_size(
  *  License: BSD 3 https://github.com/scipy/scipy/blob/main/LICENSE.txt
  *  All modifications copyright INGA WB.
  *
- * \tparam eT   element type of the matrices
+ * \tparam eT   element type of the accumulator and C
  * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam aT   element type of A, defaults to `eT`
+ * \tparam bT   element type of B, defaults to `aT`
+ * \tparam collect_stats fill `stats`, defaults to false
  * \param[in] top_n the top n values to store
  * \param[in] nrows the number of rows in A
  * \param[in] ncols the number of columns in B
@@ -93,22 +97,31 @@ inline idxT sp_matmul_topn_size(
  * \param[out] C_data the nonzero elements of C
  * \param[out] C_indptr array containing the row indices for `C_data`
  * \param[out] C_indices array containing the column indices
+ * \param[out] stats counters and timings, only used when `collect_stats`
  */
-template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    typename aT = eT,
+    typename bT = aT,
+    bool collect_stats = false,
+    iffInt<idxT> = true>
 inline void sp_matmul_topn(
     const idxT top_n,
     const idxT nrows,
     const idxT ncols,
     const eT threshold,
-    const eT* __restrict A_data,
+    const aT* __restrict A_data,
     const idxT* __restrict A_indptr,
     const idxT* __restrict A_indices,
-    const eT* __restrict B_data,
+    const bT* __restrict B_data,
     const idxT* __restrict B_indptr,
     const idxT* __restrict B_indices,
     std::vector<eT>& C_data,
     std::vector<idxT>& C_indptr,
-    std::vector<idxT>& C_indices
+    std::vector<idxT>& C_indices,
+    [[maybe_unused]] KernelStats* stats = nullptr
 ) {
     std::vector<idxT> next(ncols, -1);
     std::vector<eT> sums(ncols, 0);
@@ -118,10 +131,19 @@ inline void sp_matmul_topn(
 
     C_indptr[0] = 0;
 
+    [[maybe_unused]] stats_clock::time_point t_start;
+    if constexpr (collect_stats) {
+        stats->bytes_allocated += ncols * (sizeof(idxT) + sizeof(eT))
+                                  + top_n * sizeof(Score<eT, idxT>);
+    }
+
     for (idxT i = 0; i < nrows; i++) {
         idxT head = -2;
         idxT length = 0;
         eT min = max_heap.reset();
+        if constexpr (collect_stats) {
+            t_start = stats_clock::now();
+        }
 
         // A_cidx: column index for A
         idxT A_cidx_start = A_indptr[i];
@@ -129,16 +151,19 @@ inline void sp_matmul_topn(
         for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
             idxT j = A_indices[A_cidx];
             // value of A in (i,j)
-            eT v = A_data[A_cidx];
+            eT v = static_cast<eT>(A_data[A_cidx]);
 
             idxT B_ridx_start = B_indptr[j];
             idxT B_ridx_end = B_indptr[j + 1];
+            if constexpr (collect_stats) {
+                stats->flops += B_ridx_end - B_ridx_start;
+            }
             for (idxT B_ridx = B_ridx_start; B_ridx < B_ridx_end; B_ridx++) {
                 idxT k = B_indices[B_ridx];  // kth column of B in row j
 
                 // multiply with value of B in (j,k) and accumulate to the
                 // result for kth column of row i
-                sums[k] += v * B_data[B_ridx];
+                sums[k] += v * static_cast<eT>(B_data[B_ridx]);
 
                 if (next[k] == -1) {
                     // keep a linked list, every element points to the next
@@ -150,10 +175,19 @@ inline void sp_matmul_topn(
             }
         }
 
+        if constexpr (collect_stats) {
+            stats->candidates += length;
+            stats->accumulate += seconds_since(t_start);
+            t_start = stats_clock::now();
+        }
+
         for (idxT jj = 0; jj < length; jj++) {
             // length = number of columns set (may include 0s)
             if (sums[head] > min) {
                 min = max_heap.push_pop(head, sums[head]);
+                if constexpr (collect_stats) {
+                    stats->heap_insertions++;
+                }
             }
 
             idxT temp = head;
@@ -179,6 +213,10 @@ inline void sp_matmul_topn(
         }
         nnz += n_set;
         C_indptr[i + 1] = nnz;
+        if constexpr (collect_stats) {
+            stats->rows_full += (n_set == top_n);
+            stats->select += seconds_since(t_start);
+        }
     }
 }
 
@@ -259,8 +297,11 @@ inline idxT sp_matmul_topn_size_mt(
  *  License: BSD 3 https://github.com/scipy/scipy/blob/main/LICENSE.txt
  *  All modifications copyright INGA WB.
  *
- * \tparam eT   element type of the matrices
+ * \tparam eT   element type of the accumulator and C
  * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam aT   element type of A, defaults to `eT`
+ * \tparam bT   element type of B, defaults to `aT`
+ * \tparam collect_stats fill `stats`, defaults to false
  * \param[in] top_n the top n values to store
  * \param[in] nrows the number of rows in A
  * \param[in] ncols the number of columns in B
@@ -275,24 +316,37 @@ inline idxT sp_matmul_topn_size_mt(
  * \param[out] C_data the nonzero elements of C
  * \param[out] C_indptr array containing the row indices for `C_data`
  * \param[out] C_indices array containing the column indices
+ * \param[out] stats counters and timings, only used when `collect_stats`
  */
-template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    typename aT = eT,
+    typename bT = aT,
+    bool collect_stats = false,
+    iffInt<idxT> = true>
 inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
     const idxT top_n,
     const idxT nrows,
     const idxT ncols,
     const eT threshold,
     const int n_threads,
-    const eT* __restrict A_data,
+    const aT* __restrict A_data,
     const idxT* __restrict A_indptr,
     const idxT* __restrict A_indices,
-    const eT* __restrict B_data,
+    const bT* __restrict B_data,
     const idxT* __restrict B_indptr,
-    const idxT* __restrict B_indices
+    const idxT* __restrict B_indices,
+    [[maybe_unused]] KernelStats* stats = nullptr
 ) {
     auto values = std::unique_ptr<eT[]>(new eT[nrows * top_n]);
     auto indices = std::unique_ptr<idxT[]>(new idxT[nrows * top_n]);
     auto row_nset = std::unique_ptr<idxT[]>(new idxT[nrows]);
+    if constexpr (collect_stats) {
+        stats->bytes_allocated += nrows * top_n * (sizeof(eT) + sizeof(idxT))
+                                  + nrows * sizeof(idxT);
+    }
 #pragma omp parallel num_threads(n_threads) \
     shared(top_n,                           \
                nrows,                       \
@@ -306,12 +360,19 @@ inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
                B_indices,                   \
                values,                      \
                indices,                     \
-               row_nset)
+               row_nset,                    \
+               stats)
     {
         std::vector<idxT> next(ncols, -1);
         std::vector<eT> sums(ncols, 0);
 
         auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+        [[maybe_unused]] KernelStats local_stats;
+        [[maybe_unused]] stats_clock::time_point t_start;
+        if constexpr (collect_stats) {
+            local_stats.bytes_allocated += ncols * (sizeof(idxT) + sizeof(eT))
+                                           + top_n * sizeof(Score<eT, idxT>);
+        }
 
 #pragma omp for
         for (idxT i = 0; i < nrows; i++) {
@@ -323,6 +384,9 @@ inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
             idxT* local_idxs = indices.get() + offset;
 
             eT min = max_heap.reset();
+            if constexpr (collect_stats) {
+                t_start = stats_clock::now();
+            }
 
             // A_cidx: column index for A
             idxT A_cidx_start = A_indptr[i];
@@ -330,17 +394,20 @@ inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
             for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
                 idxT j = A_indices[A_cidx];
                 // value of A in (i,j)
-                eT v = A_data[A_cidx];
+                eT v = static_cast<eT>(A_data[A_cidx]);
 
                 idxT B_ridx_start = B_indptr[j];
                 idxT B_ridx_end = B_indptr[j + 1];
+                if constexpr (collect_stats) {
+                    local_stats.flops += B_ridx_end - B_ridx_start;
+                }
                 for (idxT B_ridx = B_ridx_start; B_ridx < B_ridx_end;
                      B_ridx++) {
                     idxT k = B_indices[B_ridx];  // kth column of B in row j
 
                     // multiply with value of B in (j,k) and accumulate to the
                     // result for kth column of row i
-                    sums[k] += v * B_data[B_ridx];
+                    sums[k] += v * static_cast<eT>(B_data[B_ridx]);
 
                     if (next[k] == -1) {
                         // keep a linked list, every element points to the next
@@ -352,10 +419,19 @@ inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
                 }
             }
 
+            if constexpr (collect_stats) {
+                local_stats.candidates += length;
+                local_stats.accumulate += seconds_since(t_start);
+                t_start = stats_clock::now();
+            }
+
             for (idxT jj = 0; jj < length; jj++) {
                 // length = number of columns set (may include 0s)
                 if (sums[head] > min) {
                     min = max_heap.push_pop(head, sums[head]);
+                    if constexpr (collect_stats) {
+                        local_stats.heap_insertions++;
+                    }
                 }
 
                 idxT temp = head;
@@ -380,9 +456,27 @@ inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
                 local_vals[ii] = max_heap.heap[ii].val;
             }
             row_nset[i] = n_set;
+            if constexpr (collect_stats) {
+                local_stats.rows_full += (n_set == top_n);
+                local_stats.select += seconds_since(t_start);
+            }
+        }
+        if constexpr (collect_stats) {
+#pragma omp critical
+            {
+                stats->merge(local_stats);
+                stats->thread_busy.push_back(
+                    local_stats.accumulate + local_stats.select
+                );
+            }
         }
     }  // #pragma omp parallel
 
+    [[maybe_unused]] stats_clock::time_point t_compact;
+    if constexpr (collect_stats) {
+        t_compact = stats_clock::now();
+    }
+
     // check how many non-zero elements are in C
     size_t total_nonzero
         = std::accumulate(row_nset.get(), row_nset.get() + nrows, 0);
@@ -409,6 +503,11 @@ inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_mt(
         idx_ptr += top_n;
         vals_ptr += top_n;
     }
+    if constexpr (collect_stats) {
+        stats->compact += seconds_since(t_compact);
+        stats->bytes_allocated += total_nonzero * (sizeof(eT) + sizeof(idxT))
+                                  + (nrows + 1) * sizeof(idxT);
+    }
     return std::make_tuple(total_nonzero, C_data, C_indices, C_indptr);
 }  // sp_matmul_topn_mt
 #endif  // SDTN_OMP_ENABLED
@@ -0,0 +1,317 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#pragma once
+
+#include <algorithm>
+#include <cstring>
+#include <memory>
+#include <numeric>
+#include <tuple>
+#include <vector>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/maxheap.hpp>
+
+namespace sdtn::core {
+
+/**
+ * \brief Score computed from the overlap of two binary rows.
+ *
+ * \details With `c` the number of shared columns and `n_a`, `n_b` the number
+ * of non-zero elements of the rows:
+ *  - count: c
+ *  - jaccard: c / (n_a + n_b - c)
+ *  - dice: 2c / (n_a + n_b)
+ *  - overlap: c / min(n_a, n_b)
+ */
+enum class Similarity { count, jaccard, dice, overlap };
+
+template <typename eT, Similarity similarity, typename idxT>
+inline eT binary_score(const idxT c, const idxT a_card, const idxT b_card) {
+    if constexpr (similarity == Similarity::count) {
+        return static_cast<eT>(c);
+    } else if constexpr (similarity == Similarity::jaccard) {
+        return static_cast<eT>(c) / static_cast<eT>(a_card + b_card - c);
+    } else if constexpr (similarity == Similarity::dice) {
+        return static_cast<eT>(2 * c) / static_cast<eT>(a_card + b_card);
+    } else {
+        return static_cast<eT>(c) / static_cast<eT>(std::min(a_card, b_card));
+    }
+}
+
+/**
+ * \brief Compute the top n overlap scores of binary matrices A and B.
+ *
+ * \details Variant of `sp_matmul_topn` for matrices that only contain ones.
+ * The data arrays are not read, the number of shared columns is accumulated
+ * in integers and converted to a score before the top-n selection.
+ * The number of non-zero elements of a row of A is taken from `A_indptr`,
+ * the number of non-zero elements of each column of B must be provided.
+ *
+ * \tparam eT   element type of C
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the column order, otherwise sort by value
+ * \tparam similarity the score to compute from the overlap
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in A
+ * \param[in] ncols the number of columns in B
+ * \param[in] threshold minimum score required to store
+ * \param[in] A_indptr array containing the row indices for A
+ * \param[in] A_indices array containing the column indices of A
+ * \param[in] B_indptr array containing the row indices for B
+ * \param[in] B_indices array containing the column indices of B
+ * \param[in] B_card the number of non-zero elements in each column of B
+ * \param[out] C_data the nonzero elements of C
+ * \param[out] C_indptr array containing the row indices for `C_data`
+ * \param[out] C_indices array containing the column indices
+ */
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    Similarity similarity,
+    iffInt<idxT> = true>
+inline void sp_matmul_topn_binary(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const eT threshold,
+    const idxT* __restrict A_indptr,
+    const idxT* __restrict A_indices,
+    const idxT* __restrict B_indptr,
+    const idxT* __restrict B_indices,
+    const idxT* __restrict B_card,
+    std::vector<eT>& C_data,
+    std::vector<idxT>& C_indptr,
+    std::vector<idxT>& C_indices
+) {
+    std::vector<idxT> next(ncols, -1);
+    std::vector<idxT> counts(ncols, 0);
+
+    auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+    idxT nnz = 0;
+
+    C_indptr[0] = 0;
+
+    for (idxT i = 0; i < nrows; i++) {
+        idxT head = -2;
+        idxT length = 0;
+        eT min = max_heap.reset();
+
+        idxT A_cidx_start = A_indptr[i];
+        idxT A_cidx_end = A_indptr[i + 1];
+        idxT a_card = A_cidx_end - A_cidx_start;
+        for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+            idxT j = A_indices[A_cidx];
+            idxT B_ridx_start = B_indptr[j];
+            idxT B_ridx_end = B_indptr[j + 1];
+            for (idxT B_ridx = B_ridx_start; B_ridx < B_ridx_end; B_ridx++) {
+                idxT k = B_indices[B_ridx];  // kth column of B in row j
+                counts[k]++;
+
+                if (next[k] == -1) {
+                    next[k] = head;
+                    head = k;
+                    length++;
+                }
+            }
+        }
+
+        for (idxT jj = 0; jj < length; jj++) {
+            eT score = binary_score<eT, similarity>(
+                counts[head], a_card, B_card[head]
+            );
+            if (score > min) {
+                min = max_heap.push_pop(head, score);
+            }
+
+            idxT temp = head;
+            head = next[head];
+
+            // clear arrays
+            next[temp] = -1;
+            counts[temp] = 0;
+        }
+
+        if constexpr (insertion_sort) {
+            max_heap.insertion_sort();
+        } else {
+            max_heap.value_sort();
+        }
+        int n_set = max_heap.get_n_set();
+        for (int ii = 0; ii < n_set; ++ii) {
+            C_indices.push_back(max_heap.heap[ii].idx);
+            C_data.push_back(max_heap.heap[ii].val);
+        }
+        nnz += n_set;
+        C_indptr[i + 1] = nnz;
+    }
+}
+
+#if defined(SDTN_OMP_ENABLED)
+/**
+ * \brief Compute the top n overlap scores of binary matrices A and B.
+ *
+ * \details Parallelised version of `sp_matmul_topn_binary`.
+ *
+ * \tparam eT   element type of C
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the column order, otherwise sort by value
+ * \tparam similarity the score to compute from the overlap
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in A
+ * \param[in] ncols the number of columns in B
+ * \param[in] threshold minimum score required to store
+ * \param[in] n_threads number of threads to use
+ * \param[in] A_indptr array containing the row indices for A
+ * \param[in] A_indices array containing the column indices of A
+ * \param[in] B_indptr array containing the row indices for B
+ * \param[in] B_indices array containing the column indices of B
+ * \param[in] B_card the number of non-zero elements in each column of B
+ */
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    Similarity similarity,
+    iffInt<idxT> = true>
+inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_binary_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const eT threshold,
+    const int n_threads,
+    const idxT* __restrict A_indptr,
+    const idxT* __restrict A_indices,
+    const idxT* __restrict B_indptr,
+    const idxT* __restrict B_indices,
+    const idxT* __restrict B_card
+) {
+    auto values = std::unique_ptr<eT[]>(new eT[nrows * top_n]);
+    auto indices = std::unique_ptr<idxT[]>(new idxT[nrows * top_n]);
+    auto row_nset = std::unique_ptr<idxT[]>(new idxT[nrows]);
+#pragma omp parallel num_threads(n_threads) \
+    shared(top_n,                           \
+               nrows,                       \
+               ncols,                       \
+               threshold,                   \
+               A_indptr,                    \
+               A_indices,                   \
+               B_indptr,                    \
+               B_indices,                   \
+               B_card,                      \
+               values,                      \
+               indices,                     \
+               row_nset)
+    {
+        std::vector<idxT> next(ncols, -1);
+        std::vector<idxT> counts(ncols, 0);
+
+        auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+
+#pragma omp for
+        for (idxT i = 0; i < nrows; i++) {
+            idxT head = -2;
+            idxT length = 0;
+
+            idxT offset = i * top_n;
+            eT* local_vals = values.get() + offset;
+            idxT* local_idxs = indices.get() + offset;
+
+            eT min = max_heap.reset();
+
+            idxT A_cidx_start = A_indptr[i];
+            idxT A_cidx_end = A_indptr[i + 1];
+            idxT a_card = A_cidx_end - A_cidx_start;
+            for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+                idxT j = A_indices[A_cidx];
+                idxT B_ridx_start = B_indptr[j];
+                idxT B_ridx_end = B_indptr[j + 1];
+                for (idxT B_ridx = B_ridx_start; B_ridx < B_ridx_end;
+                     B_ridx++) {
+                    idxT k = B_indices[B_ridx];  // kth column of B in row j
+                    counts[k]++;
+
+                    if (next[k] == -1) {
+                        next[k] = head;
+                        head = k;
+                        length++;
+                    }
+                }
+            }
+
+            for (idxT jj = 0; jj < length; jj++) {
+                eT score = binary_score<eT, similarity>(
+                    counts[head], a_card, B_card[head]
+                );
+                if (score > min) {
+                    min = max_heap.push_pop(head, score);
+                }
+
+                idxT temp = head;
+                head = next[head];
+
+                // clear arrays
+                next[temp] = -1;
+                counts[temp] = 0;
+            }
+
+            if constexpr (insertion_sort) {
+                max_heap.insertion_sort();
+            } else {
+                max_heap.value_sort();
+            }
+            int n_set = max_heap.get_n_set();
+            for (int ii = 0; ii < n_set; ++ii) {
+                local_idxs[ii] = max_heap.heap[ii].idx;
+                local_vals[ii] = max_heap.heap[ii].val;
+            }
+            row_nset[i] = n_set;
+        }
+    }  // #pragma omp parallel
+
+    size_t total_nonzero = std::accumulate(
+        row_nset.get(), row_nset.get() + nrows, static_cast<size_t>(0)
+    );
+    idxT* C_indptr = new idxT[nrows + 1];
+    C_indptr[0] = 0;
+    idxT* C_indices = new idxT[total_nonzero];
+    eT* C_data = new eT[total_nonzero];
+    idxT* C_idx_ptr = C_indices;
+    eT* C_data_ptr = C_data;
+
+    idxT nnz = 0;
+    idxT* idx_ptr = indices.get();
+    eT* vals_ptr = values.get();
+
+    for (idxT i = 0; i < nrows; ++i) {
+        idxT n_set = row_nset[i];
+        std::memcpy(C_idx_ptr, idx_ptr, n_set * sizeof(idxT));
+        std::memcpy(C_data_ptr, vals_ptr, n_set * sizeof(eT));
+        nnz += n_set;
+        C_indptr[i + 1] = nnz;
+        C_idx_ptr += n_set;
+        C_data_ptr += n_set;
+        idx_ptr += top_n;
+        vals_ptr += top_n;
+    }
+    return std::make_tuple(total_nonzero, C_data, C_indices, C_indptr);
+}  // sp_matmul_topn_binary_mt
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::core
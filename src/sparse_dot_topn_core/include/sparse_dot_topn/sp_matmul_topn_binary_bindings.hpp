@@ -0,0 +1,345 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#pragma once
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/optional.h>
+#include <nanobind/stl/string.h>
+
+#include <cmath>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/sp_matmul_topn.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_binary.hpp>
+
+namespace sdtn {
+
+namespace nb = nanobind;
+
+namespace api {
+
+inline core::Similarity to_similarity(const std::string& similarity) {
+    if (similarity == "count") {
+        return core::Similarity::count;
+    } else if (similarity == "jaccard") {
+        return core::Similarity::jaccard;
+    } else if (similarity == "dice") {
+        return core::Similarity::dice;
+    } else if (similarity == "overlap") {
+        return core::Similarity::overlap;
+    }
+    throw std::invalid_argument(
+        "`similarity` must be one of 'count', 'jaccard', 'dice' or 'overlap'"
+    );
+}
+
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    core::Similarity similarity>
+inline nb::tuple sp_matmul_topn_binary_impl(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    std::optional<double> threshold,
+    const double density,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices,
+    const nb_vec<idxT>& B_card
+) {
+    idxT result_size;
+    eT local_threshold;
+    if (threshold.has_value()) {
+        result_size = static_cast<idxT>(ceil(density * top_n * nrows));
+        local_threshold = static_cast<eT>(threshold.value());
+    } else {
+        result_size = core::sp_matmul_topn_size(
+            top_n,
+            nrows,
+            ncols,
+            A_indptr.data(),
+            A_indices.data(),
+            B_indptr.data(),
+            B_indices.data()
+        );
+        // every column that shares a non-zero has a positive score
+        local_threshold = 0;
+    }
+    std::vector<eT> C_data;
+    C_data.reserve(result_size);
+    std::vector<idxT> C_indices;
+    C_indices.reserve(result_size);
+    std::vector<idxT> C_indptr(nrows + 1);
+    core::sp_matmul_topn_binary<eT, idxT, insertion_sort, similarity>(
+        top_n,
+        nrows,
+        ncols,
+        local_threshold,
+        A_indptr.data(),
+        A_indices.data(),
+        B_indptr.data(),
+        B_indices.data(),
+        B_card.data(),
+        C_data,
+        C_indptr,
+        C_indices
+    );
+    return nb::make_tuple(
+        to_nbvec<eT>(std::move(C_data)),
+        to_nbvec<idxT>(std::move(C_indices)),
+        to_nbvec<idxT>(std::move(C_indptr))
+    );
+}
+
+/**
+ * \brief Compute the top n overlap scores of the binary matrices A and B.
+ *
+ * \details The `count` similarity returns C with the same dtype as the
+ * indices, the other similarities return double precision scores.
+ */
+template <typename idxT, bool insertion_sort, core::iffInt<idxT> = true>
+inline nb::tuple sp_matmul_topn_binary(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    std::optional<double> threshold,
+    const double density,
+    const std::string& similarity,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices,
+    const nb_vec<idxT>& B_card
+) {
+    using core::Similarity;
+    switch (to_similarity(similarity)) {
+        case Similarity::count:
+            return sp_matmul_topn_binary_impl<
+                idxT,
+                idxT,
+                insertion_sort,
+                Similarity::count>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                density,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+        case Similarity::jaccard:
+            return sp_matmul_topn_binary_impl<
+                double,
+                idxT,
+                insertion_sort,
+                Similarity::jaccard>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                density,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+        case Similarity::dice:
+            return sp_matmul_topn_binary_impl<
+                double,
+                idxT,
+                insertion_sort,
+                Similarity::dice>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                density,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+        default:
+            return sp_matmul_topn_binary_impl<
+                double,
+                idxT,
+                insertion_sort,
+                Similarity::overlap>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                density,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+    }
+}
+
+#ifdef SDTN_OMP_ENABLED
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    core::Similarity similarity>
+inline nb::tuple sp_matmul_topn_binary_mt_impl(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    std::optional<double> threshold,
+    const int n_threads,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices,
+    const nb_vec<idxT>& B_card
+) {
+    eT local_threshold = static_cast<eT>(threshold.value_or(0));
+    auto [total_nonzero, C_data, C_indices, C_indptr]
+        = core::sp_matmul_topn_binary_mt<eT, idxT, insertion_sort, similarity>(
+            top_n,
+            nrows,
+            ncols,
+            local_threshold,
+            n_threads,
+            A_indptr.data(),
+            A_indices.data(),
+            B_indptr.data(),
+            B_indices.data(),
+            B_card.data()
+        );
+    return nb::make_tuple(
+        to_nbvec<eT>(C_data, total_nonzero),
+        to_nbvec<idxT>(C_indices, total_nonzero),
+        to_nbvec<idxT>(C_indptr, nrows + 1)
+    );
+}
+
+template <typename idxT, bool insertion_sort, core::iffInt<idxT> = true>
+inline nb::tuple sp_matmul_topn_binary_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    std::optional<double> threshold,
+    const int n_threads,
+    const std::string& similarity,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices,
+    const nb_vec<idxT>& B_card
+) {
+    using core::Similarity;
+    switch (to_similarity(similarity)) {
+        case Similarity::count:
+            return sp_matmul_topn_binary_mt_impl<
+                idxT,
+                idxT,
+                insertion_sort,
+                Similarity::count>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                n_threads,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+        case Similarity::jaccard:
+            return sp_matmul_topn_binary_mt_impl<
+                double,
+                idxT,
+                insertion_sort,
+                Similarity::jaccard>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                n_threads,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+        case Similarity::dice:
+            return sp_matmul_topn_binary_mt_impl<
+                double,
+                idxT,
+                insertion_sort,
+                Similarity::dice>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                n_threads,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+        default:
+            return sp_matmul_topn_binary_mt_impl<
+                double,
+                idxT,
+                insertion_sort,
+                Similarity::overlap>(
+                top_n,
+                nrows,
+                ncols,
+                threshold,
+                n_threads,
+                A_indptr,
+                A_indices,
+                B_indptr,
+                B_indices,
+                B_card
+            );
+    }
+}
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace api
+
+namespace bindings {
+
+void bind_sp_matmul_topn_binary(nb::module_& m);
+#ifdef SDTN_OMP_ENABLED
+void bind_sp_matmul_topn_binary_mt(nb::module_& m);
+#endif  // SDTN_OMP_ENABLED
+}  // namespace bindings
+}  // namespace sdtn
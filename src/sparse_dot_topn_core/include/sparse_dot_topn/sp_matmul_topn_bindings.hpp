@@ -26,6 +26,7 @@
 
 #include <sparse_dot_topn/common.hpp>
 #include <sparse_dot_topn/sp_matmul_topn.hpp>
+#include <sparse_dot_topn/stats.hpp>
 
 namespace sdtn {
 
@@ -37,6 +38,8 @@ template <
     typename eT,
     typename idxT,
     bool insertion_sort,
+    typename aT = eT,
+    typename bT = aT,
     core::iffInt<idxT> = true>
 inline nb::tuple sp_matmul_topn(
     const idxT top_n,
@@ -44,10 +47,10 @@ inline nb::tuple sp_matmul_topn(
     const idxT ncols,
     std::optional<eT> threshold,
     const double density,
-    const nb_vec<eT>& A_data,
+    const nb_vec<aT>& A_data,
     const nb_vec<idxT>& A_indptr,
     const nb_vec<idxT>& A_indices,
-    const nb_vec<eT>& B_data,
+    const nb_vec<bT>& B_data,
     const nb_vec<idxT>& B_indptr,
     const nb_vec<idxT>& B_indices
 ) {
@@ -73,7 +76,7 @@ inline nb::tuple sp_matmul_topn(
     std::vector<idxT> C_indices;
     C_indices.reserve(result_size);
     std::vector<idxT> C_indptr(nrows + 1);
-    core::sp_matmul_topn<eT, idxT, insertion_sort>(
+    core::sp_matmul_topn<eT, idxT, insertion_sort, aT, bT>(
         top_n,
         nrows,
         ncols,
@@ -95,11 +98,106 @@ inline nb::tuple sp_matmul_topn(
     );
 }
 
+inline nb::dict to_dict(const core::KernelStats& stats) {
+    nb::list thread_busy;
+    for (const double busy : stats.thread_busy) {
+        thread_busy.append(busy);
+    }
+    nb::dict result;
+    result["flops"] = stats.flops;
+    result["candidates"] = stats.candidates;
+    result["heap_insertions"] = stats.heap_insertions;
+    result["rows_full"] = stats.rows_full;
+    result["bytes_allocated"] = stats.bytes_allocated;
+    result["size_pass"] = stats.size_pass;
+    result["accumulate"] = stats.accumulate;
+    result["select"] = stats.select;
+    result["compact"] = stats.compact;
+    result["thread_busy"] = thread_busy;
+    return result;
+}
+
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    typename aT = eT,
+    typename bT = aT,
+    core::iffInt<idxT> = true>
+inline nb::tuple sp_matmul_topn_stats(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    std::optional<eT> threshold,
+    const double density,
+    const nb_vec<aT>& A_data,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<bT>& B_data,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices
+) {
+    core::KernelStats stats;
+    idxT result_size;
+    eT local_threshold;
+    if (threshold.has_value()) {
+        result_size = static_cast<idxT>(ceil(density * top_n * nrows));
+        local_threshold = threshold.value();
+    } else {
+        auto t_start = core::stats_clock::now();
+        result_size = core::sp_matmul_topn_size(
+            top_n,
+            nrows,
+            ncols,
+            A_indptr.data(),
+            A_indices.data(),
+            B_indptr.data(),
+            B_indices.data()
+        );
+        stats.size_pass = core::seconds_since(t_start);
+        local_threshold = std::numeric_limits<eT>::min();
+    }
+    std::vector<eT> C_data;
+    C_data.reserve(result_size);
+    std::vector<idxT> C_indices;
+    C_indices.reserve(result_size);
+    std::vector<idxT> C_indptr(nrows + 1);
+    core::sp_matmul_topn<eT, idxT, insertion_sort, aT, bT, true>(
+        top_n,
+        nrows,
+        ncols,
+        local_threshold,
+        A_data.data(),
+        A_indptr.data(),
+        A_indices.data(),
+        B_data.data(),
+        B_indptr.data(),
+        B_indices.data(),
+        C_data,
+        C_indptr,
+        C_indices,
+        &stats
+    );
+    // the vectors grow beyond the reserved size when `density` is too low
+    stats.bytes_allocated += C_data.capacity() * sizeof(eT)
+                             + C_indices.capacity() * sizeof(idxT)
+                             + C_indptr.capacity() * sizeof(idxT);
+    stats.thread_busy.push_back(stats.accumulate + stats.select);
+    return nb::make_tuple(
+        to_nbvec<eT>(std::move(C_data)),
+        to_nbvec<idxT>(std::move(C_indices)),
+        to_nbvec<idxT>(std::move(C_indptr)),
+        to_dict(stats)
+    );
+}
+
 #ifdef SDTN_OMP_ENABLED
 template <
     typename eT,
     typename idxT,
     bool insertion_sort,
+    typename aT = eT,
+    typename bT = aT,
     core::iffInt<idxT> = true>
 inline nb::tuple sp_matmul_topn_mt(
     const idxT top_n,
@@ -107,16 +205,16 @@ inline nb::tuple sp_matmul_topn_mt(
     const idxT ncols,
     std::optional<eT> threshold,
     const int n_threads,
-    const nb_vec<eT>& A_data,
+    const nb_vec<aT>& A_data,
     const nb_vec<idxT>& A_indptr,
     const nb_vec<idxT>& A_indices,
-    const nb_vec<eT>& B_data,
+    const nb_vec<bT>& B_data,
     const nb_vec<idxT>& B_indptr,
     const nb_vec<idxT>& B_indices
 ) {
     eT local_threshold = threshold.value_or(std::numeric_limits<eT>::min());
     auto [total_nonzero, C_data, C_indices, C_indptr]
-        = core::sp_matmul_topn_mt<eT, idxT, insertion_sort>(
+        = core::sp_matmul_topn_mt<eT, idxT, insertion_sort, aT, bT>(
             top_n,
             nrows,
             ncols,
@@ -135,6 +233,50 @@ inline nb::tuple sp_matmul_topn_mt(
         to_nbvec<idxT>(C_indptr, nrows + 1)
     );
 }
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    typename aT = eT,
+    typename bT = aT,
+    core::iffInt<idxT> = true>
+inline nb::tuple sp_matmul_topn_stats_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    std::optional<eT> threshold,
+    const int n_threads,
+    const nb_vec<aT>& A_data,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<bT>& B_data,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices
+) {
+    core::KernelStats stats;
+    eT local_threshold = threshold.value_or(std::numeric_limits<eT>::min());
+    auto [total_nonzero, C_data, C_indices, C_indptr]
+        = core::sp_matmul_topn_mt<eT, idxT, insertion_sort, aT, bT, true>(
+            top_n,
+            nrows,
+            ncols,
+            local_threshold,
+            n_threads,
+            A_data.data(),
+            A_indptr.data(),
+            A_indices.data(),
+            B_data.data(),
+            B_indptr.data(),
+            B_indices.data(),
+            &stats
+        );
+    return nb::make_tuple(
+        to_nbvec<eT>(C_data, total_nonzero),
+        to_nbvec<idxT>(C_indices, total_nonzero),
+        to_nbvec<idxT>(C_indptr, nrows + 1),
+        to_dict(stats)
+    );
+}
 #endif  // SDTN_OMP_ENABLED
 
 }  // namespace api
@@ -143,9 +285,13 @@ namespace bindings {
 
 void bind_sp_matmul_topn(nb::module_& m);
 void bind_sp_matmul_topn_sorted(nb::module_& m);
+void bind_sp_matmul_topn_mixed(nb::module_& m);
+void bind_sp_matmul_topn_stats(nb::module_& m);
 #ifdef SDTN_OMP_ENABLED
 void bind_sp_matmul_topn_mt(nb::module_& m);
 void bind_sp_matmul_topn_sorted_mt(nb::module_& m);
+void bind_sp_matmul_topn_mixed_mt(nb::module_& m);
+void bind_sp_matmul_topn_stats_mt(nb::module_& m);
 #endif  // SDTN_OMP_ENABLED
 }  // namespace bindings
 }  // namespace sdtn
@@ -0,0 +1,264 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#pragma once
+
+#include <algorithm>
+#include <cstring>
+#include <memory>
+#include <numeric>
+#include <tuple>
+#include <vector>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/maxheap.hpp>
+
+namespace sdtn::core {
+
+/**
+ * \brief Compute the top n dot products over a set of candidate pairs.
+ *
+ * \details Only the pairs (i, k) stored in the candidate matrix are
+ * computed, the dot product between row i of A and row k of B is computed
+ * exactly by scattering row i of A into a dense buffer. Note that `B` is
+ * stored with the candidates as rows, i.e. C = A * B.T.
+ *
+ * \tparam eT   element type of the matrices
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the candidate order, otherwise sort by value
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in A
+ * \param[in] nfeatures the number of columns in A and B
+ * \param[in] threshold minimum values required to store
+ * \param[in] A_data the nonzero elements of A
+ * \param[in] A_indptr array containing the row indices for `A_data`
+ * \param[in] A_indices array containing the column indices
+ * \param[in] B_data the nonzero elements of B
+ * \param[in] B_indptr array containing the row indices for `B_data`
+ * \param[in] B_indices array containing the column indices
+ * \param[in] cand_indptr array containing the row indices of the candidates
+ * \param[in] cand_indices the rows of B that are candidates for row i of A
+ * \param[out] C_data the nonzero elements of C
+ * \param[out] C_indptr array containing the row indices for `C_data`
+ * \param[out] C_indices array containing the column indices
+ */
+template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+inline void sp_matmul_topn_candidates(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT nfeatures,
+    const eT threshold,
+    const eT* __restrict A_data,
+    const idxT* __restrict A_indptr,
+    const idxT* __restrict A_indices,
+    const eT* __restrict B_data,
+    const idxT* __restrict B_indptr,
+    const idxT* __restrict B_indices,
+    const idxT* __restrict cand_indptr,
+    const idxT* __restrict cand_indices,
+    std::vector<eT>& C_data,
+    std::vector<idxT>& C_indptr,
+    std::vector<idxT>& C_indices
+) {
+    std::vector<eT> dense(nfeatures, 0);
+
+    auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+    idxT nnz = 0;
+
+    C_indptr[0] = 0;
+
+    for (idxT i = 0; i < nrows; i++) {
+        eT min = max_heap.reset();
+
+        idxT A_cidx_start = A_indptr[i];
+        idxT A_cidx_end = A_indptr[i + 1];
+        for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+            dense[A_indices[A_cidx]] += A_data[A_cidx];
+        }
+
+        for (idxT kk = cand_indptr[i]; kk < cand_indptr[i + 1]; kk++) {
+            idxT k = cand_indices[kk];
+            eT val = 0;
+            for (idxT B_cidx = B_indptr[k]; B_cidx < B_indptr[k + 1];
+                 B_cidx++) {
+                val += dense[B_indices[B_cidx]] * B_data[B_cidx];
+            }
+            // pairs without overlap are not stored, as in A * B
+            if (val != 0 && val > min) {
+                min = max_heap.push_pop(k, val);
+            }
+        }
+
+        // clear buffer
+        for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+            dense[A_indices[A_cidx]] = 0;
+        }
+
+        if constexpr (insertion_sort) {
+            max_heap.insertion_sort();
+        } else {
+            max_heap.value_sort();
+        }
+        int n_set = max_heap.get_n_set();
+        for (int ii = 0; ii < n_set; ++ii) {
+            C_indices.push_back(max_heap.heap[ii].idx);
+            C_data.push_back(max_heap.heap[ii].val);
+        }
+        nnz += n_set;
+        C_indptr[i + 1] = nnz;
+    }
+}
+
+#if defined(SDTN_OMP_ENABLED)
+/**
+ * \brief Compute the top n dot products over a set of candidate pairs.
+ *
+ * \details Parallelised version of `sp_matmul_topn_candidates`.
+ *
+ * \tparam eT   element type of the matrices
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the candidate order, otherwise sort by value
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in A
+ * \param[in] nfeatures the number of columns in A and B
+ * \param[in] threshold minimum values required to store
+ * \param[in] n_threads number of threads to use
+ * \param[in] A_data the nonzero elements of A
+ * \param[in] A_indptr array containing the row indices for `A_data`
+ * \param[in] A_indices array containing the column indices
+ * \param[in] B_data the nonzero elements of B
+ * \param[in] B_indptr array containing the row indices for `B_data`
+ * \param[in] B_indices array containing the column indices
+ * \param[in] cand_indptr array containing the row indices of the candidates
+ * \param[in] cand_indices the rows of B that are candidates for row i of A
+ */
+template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_candidates_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT nfeatures,
+    const eT threshold,
+    const int n_threads,
+    const eT* __restrict A_data,
+    const idxT* __restrict A_indptr,
+    const idxT* __restrict A_indices,
+    const eT* __restrict B_data,
+    const idxT* __restrict B_indptr,
+    const idxT* __restrict B_indices,
+    const idxT* __restrict cand_indptr,
+    const idxT* __restrict cand_indices
+) {
+    auto values = std::unique_ptr<eT[]>(new eT[nrows * top_n]);
+    auto indices = std::unique_ptr<idxT[]>(new idxT[nrows * top_n]);
+    auto row_nset = std::unique_ptr<idxT[]>(new idxT[nrows]);
+#pragma omp parallel num_threads(n_threads) \
+    shared(top_n,                           \
+               nrows,                       \
+               nfeatures,                   \
+               threshold,                   \
+               A_data,                      \
+               A_indptr,                    \
+               A_indices,                   \
+               B_data,                      \
+               B_indptr,                    \
+               B_indices,                   \
+               cand_indptr,                 \
+               cand_indices,                \
+               values,                      \
+               indices,                     \
+               row_nset)
+    {
+        std::vector<eT> dense(nfeatures, 0);
+
+        auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+
+#pragma omp for schedule(dynamic, 64)
+        for (idxT i = 0; i < nrows; i++) {
+            idxT offset = i * top_n;
+            eT* local_vals = values.get() + offset;
+            idxT* local_idxs = indices.get() + offset;
+
+            eT min = max_heap.reset();
+
+            idxT A_cidx_start = A_indptr[i];
+            idxT A_cidx_end = A_indptr[i + 1];
+            for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+                dense[A_indices[A_cidx]] += A_data[A_cidx];
+            }
+
+            for (idxT kk = cand_indptr[i]; kk < cand_indptr[i + 1]; kk++) {
+                idxT k = cand_indices[kk];
+                eT val = 0;
+                for (idxT B_cidx = B_indptr[k]; B_cidx < B_indptr[k + 1];
+                     B_cidx++) {
+                    val += dense[B_indices[B_cidx]] * B_data[B_cidx];
+                }
+                // pairs without overlap are not stored, as in A * B
+                if (val != 0 && val > min) {
+                    min = max_heap.push_pop(k, val);
+                }
+            }
+
+            // clear buffer
+            for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+                dense[A_indices[A_cidx]] = 0;
+            }
+
+            if constexpr (insertion_sort) {
+                max_heap.insertion_sort();
+            } else {
+                max_heap.value_sort();
+            }
+            int n_set = max_heap.get_n_set();
+            for (int ii = 0; ii < n_set; ++ii) {
+                local_idxs[ii] = max_heap.heap[ii].idx;
+                local_vals[ii] = max_heap.heap[ii].val;
+            }
+            row_nset[i] = n_set;
+        }
+    }  // #pragma omp parallel
+
+    size_t total_nonzero = std::accumulate(
+        row_nset.get(), row_nset.get() + nrows, static_cast<size_t>(0)
+    );
+    idxT* C_indptr = new idxT[nrows + 1];
+    C_indptr[0] = 0;
+    idxT* C_indices = new idxT[total_nonzero];
+    eT* C_data = new eT[total_nonzero];
+    idxT* C_idx_ptr = C_indices;
+    eT* C_data_ptr = C_data;
+
+    idxT nnz = 0;
+    idxT* idx_ptr = indices.get();
+    eT* vals_ptr = values.get();
+
+    for (idxT i = 0; i < nrows; ++i) {
+        idxT n_set = row_nset[i];
+        std::memcpy(C_idx_ptr, idx_ptr, n_set * sizeof(idxT));
+        std::memcpy(C_data_ptr, vals_ptr, n_set * sizeof(eT));
+        nnz += n_set;
+        C_indptr[i + 1] = nnz;
+        C_idx_ptr += n_set;
+        C_data_ptr += n_set;
+        idx_ptr += top_n;
+        vals_ptr += top_n;
+    }
+    return std::make_tuple(total_nonzero, C_data, C_indices, C_indptr);
+}  // sp_matmul_topn_candidates_mt
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::core
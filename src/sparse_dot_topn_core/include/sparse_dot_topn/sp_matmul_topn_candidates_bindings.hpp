@@ -0,0 +1,148 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#pragma once
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/optional.h>
+
+#include <algorithm>
+#include <limits>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_candidates.hpp>
+
+namespace sdtn {
+
+namespace nb = nanobind;
+
+namespace api {
+
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    core::iffInt<idxT> = true>
+inline nb::tuple sp_matmul_topn_candidates(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT nfeatures,
+    std::optional<eT> threshold,
+    const nb_vec<eT>& A_data,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<eT>& B_data,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices,
+    const nb_vec<idxT>& cand_indptr,
+    const nb_vec<idxT>& cand_indices
+) {
+    eT local_threshold = threshold.value_or(std::numeric_limits<eT>::min());
+    // the number of candidates bounds the number of non-zero elements
+    const idxT* cand_indptr_ptr = cand_indptr.data();
+    size_t result_size = 0;
+    for (idxT i = 0; i < nrows; ++i) {
+        result_size
+            += std::min(top_n, cand_indptr_ptr[i + 1] - cand_indptr_ptr[i]);
+    }
+    std::vector<eT> C_data;
+    C_data.reserve(result_size);
+    std::vector<idxT> C_indices;
+    C_indices.reserve(result_size);
+    std::vector<idxT> C_indptr(nrows + 1);
+    core::sp_matmul_topn_candidates<eT, idxT, insertion_sort>(
+        top_n,
+        nrows,
+        nfeatures,
+        local_threshold,
+        A_data.data(),
+        A_indptr.data(),
+        A_indices.data(),
+        B_data.data(),
+        B_indptr.data(),
+        B_indices.data(),
+        cand_indptr.data(),
+        cand_indices.data(),
+        C_data,
+        C_indptr,
+        C_indices
+    );
+    return nb::make_tuple(
+        to_nbvec<eT>(std::move(C_data)),
+        to_nbvec<idxT>(std::move(C_indices)),
+        to_nbvec<idxT>(std::move(C_indptr))
+    );
+}
+
+#ifdef SDTN_OMP_ENABLED
+template <
+    typename eT,
+    typename idxT,
+    bool insertion_sort,
+    core::iffInt<idxT> = true>
+inline nb::tuple sp_matmul_topn_candidates_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT nfeatures,
+    std::optional<eT> threshold,
+    const int n_threads,
+    const nb_vec<eT>& A_data,
+    const nb_vec<idxT>& A_indptr,
+    const nb_vec<idxT>& A_indices,
+    const nb_vec<eT>& B_data,
+    const nb_vec<idxT>& B_indptr,
+    const nb_vec<idxT>& B_indices,
+    const nb_vec<idxT>& cand_indptr,
+    const nb_vec<idxT>& cand_indices
+) {
+    eT local_threshold = threshold.value_or(std::numeric_limits<eT>::min());
+    auto [total_nonzero, C_data, C_indices, C_indptr]
+        = core::sp_matmul_topn_candidates_mt<eT, idxT, insertion_sort>(
+            top_n,
+            nrows,
+            nfeatures,
+            local_threshold,
+            n_threads,
+            A_data.data(),
+            A_indptr.data(),
+            A_indices.data(),
+            B_data.data(),
+            B_indptr.data(),
+            B_indices.data(),
+            cand_indptr.data(),
+            cand_indices.data()
+        );
+    return nb::make_tuple(
+        to_nbvec<eT>(C_data, total_nonzero),
+        to_nbvec<idxT>(C_indices, total_nonzero),
+        to_nbvec<idxT>(C_indptr, nrows + 1)
+    );
+}
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace api
+
+namespace bindings {
+
+void bind_sp_matmul_topn_candidates(nb::module_& m);
+#ifdef SDTN_OMP_ENABLED
+void bind_sp_matmul_topn_candidates_mt(nb::module_& m);
+#endif  // SDTN_OMP_ENABLED
+}  // namespace bindings
+}  // namespace sdtn
@@ -0,0 +1,322 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#pragma once
+
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <numeric>
+#include <tuple>
+#include <vector>
+
+#include <sparse_dot_topn/common.hpp>
+#include <sparse_dot_topn/maxheap.hpp>
+
+namespace sdtn::core {
+
+/**
+ * \brief Decode an unsigned LEB128 varint and advance `ptr` past it.
+ *
+ * \details Every byte stores 7 bits of the value, least significant group
+ * first, the high bit is set when more bytes follow.
+ */
+template <typename idxT>
+inline idxT read_varint(const uint8_t*& ptr) {
+    const uint8_t b0 = ptr[0];
+    // most deltas fit in one or two bytes
+    if (b0 < 0x80) {
+        ptr += 1;
+        return static_cast<idxT>(b0);
+    }
+    const uint8_t b1 = ptr[1];
+    if (b1 < 0x80) {
+        ptr += 2;
+        return static_cast<idxT>(
+            (b0 & 0x7F) | (static_cast<uint32_t>(b1) << 7)
+        );
+    }
+    uint64_t value = (b0 & 0x7F) | (static_cast<uint64_t>(b1 & 0x7F) << 7);
+    ptr += 2;
+    int shift = 14;
+    uint8_t byte;
+    do {
+        byte = *ptr++;
+        value |= static_cast<uint64_t>(byte & 0x7F) << shift;
+        shift += 7;
+    } while (byte & 0x80);
+    return static_cast<idxT>(value);
+}
+
+/**
+ * \brief Compute the top n elements of A * B where the column indices of B
+ * are compressed.
+ *
+ * \details Variant of `sp_matmul_topn` where the column indices of each row
+ * of B are delta encoded, the first index of a row relative to zero, and
+ * stored as LEB128 varints. The indices are decoded while accumulating.
+ *
+ * \tparam eT   element type of the matrices
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the column order, otherwise sort by value
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in A
+ * \param[in] ncols the number of columns in B
+ * \param[in] threshold minimum value required to store
+ * \param[in] A_data the non-zero elements of A
+ * \param[in] A_indptr array containing the row indices for `A_data`
+ * \param[in] A_indices array containing the column indices
+ * \param[in] B_data the non-zero elements of B
+ * \param[in] B_indptr array containing the row indices for `B_data`
+ * \param[in] B_offsets the offset of every row of B in `B_bytes`
+ * \param[in] B_bytes the encoded column indices of B
+ * \param[out] C_data the nonzero elements of C
+ * \param[out] C_indptr array containing the row indices for `C_data`
+ * \param[out] C_indices array containing the column indices
+ */
+template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+inline void sp_matmul_topn_compressed(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const eT threshold,
+    const eT* __restrict A_data,
+    const idxT* __restrict A_indptr,
+    const idxT* __restrict A_indices,
+    const eT* __restrict B_data,
+    const idxT* __restrict B_indptr,
+    const int64_t* __restrict B_offsets,
+    const uint8_t* __restrict B_bytes,
+    std::vector<eT>& C_data,
+    std::vector<idxT>& C_indptr,
+    std::vector<idxT>& C_indices
+) {
+    std::vector<idxT> next(ncols, -1);
+    std::vector<eT> sums(ncols, 0);
+
+    auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+    idxT nnz = 0;
+
+    C_indptr[0] = 0;
+
+    for (idxT i = 0; i < nrows; i++) {
+        idxT head = -2;
+        idxT length = 0;
+        eT min = max_heap.reset();
+
+        idxT A_cidx_start = A_indptr[i];
+        idxT A_cidx_end = A_indptr[i + 1];
+        for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+            idxT j = A_indices[A_cidx];
+            eT v = A_data[A_cidx];
+
+            idxT B_ridx_start = B_indptr[j];
+            idxT B_ridx_end = B_indptr[j + 1];
+            const uint8_t* B_ptr = B_bytes + B_offsets[j];
+            idxT k = 0;
+            for (idxT B_ridx = B_ridx_start; B_ridx < B_ridx_end; B_ridx++) {
+                k += read_varint<idxT>(B_ptr);  // kth column of B in row j
+                sums[k] += v * B_data[B_ridx];
+
+                if (next[k] == -1) {
+                    next[k] = head;
+                    head = k;
+                    length++;
+                }
+            }
+        }
+
+        for (idxT jj = 0; jj < length; jj++) {
+            if (sums[head] > min) {
+                min = max_heap.push_pop(head, sums[head]);
+            }
+
+            idxT temp = head;
+            head = next[head];
+
+            // clear arrays
+            next[temp] = -1;
+            sums[temp] = 0;
+        }
+
+        if constexpr (insertion_sort) {
+            max_heap.insertion_sort();
+        } else {
+            max_heap.value_sort();
+        }
+        int n_set = max_heap.get_n_set();
+        for (int ii = 0; ii < n_set; ++ii) {
+            C_indices.push_back(max_heap.heap[ii].idx);
+            C_data.push_back(max_heap.heap[ii].val);
+        }
+        nnz += n_set;
+        C_indptr[i + 1] = nnz;
+    }
+}
+
+#if defined(SDTN_OMP_ENABLED)
+/**
+ * \brief Compute the top n elements of A * B where the column indices of B
+ * are compressed.
+ *
+ * \details Parallelised version of `sp_matmul_topn_compressed`.
+ *
+ * \tparam eT   element type of the matrices
+ * \tparam idxT integer type of the index arrays, must be at least 32 bit int
+ * \tparam insertion_sort keep the column order, otherwise sort by value
+ * \param[in] top_n the top n values to store
+ * \param[in] nrows the number of rows in A
+ * \param[in] ncols the number of columns in B
+ * \param[in] threshold minimum value required to store
+ * \param[in] n_threads number of threads to use
+ * \param[in] A_data the non-zero elements of A
+ * \param[in] A_indptr array containing the row indices for `A_data`
+ * \param[in] A_indices array containing the column indices
+ * \param[in] B_data the non-zero elements of B
+ * \param[in] B_indptr array containing the row indices for `B_data`
+ * \param[in] B_offsets the offset of every row of B in `B_bytes`
+ * \param[in] B_bytes the encoded column indices of B
+ */
+template <typename eT, typename idxT, bool insertion_sort, iffInt<idxT> = true>
+inline std::tuple<size_t, eT*, idxT*, idxT*> sp_matmul_topn_compressed_mt(
+    const idxT top_n,
+    const idxT nrows,
+    const idxT ncols,
+    const eT threshold,
+    const int n_threads,
+    const eT* __restrict A_data,
+    const idxT* __restrict A_indptr,
+    const idxT* __restrict A_indices,
+    const eT* __restrict B_data,
+    const idxT* __restrict B_indptr,
+    const int64_t* __restrict B_offsets,
+    const uint8_t* __restrict B_bytes
+) {
+    auto values = std::unique_ptr<eT[]>(new eT[nrows * top_n]);
+    auto indices = std::unique_ptr<idxT[]>(new idxT[nrows * top_n]);
+    auto row_nset = std::unique_ptr<idxT[]>(new idxT[nrows]);
+#pragma omp parallel num_threads(n_threads) \
+    shared(top_n,                           \
+               nrows,                       \
+               ncols,                       \
+               threshold,                   \
+               A_data,                      \
+               A_indptr,                    \
+               A_indices,                   \
+               B_data,                      \
+               B_indptr,                    \
+               B_offsets,                   \
+               B_bytes,                     \
+               values,                      \
+               indices,                     \
+               row_nset)
+    {
+        std::vector<idxT> next(ncols, -1);
+        std::vector<eT> sums(ncols, 0);
+
+        auto max_heap = MaxHeap<eT, idxT>(top_n, threshold);
+
+#pragma omp for
+        for (idxT i = 0; i < nrows; i++) {
+            idxT head = -2;
+            idxT length = 0;
+
+            idxT offset = i * top_n;
+            eT* local_vals = values.get() + offset;
+            idxT* local_idxs = indices.get() + offset;
+
+            eT min = max_heap.reset();
+
+            idxT A_cidx_start = A_indptr[i];
+            idxT A_cidx_end = A_indptr[i + 1];
+            for (idxT A_cidx = A_cidx_start; A_cidx < A_cidx_end; A_cidx++) {
+                idxT j = A_indices[A_cidx];
+                eT v = A_data[A_cidx];
+
+                idxT B_ridx_start = B_indptr[j];
+                idxT B_ridx_end = B_indptr[j + 1];
+                const uint8_t* B_ptr = B_bytes + B_offsets[j];
+                idxT k = 0;
+                for (idxT B_ridx = B_ridx_start; B_ridx < B_ridx_end;
+                     B_ridx++) {
+                    k += read_varint<idxT>(B_ptr);  // kth column of B in row j
+                    sums[k] += v * B_data[B_ridx];
+
+                    if (next[k] == -1) {
+                        next[k] = head;
+                        head = k;
+                        length++;
+                    }
+                }
+            }
+
+            for (idxT jj = 0; jj < length; jj++) {
+                if (sums[head] > min) {
+                    min = max_heap.push_pop(head, sums[head]);
+                }
+
+                idxT temp = head;
+                head = next[head];
+
+                // clear arrays
+                next[temp] = -1;
+                sums[temp] = 0;
+            }
+
+            if constexpr (insertion_sort) {
+                max_heap.insertion_sort();
+            } else {
+                max_heap.value_sort();
+            }
+            int n_set = max_heap.get_n_set();
+            for (int ii = 0; ii < n_set; ++ii) {
+                local_idxs[ii] = max_heap.heap[ii].idx;
+                local_vals[ii] = max_heap.heap[ii].val;
+            }
+            row_nset[i] = n_set;
+        }
+    }  // #pragma omp parallel
+
+    size_t total_nonzero = std::accumulate(
+        row_nset.get(), row_nset.get() + nrows, static_cast<size_t>(0)
+    );
+    idxT* C_indptr = new idxT[nrows + 1];
+    C_indptr[0] = 0;
+    idxT* C_indices = new idxT[total_nonzero];
+    eT* C_data = new eT[total_nonzero];
+    idxT* C_idx_ptr = C_indices;
+    eT* C_data_ptr = C_data;
+
+    idxT nnz = 0;
+    idxT* idx_ptr = indices.get();
+    eT* vals_ptr = values.get();
+
+    for (idxT i = 0; i < nrows; ++i) {
+        idxT n_set = row_nset[i];
+        std::memcpy(C_idx_ptr, idx_ptr, n_set * sizeof(idxT));
+        std::memcpy(C_data_ptr, vals_ptr, n_set * sizeof(eT));
+        nnz += n_set;
+        C_indptr[i + 1] = nnz;
+        C_idx_ptr += n_set;
+        C_data_ptr += n_set;
+        idx_ptr += top_n;
+        vals_ptr += top_n;
+    }
+    return std::make_tuple(total_nonzero, C_data, C_indices, C_indptr);
+}  // sp_matmul_topn_compressed_mt
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::core
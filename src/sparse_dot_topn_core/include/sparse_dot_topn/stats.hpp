@@ -0,0 +1,68 @@
+/* sparse_dot_topn/stats.hpp -- Counters and timings of the kernels.
+ *
+ * Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#pragma once
+
+#include <chrono>
+#include <cstdint>
+#include <vector>
+
+namespace sdtn::core {
+
+using stats_clock = std::chrono::steady_clock;
+
+/**
+ * \brief Counters and phase timings of a single kernel call.
+ *
+ * \details Only filled by kernels instantiated with `collect_stats` set,
+ * the timings are in seconds. For the parallelised kernels the
+ * `accumulate` and `select` timings are summed over the threads.
+ */
+struct KernelStats {
+    // number of multiply-adds
+    uint64_t flops = 0;
+    // number of distinct columns accumulated over all rows
+    uint64_t candidates = 0;
+    // number of values pushed into the heap
+    uint64_t heap_insertions = 0;
+    // number of rows with `top_n` values stored
+    uint64_t rows_full = 0;
+    // bytes allocated for the buffers and the output
+    uint64_t bytes_allocated = 0;
+    double size_pass = 0.0;
+    double accumulate = 0.0;
+    double select = 0.0;
+    double compact = 0.0;
+    std::vector<double> thread_busy;
+
+    void merge(const KernelStats& other) {
+        flops += other.flops;
+        candidates += other.candidates;
+        heap_insertions += other.heap_insertions;
+        rows_full += other.rows_full;
+        bytes_allocated += other.bytes_allocated;
+        accumulate += other.accumulate;
+        select += other.select;
+    }
+};
+
+inline double seconds_since(const stats_clock::time_point start) {
+    return std::chrono::duration<double>(stats_clock::now() - start).count();
+}
+
+}  // namespace sdtn::core
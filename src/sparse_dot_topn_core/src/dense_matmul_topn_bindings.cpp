@@ -0,0 +1,529 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <sparse_dot_topn/dense_matmul_topn.hpp>
+#include <sparse_dot_topn/dense_matmul_topn_bindings.hpp>
+
+namespace sdtn::bindings {
+namespace nb = nanobind;
+
+using namespace nb::literals;
+
+void bind_dense_topn_update(nb::module_& m) {
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<double, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert(),
+        ("Merge a dense tile of C into the running top n of each row.\n"
+         "\n"
+         "The arrays `values`, `indices` and `n_set` are updated in place.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in the tile\n"
+         "    ncols (int): the number of columns in the tile\n"
+         "    col_offset (int): the column index of the first column of the tile\n"
+         "    threshold (float): only store values greater than\n"
+         "    X (NDArray[int | float]): the tile in row-major order\n"
+         "    values (NDArray[int | float]): the running top n values, shape nrows * top_n\n"
+         "    indices (NDArray[int]): the column indices of `values`\n"
+         "    n_set (NDArray[int]): the number of values stored per row\n"
+         "\n")
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<float, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<int, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<int64_t, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<double, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<float, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<int, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update",
+        &api::dense_topn_update<int64_t, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<double, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert(),
+        ("Merge a dense tile of C into the running top n of each row.\n"
+         "\n"
+         "The arrays `values`, `indices` and `n_set` are updated in place.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in the tile\n"
+         "    ncols (int): the number of columns in the tile\n"
+         "    col_offset (int): the column index of the first column of the tile\n"
+         "    threshold (float): only store values greater than\n"
+         "    X (NDArray[int | float]): the tile in row-major order\n"
+         "    values (NDArray[int | float]): the running top n values, shape nrows * top_n\n"
+         "    indices (NDArray[int]): the column indices of `values`\n"
+         "    n_set (NDArray[int]): the number of values stored per row\n"
+         "\n")
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<float, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<int, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<int64_t, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<double, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<float, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<int, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted",
+        &api::dense_topn_update<int64_t, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+}
+
+#ifdef SDTN_OMP_ENABLED
+void bind_dense_topn_update_mt(nb::module_& m) {
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<double, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert(),
+        ("Merge a dense tile of C into the running top n of each row.\n"
+         "\n"
+         "The arrays `values`, `indices` and `n_set` are updated in place.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in the tile\n"
+         "    ncols (int): the number of columns in the tile\n"
+         "    col_offset (int): the column index of the first column of the tile\n"
+         "    threshold (float): only store values greater than\n"
+         "    n_threads (int): number of threads to use\n"
+         "    X (NDArray[int | float]): the tile in row-major order\n"
+         "    values (NDArray[int | float]): the running top n values, shape nrows * top_n\n"
+         "    indices (NDArray[int]): the column indices of `values`\n"
+         "    n_set (NDArray[int]): the number of values stored per row\n"
+         "\n")
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<float, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<int, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<int64_t, int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<double, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<float, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<int, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_mt",
+        &api::dense_topn_update_mt<int64_t, int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<double, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert(),
+        ("Merge a dense tile of C into the running top n of each row.\n"
+         "\n"
+         "The arrays `values`, `indices` and `n_set` are updated in place.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in the tile\n"
+         "    ncols (int): the number of columns in the tile\n"
+         "    col_offset (int): the column index of the first column of the tile\n"
+         "    threshold (float): only store values greater than\n"
+         "    n_threads (int): number of threads to use\n"
+         "    X (NDArray[int | float]): the tile in row-major order\n"
+         "    values (NDArray[int | float]): the running top n values, shape nrows * top_n\n"
+         "    indices (NDArray[int]): the column indices of `values`\n"
+         "    n_set (NDArray[int]): the number of values stored per row\n"
+         "\n")
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<float, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<int, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<int64_t, int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<double, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<float, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<int, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+    m.def(
+        "dense_topn_update_sorted_mt",
+        &api::dense_topn_update_mt<int64_t, int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "col_offset"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "X"_a.noconvert(),
+        "values"_a.noconvert(),
+        "indices"_a.noconvert(),
+        "n_set"_a.noconvert()
+    );
+}
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::bindings
@@ -15,8 +15,12 @@
  * limitations under the License.
  */
 #include <nanobind/nanobind.h>
+#include <sparse_dot_topn/dense_matmul_topn_bindings.hpp>
 #include <sparse_dot_topn/sp_matmul_bindings.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_binary_bindings.hpp>
 #include <sparse_dot_topn/sp_matmul_topn_bindings.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_candidates_bindings.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_compressed_bindings.hpp>
 #include <sparse_dot_topn/zip_sp_matmul_topn_bindings.hpp>
 
 namespace sdtn::bindings {
@@ -25,11 +29,23 @@ NB_MODULE(_sparse_dot_topn_core, m) {
     bind_sp_matmul(m);
     bind_sp_matmul_topn(m);
     bind_sp_matmul_topn_sorted(m);
+    bind_sp_matmul_topn_mixed(m);
+    bind_sp_matmul_topn_stats(m);
+    bind_sp_matmul_topn_binary(m);
+    bind_sp_matmul_topn_candidates(m);
+    bind_sp_matmul_topn_compressed(m);
     bind_zip_sp_matmul_topn(m);
+    bind_dense_topn_update(m);
 #ifdef SDTN_OMP_ENABLED
     bind_sp_matmul_mt(m);
     bind_sp_matmul_topn_mt(m);
     bind_sp_matmul_topn_sorted_mt(m);
+    bind_sp_matmul_topn_mixed_mt(m);
+    bind_sp_matmul_topn_stats_mt(m);
+    bind_sp_matmul_topn_binary_mt(m);
+    bind_sp_matmul_topn_candidates_mt(m);
+    bind_sp_matmul_topn_compressed_mt(m);
+    bind_dense_topn_update_mt(m);
     m.attr("_has_openmp_support") = true;
 #else
     m.attr("_has_openmp_support") = false;
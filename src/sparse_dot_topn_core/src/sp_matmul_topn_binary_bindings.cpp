@@ -0,0 +1,253 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <sparse_dot_topn/sp_matmul_topn_binary.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_binary_bindings.hpp>
+
+namespace sdtn::bindings {
+namespace nb = nanobind;
+
+using namespace nb::literals;
+
+void bind_sp_matmul_topn_binary(nb::module_& m) {
+    m.def(
+        "sp_matmul_topn_binary",
+        &api::sp_matmul_topn_binary<int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert(),
+        ("Compute the top n overlap scores of binary matrices.\n"
+         "\n"
+         "The data arrays of A and B are not used, every stored element is"
+         " treated as a one.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in `A`\n"
+         "    ncols (int): the number of columns in `B`\n"
+         "    threshold (float): only store scores greater than\n"
+         "    density (float): the expected density of the result"
+         " considering `top_n`\n"
+         "    similarity (str): one of 'count', 'jaccard', 'dice', 'overlap'\n"
+         "    A_indptr (NDArray[int]): the row indices for `A`\n"
+         "    A_indices (NDArray[int]): the column indices for `A`\n"
+         "    B_indptr (NDArray[int]): the row indices for `B`\n"
+         "    B_indices (NDArray[int]): the column indices for `B`\n"
+         "    B_card (NDArray[int]): the number of non-zero elements in each"
+         " column of `B`\n"
+         "\n"
+         "Returns:\n"
+         "    C_data (NDArray[int | float]): the non-zero elements of C\n"
+         "    C_indptr (NDArray[int]): the row indices for `C_data`\n"
+         "    C_indices (NDArray[int]): the column indices for `C_data`\n"
+         "\n")
+    );
+    m.def(
+        "sp_matmul_topn_binary",
+        &api::sp_matmul_topn_binary<int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_binary_sorted",
+        &api::sp_matmul_topn_binary<int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert(),
+        ("Compute the top n overlap scores of binary matrices.\n"
+         "\n"
+         "The data arrays of A and B are not used, every stored element is"
+         " treated as a one.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in `A`\n"
+         "    ncols (int): the number of columns in `B`\n"
+         "    threshold (float): only store scores greater than\n"
+         "    density (float): the expected density of the result"
+         " considering `top_n`\n"
+         "    similarity (str): one of 'count', 'jaccard', 'dice', 'overlap'\n"
+         "    A_indptr (NDArray[int]): the row indices for `A`\n"
+         "    A_indices (NDArray[int]): the column indices for `A`\n"
+         "    B_indptr (NDArray[int]): the row indices for `B`\n"
+         "    B_indices (NDArray[int]): the column indices for `B`\n"
+         "    B_card (NDArray[int]): the number of non-zero elements in each"
+         " column of `B`\n"
+         "\n"
+         "Returns:\n"
+         "    C_data (NDArray[int | float]): the non-zero elements of C\n"
+         "    C_indptr (NDArray[int]): the row indices for `C_data`\n"
+         "    C_indices (NDArray[int]): the column indices for `C_data`\n"
+         "\n")
+    );
+    m.def(
+        "sp_matmul_topn_binary_sorted",
+        &api::sp_matmul_topn_binary<int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert()
+    );
+}
+
+#ifdef SDTN_OMP_ENABLED
+void bind_sp_matmul_topn_binary_mt(nb::module_& m) {
+    m.def(
+        "sp_matmul_topn_binary_mt",
+        &api::sp_matmul_topn_binary_mt<int, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert(),
+        ("Compute the top n overlap scores of binary matrices.\n"
+         "\n"
+         "The data arrays of A and B are not used, every stored element is"
+         " treated as a one.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in `A`\n"
+         "    ncols (int): the number of columns in `B`\n"
+         "    threshold (float): only store scores greater than\n"
+         "    n_threads (int): number of threads to use\n"
+         "    similarity (str): one of 'count', 'jaccard', 'dice', 'overlap'\n"
+         "    A_indptr (NDArray[int]): the row indices for `A`\n"
+         "    A_indices (NDArray[int]): the column indices for `A`\n"
+         "    B_indptr (NDArray[int]): the row indices for `B`\n"
+         "    B_indices (NDArray[int]): the column indices for `B`\n"
+         "    B_card (NDArray[int]): the number of non-zero elements in each"
+         " column of `B`\n"
+         "\n"
+         "Returns:\n"
+         "    C_data (NDArray[int | float]): the non-zero elements of C\n"
+         "    C_indptr (NDArray[int]): the row indices for `C_data`\n"
+         "    C_indices (NDArray[int]): the column indices for `C_data`\n"
+         "\n")
+    );
+    m.def(
+        "sp_matmul_topn_binary_mt",
+        &api::sp_matmul_topn_binary_mt<int64_t, true>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_binary_sorted_mt",
+        &api::sp_matmul_topn_binary_mt<int, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert(),
+        ("Compute the top n overlap scores of binary matrices.\n"
+         "\n"
+         "The data arrays of A and B are not used, every stored element is"
+         " treated as a one.\n"
+         "\n"
+         "Args:\n"
+         "    top_n (int): the number of results to retain\n"
+         "    nrows (int): the number of rows in `A`\n"
+         "    ncols (int): the number of columns in `B`\n"
+         "    threshold (float): only store scores greater than\n"
+         "    n_threads (int): number of threads to use\n"
+         "    similarity (str): one of 'count', 'jaccard', 'dice', 'overlap'\n"
+         "    A_indptr (NDArray[int]): the row indices for `A`\n"
+         "    A_indices (NDArray[int]): the column indices for `A`\n"
+         "    B_indptr (NDArray[int]): the row indices for `B`\n"
+         "    B_indices (NDArray[int]): the column indices for `B`\n"
+         "    B_card (NDArray[int]): the number of non-zero elements in each"
+         " column of `B`\n"
+         "\n"
+         "Returns:\n"
+         "    C_data (NDArray[int | float]): the non-zero elements of C\n"
+         "    C_indptr (NDArray[int]): the row indices for `C_data`\n"
+         "    C_indices (NDArray[int]): the column indices for `C_data`\n"
+         "\n")
+    );
+    m.def(
+        "sp_matmul_topn_binary_sorted_mt",
+        &api::sp_matmul_topn_binary_mt<int64_t, false>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "similarity"_a,
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert(),
+        "B_card"_a.noconvert()
+    );
+}
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::bindings
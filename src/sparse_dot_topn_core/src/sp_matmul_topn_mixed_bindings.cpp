@@ -0,0 +1,528 @@
+/* Copyright (c) 2023 ING Analytics Wholesale Banking
+ * Licensed to the Apache Software Foundation (ASF) under one or more
+ * contributor license agreements.  See the NOTICE file distributed with
+ * this work for additional information regarding copyright ownership.
+ * The ASF licenses this file to You under the Apache License, Version 2.0
+ * (the "License"); you may not use this file except in compliance with
+ * the License.  You may obtain a copy of the License at
+ *
+ *	http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+#include <sparse_dot_topn/sp_matmul_topn.hpp>
+#include <sparse_dot_topn/sp_matmul_topn_bindings.hpp>
+
+#include <cstdint>
+
+namespace sdtn::bindings {
+namespace nb = nanobind;
+
+using namespace nb::literals;
+
+/**
+ * \brief Register reduced-precision overloads of `sp_matmul_topn`.
+ *
+ * \details The overloads are added to the existing functions such that
+ * nanobind dispatches on the dtypes of `A_data` and `B_data`.
+ * Supported (A, B) -> C combinations are:
+ *  - (float64, float32) -> float64
+ *  - (float32, int8) -> float32
+ *  - (float64, int8) -> float64
+ *  - (int8, int8) -> int32
+ */
+void bind_sp_matmul_topn_mixed(nb::module_& m) {
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<double, int, true, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<float, int, true, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<double, int, true, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<int, int, true, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<double, int64_t, true, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<float, int64_t, true, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<double, int64_t, true, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn",
+        &api::sp_matmul_topn<int, int64_t, true, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<double, int, false, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<float, int, false, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<double, int, false, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<int, int, false, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<double, int64_t, false, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<float, int64_t, false, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<double, int64_t, false, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted",
+        &api::sp_matmul_topn<int, int64_t, false, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "density"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+}
+
+#ifdef SDTN_OMP_ENABLED
+void bind_sp_matmul_topn_mixed_mt(nb::module_& m) {
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<double, int, true, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<float, int, true, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<double, int, true, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<int, int, true, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<double, int64_t, true, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<float, int64_t, true, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<double, int64_t, true, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_mt",
+        &api::sp_matmul_topn_mt<int, int64_t, true, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<double, int, false, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<float, int, false, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<double, int, false, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<int, int, false, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<double, int64_t, false, double, float>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<float, int64_t, false, float, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<double, int64_t, false, double, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+    m.def(
+        "sp_matmul_topn_sorted_mt",
+        &api::sp_matmul_topn_mt<int, int64_t, false, int8_t, int8_t>,
+        "top_n"_a,
+        "nrows"_a,
+        "ncols"_a,
+        "threshold"_a.none(),
+        "n_threads"_a,
+        "A_data"_a.noconvert(),
+        "A_indptr"_a.noconvert(),
+        "A_indices"_a.noconvert(),
+        "B_data"_a.noconvert(),
+        "B_indptr"_a.noconvert(),
+        "B_indices"_a.noconvert()
+    );
+}
+#endif  // SDTN_OMP_ENABLED
+
+}  // namespace sdtn::bindings
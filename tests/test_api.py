@@ -1,10 +1,42 @@
+import pickle
 import sys
 from itertools import product
 
 import numpy as np
 import pytest
+from numpy.testing import assert_allclose, assert_array_equal
 from scipy import sparse
-from sparse_dot_topn import _has_openmp_support, sp_matmul, sp_matmul_topn, zip_sp_matmul_topn
+from sparse_dot_topn import (
+    CancelledError,
+    ColumnReordering,
+    CompressedCSR,
+    Progress,
+    _has_openmp_support,
+    available_cpus,
+    column_permutation,
+    compressed,
+    dense_matmul_topn,
+    get_num_threads,
+    lsh_candidates,
+    quantise,
+    remove_columns_topn,
+    row_permutation,
+    set_num_threads,
+    sp_matmul,
+    sp_matmul_topn,
+    sp_matmul_topn_binary,
+    sp_matmul_topn_candidates,
+    sp_matmul_topn_chunked,
+    sp_matmul_topn_compressed,
+    sp_matmul_topn_lsh,
+    sp_matmul_topn_reordered,
+    threadpool_limits,
+    threads,
+    to_pairs,
+    to_record_batch,
+    update_topn,
+    zip_sp_matmul_topn,
+)
 
 from ._resources import _assert_array_equal, _assert_smat_equal, _get_topn_elements
 
@@ -241,3 +273,731 @@ def test_stack_zip_sp_matmul_topn(rng, dtype):
     # the insertion order in the maxheap is leading, which is impossible to replicate in zip_sp_matmul_topn,
     # as the B matrices are have been split and get inserted in separate maxheap objects.
     _assert_array_equal(C_stack.indices, C_ref.indices)
+
+
+_MIXED_DTYPES = [
+    (np.float64, np.float32, np.float64),
+    (np.float32, np.int8, np.float32),
+    (np.float64, np.int8, np.float64),
+    (np.int8, np.int8, np.int32),
+]
+
+
+@pytest.mark.parametrize("dtypes", _MIXED_DTYPES)
+@pytest.mark.parametrize("n_threads", [None, 2])
+@pytest.mark.parametrize("sort", [False, True])
+def test_sp_matmul_topn_mixed_precision(rng, dtypes, n_threads, sort):
+    a_dtype, b_dtype, c_dtype = dtypes
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 100, density=0.2, format="csr", random_state=rng)
+    A.data = (A.data * 100 + 1).astype(a_dtype)
+    B.data = (B.data * 100 + 1).astype(b_dtype)
+    C_ref = A.astype(c_dtype).dot(B.astype(c_dtype))
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+
+    C = sp_matmul_topn(A, B, top_n=B.shape[1], n_threads=n_threads)
+    assert C.dtype == c_dtype
+    _assert_smat_equal(C, C_ref)
+
+    C_10 = sp_matmul_topn(A, B, top_n=10, sort=sort, n_threads=n_threads)
+    for i in range(A.shape[0]):
+        expected = np.sort(C_ref[i, :].data)[::-1][:10] if sort else _get_topn_elements(C_ref[i, :].data, 10)
+        _assert_array_equal(C_10[i, :].data, expected)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32, np.int64])
+@pytest.mark.parametrize("n_threads", [None, 2])
+@pytest.mark.parametrize("sort", [False, True])
+def test_sp_matmul_topn_stats(rng, dtype, n_threads, sort):
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+    A = sparse.random(100, 50, density=0.2, format="csr", dtype=dtype, random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", dtype=dtype, random_state=rng)
+
+    C, stats = sp_matmul_topn(A, B, top_n=10, sort=sort, n_threads=n_threads, return_stats=True)
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=sort, n_threads=n_threads)
+    _assert_smat_equal(C, C_ref)
+    if sort:
+        _assert_array_equal(C.data, C_ref.data)
+
+    assert stats["flops"] == np.diff(B.indptr)[A.indices].sum()
+    assert stats["candidates"] == (A.astype(np.float64) != 0).dot(B.astype(np.float64) != 0).nnz
+    assert stats["heap_insertions"] >= C.nnz
+    assert stats["rows_full"] == (np.diff(C.indptr) == 10).sum()
+    assert stats["bytes_allocated"] > 0
+    assert stats["n_threads"] == (n_threads or 1)
+    assert len(stats["thread_busy"]) == stats["n_threads"]
+    for key in ("convert", "size_pass", "accumulate", "select", "compact", "kernel", "construct"):
+        assert 0.0 <= stats[key] <= stats["total"]
+
+
+def test_sp_matmul_topn_stats_empty(rng):
+    A = sparse.csr_matrix((10, 20))
+    B = sparse.random(20, 30, density=0.2, format="csr", random_state=rng)
+    C, stats = sp_matmul_topn(A, B, top_n=5, return_stats=True)
+    assert C.nnz == 0
+    assert stats["flops"] == 0
+    assert stats["total"] >= 0.0
+
+    # the full product is not delegated to `sp_matmul` such that the statistics are collected
+    A = sparse.random(10, 20, density=0.2, format="csr", random_state=rng)
+    C, stats = sp_matmul_topn(A, B, top_n=B.shape[1], return_stats=True)
+    _assert_smat_equal(C, A.dot(B))
+    assert stats["flops"] == np.diff(B.indptr)[A.indices].sum()
+
+
+def test_quantise(rng):
+    X = sparse.random(100, 200, density=0.1, format="csr", random_state=rng)
+    X_q, scale = quantise(X)
+    assert X_q.dtype == np.int8
+    assert X_q.nnz == X.nnz
+    assert np.abs(X_q.data.astype(np.float64) * scale - X.data).max() <= scale / 2 + 1e-12
+
+    X_f, scale_f = quantise(X.tocsc(), dtype=np.float32)
+    assert isinstance(X_f, sparse.csc_matrix)
+    assert X_f.dtype == np.float32
+    assert scale_f == 1.0
+
+    with pytest.raises(TypeError):
+        quantise(X, dtype=np.int16)
+
+
+def test_sp_matmul_topn_quantised(rng):
+    A = sparse.random(200, 500, density=0.05, format="csr", random_state=rng)
+    B = sparse.random(500, 300, density=0.05, format="csr", random_state=rng)
+    C_ref = sp_matmul_topn(A, B, top_n=5, sort=True)
+
+    A_q, scale_A = quantise(A)
+    B_q, scale_B = quantise(B)
+    C = sp_matmul_topn(A_q, B_q, top_n=5, sort=True)
+    assert C.dtype == np.int32
+    assert_array_equal(C.indptr, C_ref.indptr)
+    assert_allclose(C.data * (scale_A * scale_B), C_ref.data, atol=0.05)
+
+
+def _binary_similarity_ref(A, B, similarity):
+    A = A.astype(np.float64)
+    A.data[:] = 1.0
+    B = B.astype(np.float64)
+    B.data[:] = 1.0
+    C = A.dot(B).toarray()
+    a_card = np.diff(A.indptr)[:, None].astype(np.float64)
+    b_card = np.bincount(B.indices, minlength=B.shape[1])[None, :].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if similarity == "jaccard":
+            C = C / (a_card + b_card - C)
+        elif similarity == "dice":
+            C = 2 * C / (a_card + b_card)
+        elif similarity == "overlap":
+            C = C / np.minimum(a_card, b_card)
+    return sparse.csr_matrix(np.nan_to_num(C))
+
+
+@pytest.mark.parametrize("similarity", ["count", "jaccard", "dice", "overlap"])
+@pytest.mark.parametrize("n_threads", [None, 2])
+def test_sp_matmul_topn_binary(rng, similarity, n_threads):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 80, density=0.2, format="csr", random_state=rng)
+    A.data[:] = 1.0
+    B.data[:] = 1.0
+    C_ref = _binary_similarity_ref(A, B, similarity)
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+
+    C = sp_matmul_topn_binary(A, B, top_n=B.shape[1], similarity=similarity, n_threads=n_threads)
+    assert C.dtype == (np.int32 if similarity == "count" else np.float64)
+    C.sort_indices()
+    _assert_smat_equal(C, C_ref)
+
+    C_5 = sp_matmul_topn_binary(A, B, top_n=5, similarity=similarity, sort=True, n_threads=n_threads)
+    for i in range(A.shape[0]):
+        _assert_array_equal(C_5[i, :].data, np.sort(C_ref[i, :].data)[::-1][:5])
+
+
+def test_sp_matmul_topn_binary_ignores_data(rng):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(80, 50, density=0.2, format="csr", random_state=rng)
+    A_bin = A.copy()
+    A_bin.data[:] = 1.0
+    B_bin = B.copy()
+    B_bin.data[:] = 1.0
+    C_ref = sp_matmul_topn(A_bin, B_bin, top_n=10, sort=True)
+    C = sp_matmul_topn_binary(A, B, top_n=10, sort=True)
+    _assert_array_equal(C.data, C_ref.data)
+    assert_array_equal(C.indptr, C_ref.indptr)
+
+
+def test_sp_matmul_topn_binary_threshold(rng):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 80, density=0.2, format="csr", random_state=rng)
+    C = sp_matmul_topn_binary(A, B, top_n=B.shape[1], similarity="jaccard", threshold=0.1)
+    assert C.data.min() > 0.1
+    C_ref = _binary_similarity_ref(A, B, "jaccard")
+    assert C.nnz == (C_ref.data > 0.1).sum()
+
+    with pytest.raises(ValueError, match="similarity"):
+        sp_matmul_topn_binary(A, B, top_n=10, similarity="cosine")
+
+
+def test_sp_matmul_topn_binary_card(rng):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 80, density=0.2, format="csr", random_state=rng)
+    B_card = np.bincount(B.indices, minlength=B.shape[1])
+    C_ref = sp_matmul_topn_binary(A, B, top_n=10, similarity="jaccard", sort=True)
+    C = sp_matmul_topn_binary(A, B, top_n=10, similarity="jaccard", sort=True, B_card=B_card)
+    _assert_smat_equal(C, C_ref)
+
+    with pytest.raises(ValueError, match="B_card"):
+        sp_matmul_topn_binary(A, B, top_n=10, B_card=B_card[:-1])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32, np.int64])
+@pytest.mark.parametrize("n_threads", [None, 2])
+def test_sp_matmul_topn_candidates(rng, dtype, n_threads):
+    A = sparse.random(100, 10, density=0.5, format="csr", dtype=dtype, random_state=rng)
+    B = sparse.random(10, 100, density=0.5, format="csr", dtype=dtype, random_state=rng)
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+
+    # all pairs as candidates is equivalent to the exact product
+    candidates = sparse.csr_matrix(np.ones((A.shape[0], B.shape[1])))
+    C = sp_matmul_topn_candidates(A, B, candidates, top_n=10, sort=True, n_threads=n_threads)
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=True)
+    _assert_array_equal(C.data, C_ref.data)
+    assert_array_equal(C.indptr, C_ref.indptr)
+
+    # only the candidates are computed
+    candidates = sparse.random(A.shape[0], B.shape[1], density=0.2, format="csr", random_state=rng)
+    C = sp_matmul_topn_candidates(A, B, candidates, top_n=B.shape[1], n_threads=n_threads)
+    C_ref = sparse.csr_matrix(A.dot(B).multiply(candidates != 0))
+    C.sort_indices()
+    C_ref.sort_indices()
+    _assert_smat_equal(C, C_ref)
+
+
+def test_sp_matmul_topn_candidates_duplicates(rng):
+    A = sparse.random(100, 10, density=0.5, format="csr", random_state=rng)
+    B = sparse.random(10, 80, density=0.5, format="csr", random_state=rng)
+    # every element of A is stored twice, halved
+    A_dup = sparse.csr_matrix((np.repeat(A.data / 2, 2), np.repeat(A.indices, 2), 2 * A.indptr), shape=A.shape)
+    assert not A_dup.has_canonical_format
+
+    candidates = sparse.csr_matrix(np.ones((A.shape[0], B.shape[1])))
+    C = sp_matmul_topn_candidates(A_dup, B, candidates, top_n=B.shape[1])
+    C_ref = sparse.csr_matrix(A.dot(B))
+    C.sort_indices()
+    C_ref.sort_indices()
+    _assert_smat_equal(C, C_ref)
+
+
+def test_sp_matmul_topn_candidates_shape(rng):
+    A = sparse.random(100, 10, density=0.5, format="csr", random_state=rng)
+    B = sparse.random(10, 80, density=0.5, format="csr", random_state=rng)
+    with pytest.raises(ValueError, match="candidates"):
+        sp_matmul_topn_candidates(A, B, sparse.csr_matrix((100, 10)), top_n=10)
+
+
+@pytest.mark.parametrize("method", ["minhash", "simhash"])
+def test_sp_matmul_topn_lsh(rng, method):
+    B = sparse.random(200, 500, density=0.02, format="csr", random_state=rng)
+    B = B[np.diff(B.indptr) > 0]
+    A = B[:50]
+
+    # identical rows share every band
+    candidates = lsh_candidates(A, B, n_bands=4, n_rows=4, method=method, seed=42)
+    assert candidates.shape == (A.shape[0], B.shape[0])
+    assert_array_equal(candidates.diagonal(), True)
+
+    # the values are exact for the pairs that are found
+    C = sp_matmul_topn_lsh(A, B, top_n=B.shape[0], n_bands=4, n_rows=4, method=method, seed=42)
+    assert_allclose(C.diagonal(), np.asarray(A.multiply(A).sum(axis=1)).ravel())
+    assert_allclose(C.toarray(), A.dot(B.T).multiply(C != 0).toarray())
+
+    with pytest.raises(ValueError, match="method"):
+        lsh_candidates(A, B, method="cosine")
+
+
+@pytest.mark.parametrize("method", ["minhash", "simhash"])
+def test_lsh_candidates_default_seed(rng, method):
+    B = sparse.random(200, 500, density=0.02, format="csr", random_state=rng)
+    B = B[np.diff(B.indptr) > 0]
+    # A and B are hashed with the same random functions
+    candidates = lsh_candidates(B, B, n_bands=4, n_rows=4, method=method)
+    assert_array_equal(candidates.diagonal(), True)
+
+
+def test_sp_matmul_topn_lsh_square(rng):
+    A = sparse.random(30, 60, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(60, 60, density=0.2, format="csr", random_state=rng)
+    C = sp_matmul_topn_lsh(A, B, top_n=60, n_bands=16, n_rows=1, seed=42)
+    assert C.nnz > 0
+    assert_allclose(C.toarray(), A.dot(B).multiply(C != 0).toarray())
+    candidates = lsh_candidates(A, B, n_bands=16, n_rows=1, seed=42)
+    assert_allclose(sp_matmul_topn_candidates(A, B, candidates, top_n=60).toarray(), C.toarray())
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32, np.int64])
+@pytest.mark.parametrize("n_threads", [None, 2])
+@pytest.mark.parametrize("sparse_a", [False, True])
+def test_dense_matmul_topn(rng, dtype, n_threads, sparse_a):
+    A = sparse.random(100, 16, density=0.5, format="csr", dtype=dtype, random_state=rng)
+    B_sp = sparse.random(16, 300, density=0.5, format="csr", dtype=dtype, random_state=rng)
+    B = B_sp.toarray()
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+    C_ref = sp_matmul_topn(A, B_sp, top_n=10)
+    A = A if sparse_a else A.toarray()
+
+    # tiles that do not divide the shape of C
+    C = dense_matmul_topn(A, B, top_n=10, n_threads=n_threads, tile_shape=(7, 33))
+    assert C.dtype == dtype
+    assert C.has_sorted_indices
+    C_ref.sort_indices()
+    _assert_smat_equal(C, C_ref)
+
+    C = dense_matmul_topn(A, B.T, top_n=10, sort=True, n_threads=n_threads, tile_shape=(7, 33))
+    C_full = A @ B
+    for i in range(C_full.shape[0]):
+        row = np.asarray(C_full[i]).ravel()
+        _assert_array_equal(C[i, :].data, np.sort(row[row > 0])[::-1][:10])
+
+
+def test_dense_matmul_topn_threshold(rng):
+    A = rng.standard_normal((50, 8))
+    B = rng.standard_normal((200, 8))
+    C = dense_matmul_topn(A, B, top_n=200, threshold=-1.0)
+    C_full = A @ B.T
+    assert C.nnz == (C_full > -1.0).sum()
+    assert_allclose(C.toarray()[C_full > -1.0], C_full[C_full > -1.0])
+
+    with pytest.raises(TypeError):
+        dense_matmul_topn(A, sparse.csr_matrix(B), top_n=10)
+    with pytest.raises(TypeError):
+        dense_matmul_topn(A, B.astype(np.int64), top_n=10)
+    with pytest.raises(ValueError, match="incompatible"):
+        dense_matmul_topn(A, B[:, :4], top_n=10)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32, np.int64])
+def test_update_topn(rng, dtype):
+    A = sparse.random(100, 50, density=0.2, format="csr", dtype=dtype, random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", dtype=dtype, random_state=rng)
+    B_new = sparse.random(50, 30, density=0.2, format="csr", dtype=dtype, random_state=rng)
+
+    C = sp_matmul_topn(A, B, top_n=10)
+    C = update_topn(C, A, B_new, top_n=10)
+    C_ref = sp_matmul_topn(A, sparse.hstack([B, B_new], format="csr"), top_n=10, sort=True)
+    assert C.shape == (100, 230)
+    _assert_array_equal(C.data, C_ref.data)
+    assert_array_equal(C.indptr, C_ref.indptr)
+
+    # B_new in the transposed orientation
+    C_T = update_topn(sp_matmul_topn(A, B, top_n=10), A, B_new.T.tocsr(), top_n=10)
+    _assert_smat_equal(C_T, C)
+
+    with pytest.raises(ValueError, match="rows"):
+        update_topn(C[:10], A, B_new, top_n=10)
+
+
+def test_remove_columns_topn(rng):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", random_state=rng)
+    retired = np.arange(0, 200, 7)
+    active = np.setdiff1d(np.arange(200), retired)
+
+    # with a margin that covers every retired column the result is exact
+    C = sp_matmul_topn(A, B, top_n=10 + retired.size)
+    C_rm = remove_columns_topn(C, retired, top_n=10)
+    assert C_rm.shape == C.shape
+    assert not np.isin(C_rm.indices, retired).any()
+    C_ref = sp_matmul_topn(A, B, top_n=B.shape[1]).toarray()
+    C_ref[:, retired] = 0
+    C_ref = zip_sp_matmul_topn(10, [sparse.csr_matrix(C_ref)])
+    _assert_smat_equal(C_rm, C_ref)
+
+    C_compact = remove_columns_topn(C, retired, top_n=10, compact=True)
+    C_ref = sp_matmul_topn(A, B[:, active], top_n=10, sort=True)
+    assert C_compact.shape == (100, active.size)
+    _assert_smat_equal(C_compact, C_ref)
+
+    # without `top_n` the margin is retained
+    C_all = remove_columns_topn(C, retired)
+    assert C_all.nnz == C.nnz - np.isin(C.indices, retired).sum()
+
+    for columns in ([-1], [200]):
+        with pytest.raises(ValueError, match="columns"):
+            remove_columns_topn(C, columns)
+
+
+def test_num_threads(monkeypatch):
+    monkeypatch.delenv("SDTN_NUM_THREADS", raising=False)
+    assert available_cpus() >= 1
+    assert get_num_threads() == 1
+    assert threads._resolve_n_threads(-1) == max(available_cpus() - 1, 1)
+
+    set_num_threads(3)
+    try:
+        assert get_num_threads() == 3
+        assert threads._resolve_n_threads(None) == 3
+        assert threads._resolve_n_threads(2) == 2
+        with threadpool_limits(2, blas=False) as limit:
+            assert limit == 2
+            assert get_num_threads() == 2
+            assert threads._resolve_n_threads(4) == 2
+            with threadpool_limits(None):
+                assert get_num_threads() == 3
+        assert get_num_threads() == 3
+    finally:
+        set_num_threads(None)
+    assert get_num_threads() == 1
+
+    monkeypatch.setenv("SDTN_NUM_THREADS", "2")
+    assert get_num_threads() == 2
+    with pytest.raises(ValueError, match="non-zero integer"):
+        set_num_threads(0)
+
+
+def test_cgroup_cpu_limit(monkeypatch, tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(threads, "_CGROUP_V2_CPU_MAX", str(cpu_max))
+    monkeypatch.setattr(threads, "_CGROUP_V1_QUOTA", str(tmp_path / "cpu.cfs_quota_us"))
+    monkeypatch.setattr(threads, "_CGROUP_V1_PERIOD", str(tmp_path / "cpu.cfs_period_us"))
+    threads._cgroup_cpu_limit.cache_clear()
+    try:
+        assert threads._cgroup_cpu_limit() is None
+        threads._cgroup_cpu_limit.cache_clear()
+        cpu_max.write_text("max 100000\n")
+        assert threads._cgroup_cpu_limit() is None
+        threads._cgroup_cpu_limit.cache_clear()
+        cpu_max.write_text("150000 100000\n")
+        assert threads._cgroup_cpu_limit() == 1.5
+        assert available_cpus() <= 2
+
+        threads._cgroup_cpu_limit.cache_clear()
+        cpu_max.unlink()
+        (tmp_path / "cpu.cfs_quota_us").write_text("-1\n")
+        (tmp_path / "cpu.cfs_period_us").write_text("100000\n")
+        assert threads._cgroup_cpu_limit() is None
+        threads._cgroup_cpu_limit.cache_clear()
+        (tmp_path / "cpu.cfs_quota_us").write_text("200000\n")
+        assert threads._cgroup_cpu_limit() == 2.0
+
+        # malformed files are ignored
+        for quota, period in (("abc\n", "100000\n"), ("200000\n", "0\n"), ("", "100000\n")):
+            threads._cgroup_cpu_limit.cache_clear()
+            (tmp_path / "cpu.cfs_quota_us").write_text(quota)
+            (tmp_path / "cpu.cfs_period_us").write_text(period)
+            assert threads._cgroup_cpu_limit() is None
+        threads._cgroup_cpu_limit.cache_clear()
+        cpu_max.write_text("150000 0\n")
+        assert threads._cgroup_cpu_limit() is None
+    finally:
+        threads._cgroup_cpu_limit.cache_clear()
+
+
+def test_sp_matmul_topn_default_threads(rng):
+    if not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", random_state=rng)
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=True)
+    with threadpool_limits(2):
+        C, stats = sp_matmul_topn(A, B, top_n=10, sort=True, n_threads=4, return_stats=True)
+    assert stats["n_threads"] == 2
+    _assert_smat_equal(C, C_ref)
+    C = sp_matmul_topn(A, B, top_n=10, sort=True, n_threads=-1)
+    _assert_smat_equal(C, C_ref)
+
+
+@pytest.mark.parametrize("n_threads", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+def test_sp_matmul_topn_chunked(rng, n_threads, chunk_size):
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", random_state=rng)
+    A.data[A.indptr[10] : A.indptr[20]] = 0.0
+    A.eliminate_zeros()
+
+    seen = []
+    C = sp_matmul_topn_chunked(
+        A,
+        B,
+        top_n=10,
+        sort=True,
+        n_threads=n_threads,
+        chunk_size=chunk_size,
+        callback=lambda p: seen.append(p.rows_done),
+    )
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=True)
+    _assert_smat_equal(C, C_ref)
+    assert_array_equal(C.indptr, C_ref.indptr)
+    assert seen[-1] == A.shape[0]
+    assert len(seen) == -(-A.shape[0] // chunk_size)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int64", "int8"])
+@pytest.mark.parametrize("idx_dtype", ["int32", "int64"])
+def test_sp_matmul_topn_chunked_dtypes(rng, dtype, idx_dtype):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", random_state=rng)
+    A.data *= 100
+    B.data *= 100
+    A, B = A.astype(dtype), B.astype(dtype)
+    C = sp_matmul_topn_chunked(A, B, top_n=10, threshold=50, sort=True, chunk_size=30, idx_dtype=idx_dtype)
+    C_ref = sp_matmul_topn(A, B, top_n=10, threshold=50, sort=True, idx_dtype=idx_dtype)
+    assert C.dtype == C_ref.dtype
+    _assert_smat_equal(C, C_ref)
+    C = sp_matmul_topn_chunked(A, sparse.csr_matrix(B.shape, dtype=dtype), top_n=10, chunk_size=30)
+    assert C.shape == (A.shape[0], B.shape[1])
+    assert C.nnz == 0
+
+
+def test_sp_matmul_topn_chunked_cancel(rng):
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", random_state=rng)
+    C_ref = sp_matmul_topn(A, B, top_n=10).toarray()
+
+    def cancel_at_30(progress):
+        if progress.rows_done >= 30:
+            progress.cancel()
+
+    progress = Progress()
+    with pytest.raises(CancelledError, match="after 30 of 100 rows") as excinfo:
+        sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, callback=cancel_at_30, progress=progress)
+    assert progress.cancelled
+    assert progress.rows_done == excinfo.value.rows_done == 30
+    assert_array_equal(excinfo.value.result.toarray()[:30], C_ref[:30])
+
+    C = sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, callback=cancel_at_30, on_cancel="partial")
+    assert C.shape == C_ref.shape
+    assert_array_equal(C.toarray()[:30], C_ref[:30])
+    assert C[30:].nnz == 0
+
+    # a cancelled progress stops before the first chunk
+    C = sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, progress=progress, on_cancel="partial")
+    assert C.nnz == 0
+
+    def interrupt(progress):
+        if progress.rows_done >= 50:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, callback=interrupt)
+    C = sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, callback=interrupt, on_cancel="partial")
+    assert_array_equal(C.toarray()[:50], C_ref[:50])
+
+    # an interrupt after the last chunk is not swallowed
+    def interrupt_last(progress):
+        if progress.rows_done == progress.n_rows:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, callback=interrupt_last)
+
+    C = sp_matmul_topn_chunked(A, B, top_n=10, chunk_size=10, timeout=0.0, on_cancel="partial")
+    assert C[10:].nnz == 0
+
+
+@pytest.mark.parametrize("n_threads", [None, 2])
+@pytest.mark.parametrize("sort", [False, True])
+@pytest.mark.parametrize("top_n", [10, 200])
+def test_sp_matmul_topn_pairs(rng, n_threads, sort, top_n):
+    if n_threads is not None and not _has_openmp_support:
+        pytest.skip("extension compiled without OpenMP support")
+    A = sparse.random(100, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.2, format="csr", random_state=rng)
+    C = sp_matmul_topn(A, B, top_n=top_n, sort=sort, n_threads=n_threads)
+    pairs = sp_matmul_topn(A, B, top_n=top_n, sort=sort, n_threads=n_threads, output="pairs")
+    assert list(pairs) == ["row", "col", "score"]
+    C_coo = C.tocoo()
+    assert_array_equal(pairs["row"], C_coo.row)
+    assert_array_equal(pairs["col"], C_coo.col)
+    assert_array_equal(pairs["score"], C_coo.data)
+    assert pairs["row"].dtype == pairs["col"].dtype == np.int32
+
+    pairs, stats = sp_matmul_topn(A, B, top_n=top_n, sort=sort, output="pairs", return_stats=True)
+    assert stats["flops"] > 0
+    assert_array_equal(pairs["score"], to_pairs(C)["score"])
+
+
+def test_to_pairs(rng):
+    A = sparse.random(10, 20, density=0.2, format="csr", random_state=rng)
+    B = sparse.csr_matrix((20, 30))
+    pairs = sp_matmul_topn(A, B, top_n=5, output="pairs", idx_dtype=np.int64)
+    assert pairs["row"].size == pairs["col"].size == pairs["score"].size == 0
+    assert pairs["col"].dtype == np.int64
+
+    C = sp_matmul_topn(A, A.T, top_n=5)
+    pairs = to_pairs(C.tocsc())
+    assert_allclose(
+        sparse.csr_matrix((pairs["score"], (pairs["row"], pairs["col"])), shape=C.shape).toarray(), C.toarray()
+    )
+    with pytest.raises(ValueError, match="`output` must be one of"):
+        sp_matmul_topn(A, A.T, top_n=5, output="coo")
+
+
+def test_to_record_batch(rng):
+    pa = pytest.importorskip("pyarrow")
+    A = sparse.random(10, 20, density=0.2, format="csr", random_state=rng)
+    C = sp_matmul_topn(A, A.T, top_n=5)
+    batch = sp_matmul_topn(A, A.T, top_n=5, output="arrow")
+    assert isinstance(batch, pa.RecordBatch)
+    assert batch.schema.names == ["row", "col", "score"]
+    assert_array_equal(batch.column("score").to_numpy(), C.data)
+    assert to_record_batch(C).equals(batch)
+
+
+@pytest.mark.parametrize("method", ["rcm", "degree"])
+@pytest.mark.parametrize("reorder_rows", [False, True])
+@pytest.mark.parametrize("sort", [False, True])
+def test_sp_matmul_topn_reordered(rng, method, reorder_rows, sort):
+    A = sparse.random(100, 50, density=0.1, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.1, format="csr", random_state=rng)
+    B_copy = B.copy()
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=sort)
+    C = sp_matmul_topn_reordered(A, B, top_n=10, sort=sort, method=method, reorder_rows=reorder_rows)
+    # without `sort` the order of the elements within a row depends on the column order
+    assert_allclose(C.toarray(), C_ref.toarray())
+    if sort:
+        assert_array_equal(C.data, C_ref.data)
+    # B is not modified
+    assert_array_equal(B.data, B_copy.data)
+    assert_array_equal(B.indices, B_copy.indices)
+
+    # B in the orientation `A.shape[1] == B.shape[1]`
+    C = sp_matmul_topn_reordered(A, B.T.tocsr(), top_n=10, sort=sort, method=method, reorder_rows=reorder_rows)
+    assert_allclose(C.toarray(), C_ref.toarray())
+
+
+def test_column_reordering(rng):
+    A = sparse.random(100, 50, density=0.1, format="csr", random_state=rng)
+    B = sparse.random(50, 200, density=0.1, format="csr", random_state=rng)
+    for method in ("rcm", "degree"):
+        permutation = column_permutation(B, method)
+        assert_array_equal(np.sort(permutation), np.arange(B.shape[1]))
+    assert_array_equal(np.sort(row_permutation(A)), np.arange(A.shape[0]))
+    with pytest.raises(ValueError, match="`method` must be one of"):
+        column_permutation(B, "random")
+
+    B_reordered = ColumnReordering(B, "rcm")
+    assert_allclose(B_reordered.B.toarray(), B[:, B_reordered.permutation].toarray())
+    B_reordered = pickle.loads(pickle.dumps(B_reordered))
+    C_ref = sp_matmul_topn(A, B, top_n=10)
+    assert_allclose(sp_matmul_topn_reordered(A, B_reordered, top_n=10).toarray(), C_ref.toarray())
+    B_reordered = ColumnReordering(B, permutation=B_reordered.permutation)
+    assert_allclose(sp_matmul_topn_reordered(A, B_reordered, top_n=10, n_threads=2).toarray(), C_ref.toarray())
+    with pytest.raises(ValueError, match="must be equal to"):
+        sp_matmul_topn_reordered(A.T, B_reordered, top_n=10)
+
+    rows = row_permutation(A)
+    C = sp_matmul_topn_reordered(A, B_reordered, top_n=10, rows=rows)
+    assert_allclose(C.toarray(), C_ref.toarray())
+    with pytest.raises(ValueError, match="`rows` must be a permutation"):
+        sp_matmul_topn_reordered(A, B_reordered, top_n=10, rows=rows[:-1])
+    for permutation in (np.zeros(B.shape[1], dtype=np.int32), np.arange(B.shape[1] + 1), np.arange(B.shape[1]) + 0.5):
+        with pytest.raises(ValueError, match="`permutation` must be a permutation"):
+            ColumnReordering(B, permutation=permutation)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64", "int32", "int64"])
+@pytest.mark.parametrize("idx_dtype", ["int32", "int64"])
+@pytest.mark.parametrize("n_threads", [1, 2])
+@pytest.mark.parametrize("sort", [False, True])
+def test_sp_matmul_topn_compressed(rng, dtype, idx_dtype, n_threads, sort):
+    A = sparse.random(100, 50, density=0.1, format="csr", dtype=dtype, random_state=rng)
+    # wide enough for deltas that take more than one byte
+    B = sparse.random(50, 100_000, density=0.002, format="csr", dtype=dtype, random_state=rng)
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=sort, n_threads=n_threads, idx_dtype=idx_dtype)
+    C = sp_matmul_topn_compressed(
+        A, CompressedCSR.from_csr(B), top_n=10, sort=sort, n_threads=n_threads, idx_dtype=idx_dtype
+    )
+    assert_allclose(C.toarray(), C_ref.toarray())
+    if sort:
+        assert_array_equal(C.data, C_ref.data)
+
+    threshold = np.median(C_ref.data)
+    C_ref = sp_matmul_topn(A, B, top_n=10, threshold=threshold, n_threads=n_threads)
+    C = sp_matmul_topn_compressed(A, B, top_n=10, threshold=threshold, n_threads=n_threads)
+    assert_allclose(C.toarray(), C_ref.toarray())
+
+
+def test_compressed_csr(rng, tmp_path):
+    B = sparse.random(50, 100_000, density=0.002, format="csr", random_state=rng)
+    B_compressed = CompressedCSR.from_csr(B)
+    assert B_compressed.shape == B.shape
+    assert B_compressed.nnz == B.nnz
+    assert B_compressed.codes.nbytes < B.indices.nbytes
+    _assert_smat_equal(B_compressed.to_csr(), B)
+
+    # unsorted indices are sorted without modifying B
+    order = np.lexsort((-B.indices, np.repeat(np.arange(B.shape[0]), np.diff(B.indptr))))
+    B_unsorted = sparse.csr_matrix((B.data[order], B.indices[order], B.indptr), shape=B.shape)
+    _assert_smat_equal(CompressedCSR.from_csr(B_unsorted).to_csr(), B)
+    assert not B_unsorted.has_sorted_indices
+
+    # indices that need more than 32 bits
+    X = sparse.csr_matrix(([1.0, 2.0, 3.0], [0, 300, 2**40], [0, 3, 3]), shape=(2, 2**41))
+    assert_array_equal(CompressedCSR.from_csr(X).to_csr().indices, [0, 300, 2**40])
+
+    B_compressed.save(tmp_path / "B.npz")
+    B_loaded = CompressedCSR.load(tmp_path / "B.npz")
+    assert B_loaded.shape == B.shape
+    _assert_smat_equal(B_loaded.to_csr(), B)
+
+    A = sparse.random(100, 50, density=0.1, format="csr", random_state=rng)
+    C_ref = sp_matmul_topn(A, B, top_n=10, sort=True)
+    _assert_smat_equal(sp_matmul_topn_compressed(A, B_loaded, top_n=10, sort=True), C_ref)
+    C = sp_matmul_topn_compressed(A, CompressedCSR.from_csr(sparse.csr_matrix(B.shape)), top_n=10)
+    assert C.nnz == 0
+    with pytest.raises(ValueError, match="must be equal to"):
+        sp_matmul_topn_compressed(A.T, B_compressed, top_n=10)
+
+
+def test_sp_matmul_topn_compressed_validation(rng, tmp_path, monkeypatch):
+    A = sparse.random(20, 50, density=0.2, format="csr", random_state=rng)
+    B = sparse.random(50, 1000, density=0.05, format="csr", random_state=rng)
+    B_compressed = CompressedCSR.from_csr(B)
+
+    # the dtype rules of `sp_matmul_topn`
+    for A_dtype, B_dtype in (("int64", "float64"), ("float32", "float64")):
+        with pytest.raises(TypeError, match="cannot be safely cast"):
+            sp_matmul_topn(A.astype(A_dtype), B.astype(B_dtype), top_n=5)
+        with pytest.raises(TypeError, match="cannot be safely cast"):
+            sp_matmul_topn_compressed(A.astype(A_dtype), CompressedCSR.from_csr(B.astype(B_dtype)), top_n=5)
+    # B is not cast to the mixed-precision dtype on every call
+    with pytest.raises(TypeError, match="mixed precision"):
+        sp_matmul_topn_compressed(A, CompressedCSR.from_csr(B.astype("float32")), top_n=5)
+
+    arrays = {
+        "data": B_compressed.data,
+        "indptr": B_compressed.indptr,
+        "offsets": B_compressed.offsets,
+        "codes": B_compressed.codes,
+        "shape": B_compressed.shape,
+    }
+    CompressedCSR(**arrays)
+    corrupt_codes = B_compressed.codes.copy()
+    corrupt_codes[0] |= 0x80
+    for key, value, match in (
+        ("codes", B_compressed.codes[:-1], "`offsets` must be non-decreasing"),
+        ("offsets", B_compressed.offsets[:-1], "must have 51 elements"),
+        ("indptr", B_compressed.indptr[::-1], "`indptr` must be non-decreasing"),
+        ("shape", (50, 10), "column indices"),
+        ("codes", corrupt_codes, "one varint per element"),
+    ):
+        with pytest.raises(ValueError, match=match):
+            CompressedCSR(**{**arrays, key: value})
+
+    # the rows are validated in blocks, a corrupt row after the first block is found
+    monkeypatch.setattr(compressed, "_VALIDATE_BLOCK_BYTES", 16)
+    CompressedCSR(**arrays)
+    corrupt_codes = B_compressed.codes.copy()
+    corrupt_codes[B_compressed.offsets[-2]] |= 0x80
+    with pytest.raises(ValueError, match="one varint per element"):
+        CompressedCSR(**{**arrays, "codes": corrupt_codes})
+
+    np.savez(tmp_path / "B.npz", **{**arrays, "shape": np.asarray((50, 10))})
+    with pytest.raises(ValueError, match="column indices"):
+        CompressedCSR.load(tmp_path / "B.npz")